@@ -0,0 +1,89 @@
+"""
+Cache Invalidation Benchmark
+Invalidates a cache prefix holding 100k keys (next to 100k keys of another
+prefix) three ways while a second client GETs in a loop, and reports the
+invalidation time (best of 3) and the slowest concurrent GET (worst of 3):
+the old KEYS + DEL, the SCAN + UNLINK fallback for ad-hoc patterns, and the
+generation bump invalidate_cache uses for "prefix:*" patterns.
+
+Uses the Redis from settings (REDIS_HOST/REDIS_PORT/REDIS_DB) and only
+touches keys under the bench_* prefixes. Run from backend/:
+
+    REDIS_HOST=localhost python -m benchmarks.cache_invalidation
+
+Recorded on Redis 6.2 (localhost, 200-byte values):
+
+    KEYS + DEL (before)               invalidate    184.32 ms  worst GET   46.84 ms
+    SCAN + UNLINK (ad-hoc fallback)   invalidate    287.11 ms  worst GET    3.16 ms
+    generation bump (INCR)            invalidate      0.56 ms  worst GET    0.87 ms
+"""
+import threading
+import time
+
+import redis
+
+from core.cache import _invalidate_by_scan, _version_key, get_redis_client, invalidate_prefix
+
+PREFIX = "bench_buyers"
+OTHER_PREFIX = "bench_styles"
+KEY_COUNT = 100_000
+REPEAT = 3
+
+
+def fill(client: redis.Redis):
+    pipe = client.pipeline(transaction=False)
+    for i in range(KEY_COUNT):
+        pipe.set(f"{PREFIX}:v1:list:{i}", "x" * 200)
+        pipe.set(f"{OTHER_PREFIX}:v1:list:{i}", "x" * 200)
+    pipe.execute()
+
+
+def probe(stop: threading.Event, latencies: list):
+    """GET an unrelated key in a loop, recording each round trip"""
+    client = get_redis_client()
+    while not stop.is_set():
+        started = time.perf_counter()
+        client.get(f"{OTHER_PREFIX}:v1:list:1")
+        latencies.append(time.perf_counter() - started)
+
+
+def keys_and_delete(client: redis.Redis):
+    """Invalidation before the generation scheme (blocks Redis for the whole KEYS)"""
+    keys = client.keys(f"{PREFIX}:*")
+    for i in range(0, len(keys), 10_000):
+        client.delete(*keys[i:i + 10_000])
+
+
+def run(name: str, invalidate):
+    client = get_redis_client()
+    totals, worst = [], []
+    for _ in range(REPEAT):
+        fill(client)
+        stop, latencies = threading.Event(), []
+        prober = threading.Thread(target=probe, args=(stop, latencies))
+        prober.start()
+        time.sleep(0.05)
+        started = time.perf_counter()
+        invalidate()
+        totals.append(time.perf_counter() - started)
+        stop.set()
+        prober.join()
+        worst.append(max(latencies))
+    print(f"{name:32s}  invalidate {min(totals) * 1000:9.2f} ms  worst GET {max(worst) * 1000:7.2f} ms")
+
+
+def main():
+    client = get_redis_client()
+    if client is None:
+        raise SystemExit("Redis is not reachable (check REDIS_HOST/REDIS_PORT)")
+    try:
+        run("KEYS + DEL (before)", lambda: keys_and_delete(client))
+        run("SCAN + UNLINK (ad-hoc fallback)", lambda: _invalidate_by_scan(f"{PREFIX}:*"))
+        run("generation bump (INCR)", lambda: invalidate_prefix(PREFIX))
+    finally:
+        _invalidate_by_scan("bench_*")
+        client.delete(_version_key(PREFIX))
+
+
+if __name__ == "__main__":
+    main()
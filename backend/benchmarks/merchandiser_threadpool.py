@@ -0,0 +1,190 @@
+"""
+Merchandiser Thread Pool Benchmark
+Measures what slow merchandiser requests do to everyone else's latency.
+CONCURRENCY clients repeatedly list yarn details (GET /yarn?limit=50), and
+one client pings a trivial async endpoint in a loop.
+
+The "before" app mounts the same handlers wrapped in `async def`, the way
+they were declared before they moved to the dedicated pool. Their blocking
+Session work then runs on the event loop. The "after" app mounts the
+merchandiser router unchanged.
+
+The server runs in its own process against a throwaway SQLite file. Each
+statement sleeps QUERY_LATENCY first to stand in for time spent waiting on
+Postgres. Run from backend/:
+
+    python -m benchmarks.merchandiser_threadpool
+
+Recorded with CONCURRENCY=16, QUERY_LATENCY=50 ms (one uvicorn worker, 1 CPU):
+
+    before (async def on the loop)  ping p50  364.9 ms  p95  924.5 ms  max  924.5 ms (15 pings)   /yarn p50   902 ms, 19 req/s
+    after (merchandiser pool)       ping p50   16.7 ms  p95   66.4 ms  max  154.5 ms (132 pings)   /yarn p50   121 ms, 123 req/s
+"""
+import asyncio
+import functools
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+
+import httpx
+import uvicorn
+from fastapi import APIRouter, FastAPI
+from fastapi.routing import APIRoute
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from core.database import get_db_merchandiser
+from modules.merchandiser.models.merchandiser import YarnDetail
+from modules.merchandiser.routes.merchandiser import router
+
+YARN_ROWS = 1000
+CONCURRENCY = 16
+DURATION = 5.0  # Seconds per run
+QUERY_LATENCY = 0.05  # Simulated database time per statement
+PORT = 8765
+
+
+def _on_loop(endpoint):
+    """The pre-pool handler: same body, declared async, so it blocks the loop"""
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        return endpoint(*args, **kwargs)
+
+    return wrapper
+
+
+def build_app(db_path: str, blocking_on_loop: bool) -> FastAPI:
+    app = FastAPI()
+    if blocking_on_loop:
+        before = APIRouter()
+        for route in router.routes:
+            if isinstance(route, APIRoute):
+                # Pool-wrapped endpoints keep the original handler on __wrapped__
+                endpoint = getattr(route.endpoint, "__wrapped__", route.endpoint)
+                if not asyncio.iscoroutinefunction(endpoint):
+                    endpoint = _on_loop(endpoint)
+                before.add_api_route(
+                    route.path, endpoint, methods=list(route.methods),
+                    response_model=route.response_model, status_code=route.status_code
+                )
+        app.include_router(before, prefix="/merchandiser")
+    else:
+        app.include_router(router, prefix="/merchandiser")
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    # One connection per client: with fewer, "before" deadlocks in pool checkout on the blocked loop
+    engine = create_engine(
+        f"sqlite:///{db_path}", connect_args={"check_same_thread": False}, pool_size=CONCURRENCY + 1
+    )
+    # Stand-in for time spent waiting on Postgres: SQLite work is CPU in this
+    # process and would compete with the event loop for the same core
+    event.listen(engine, "before_cursor_execute", lambda *args: time.sleep(QUERY_LATENCY))
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+
+    def get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db_merchandiser] = get_db
+    return app
+
+
+def seed(db_path: str):
+    engine = create_engine(f"sqlite:///{db_path}")
+    YarnDetail.__table__.create(engine)
+    with engine.begin() as conn:
+        conn.execute(YarnDetail.__table__.insert(), [
+            {
+                "yarn_id": f"Y{i:06d}",
+                "yarn_name": f"Yarn {i}",
+                "yarn_composition": "60% Cotton 40% Polyester",
+                "blend_ratio": "60/40",
+                "yarn_count": "30/1",
+                "count_system": "Ne",
+                "yarn_type": "Ring Spun",
+                "uom": "kg",
+                "remarks": "benchmark row",
+            }
+            for i in range(YARN_ROWS)
+        ])
+    engine.dispose()
+
+
+def _serve(db_path: str, blocking_on_loop: bool):
+    uvicorn.run(build_app(db_path, blocking_on_loop), host="127.0.0.1", port=PORT, log_level="warning")
+
+
+def serve(db_path: str, blocking_on_loop: bool) -> multiprocessing.Process:
+    """Run the app in its own process so the load generator does not share its GIL"""
+    server = multiprocessing.get_context("spawn").Process(target=_serve, args=(db_path, blocking_on_loop))
+    server.start()
+    while True:
+        try:
+            httpx.get(f"http://127.0.0.1:{PORT}/ping")
+            return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+
+
+async def measure() -> dict:
+    limits = httpx.Limits(max_connections=CONCURRENCY + 1)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", timeout=60, limits=limits) as client:
+        deadline = time.perf_counter() + DURATION
+        pings, lists = [], []
+
+        async def timed(url: str, out: list):
+            started = time.perf_counter()
+            response = await client.get(url)
+            response.raise_for_status()
+            out.append(time.perf_counter() - started)
+
+        async def lister():
+            while time.perf_counter() < deadline:
+                await timed("/merchandiser/yarn?limit=50", lists)
+
+        async def pinger():
+            while time.perf_counter() < deadline:
+                await timed("/ping", pings)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(pinger(), *(lister() for _ in range(CONCURRENCY)))
+
+    pings.sort()
+    return {
+        "pings": len(pings),
+        "ping_p50": statistics.median(pings) * 1000,
+        "ping_p95": pings[int(len(pings) * 0.95)] * 1000,
+        "ping_max": pings[-1] * 1000,
+        "list_p50": statistics.median(lists) * 1000,
+        "list_rps": len(lists) / DURATION,
+    }
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "merchandiser.db")
+        seed(db_path)
+        for name, blocking in (("before (async def on the loop)", True), ("after (merchandiser pool)", False)):
+            server = serve(db_path, blocking)
+            try:
+                result = asyncio.run(measure())
+            finally:
+                server.terminate()
+                server.join()
+            print(
+                f"{name:30s}  ping p50 {result['ping_p50']:6.1f} ms  p95 {result['ping_p95']:6.1f} ms"
+                f"  max {result['ping_max']:6.1f} ms ({result['pings']} pings)"
+                f"   /yarn p50 {result['list_p50']:5.0f} ms, {result['list_rps']:.0f} req/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
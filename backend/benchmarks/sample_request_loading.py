@@ -0,0 +1,183 @@
+"""
+Sample Request Loading Benchmark
+Compares sample request reads before and after the loader change. Before,
+seven relations were joinedloaded into one SELECT and the list returned
+full nested rows. After, collections use selectinload and the list uses
+the slim SampleRequestListResponse.
+
+Seeds REQUESTS sample requests into a throwaway SQLite database. Each has
+2 materials, 2 operations, 10 TNA items, 10 status rows and one workflow
+with 8 cards. Reports statements, rows returned by the database, median
+time and response size:
+- for the list of LIST_LIMIT requests;
+- for one request's detail.
+
+Run from backend/:
+
+    python -m benchmarks.sample_request_loading
+
+Recorded (SQLite in memory, REQUESTS=300, LIST_LIMIT=50, median of 3):
+
+    list   before  statements  1  rows 160000  10109.8 ms    346.3 KiB
+    list   after   statements  3  rows    500     16.4 ms     38.7 KiB
+    detail before  statements  1  rows   3200    178.6 ms      7.0 KiB
+    detail after   statements  7  rows     34      7.9 ms      7.0 KiB
+"""
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import joinedload, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from core.database import BaseSamples
+from core.serialization import dumps, row_to_dict
+from modules.samples.models.sample import (
+    ManufacturingOperation, SamplePlan, SampleRequest, SampleOperation,
+    SampleRequiredMaterial, SampleStatus, SampleTNA
+)
+from modules.samples.routes.samples import (
+    SAMPLE_REQUEST_DETAIL_LOAD_OPTIONS, SAMPLE_REQUEST_LIST_LOAD_OPTIONS
+)
+from modules.samples.schemas.sample import SampleRequestListResponse, SampleRequestResponse
+from modules.workflows.models.workflow import SampleWorkflow, WorkflowCard
+
+REQUESTS = 300
+LIST_LIMIT = 50
+REPEAT = 3
+MATERIALS = 2
+OPERATIONS = 2
+TNA_ITEMS = 10
+STATUS_ROWS = 10
+CARDS = 8
+
+# What every sample request read used before
+JOINEDLOAD_ALL = (
+    joinedload(SampleRequest.style),
+    joinedload(SampleRequest.plan).joinedload(SamplePlan.machine),
+    joinedload(SampleRequest.required_materials),
+    joinedload(SampleRequest.operations),
+    joinedload(SampleRequest.tna_items),
+    joinedload(SampleRequest.status_history),
+    joinedload(SampleRequest.workflows).joinedload(SampleWorkflow.cards),
+)
+
+
+def seed(session_factory):
+    db = session_factory()
+    now = datetime.now(timezone.utc)
+    operations = [
+        ManufacturingOperation(operation_id=f"OP-{i}", operation_type="Knitting", operation_name=f"Op {i}")
+        for i in range(OPERATIONS)
+    ]
+    db.add_all(operations)
+    db.flush()
+    for i in range(REQUESTS):
+        request = SampleRequest(
+            sample_id=f"SMP-BENCH-{i:04d}", buyer_id=i % 20 + 1, buyer_name=f"Buyer {i % 20}",
+            sample_name=f"Sample {i}", gauge="12GG", sample_category="Proto", current_status="In Progress",
+            required_materials=[
+                SampleRequiredMaterial(product_name=f"Yarn {m}", required_quantity=1.5, uom="kg")
+                for m in range(MATERIALS)
+            ],
+            operations=[
+                SampleOperation(operation_master_id=op.id, operation_name=op.operation_name, sequence_order=n)
+                for n, op in enumerate(operations)
+            ],
+            tna_items=[
+                SampleTNA(operation_sequence=n, operation_name=f"Operation {n}", start_datetime=now)
+                for n in range(TNA_ITEMS)
+            ],
+            status_history=[
+                SampleStatus(status_by_sample="In Progress", notes=f"Update {n}", updated_by="bench")
+                for n in range(STATUS_ROWS)
+            ],
+        )
+        db.add(request)
+        db.flush()
+        workflow = SampleWorkflow(sample_request_id=request.id, workflow_name=f"Workflow {i}", due_date=now + timedelta(days=7))
+        workflow.cards = [
+            WorkflowCard(stage_name=f"Stage {n}", stage_order=n + 1, card_title=f"Stage {n}", card_status="ready")
+            for n in range(CARDS)
+        ]
+        db.add(workflow)
+    db.commit()
+    db.close()
+
+
+def list_before(db):
+    rows = db.query(SampleRequest).options(*JOINEDLOAD_ALL).order_by(SampleRequest.id).limit(LIST_LIMIT).all()
+    for row in rows:
+        row.workflow_status = row.current_workflow_status
+    return dumps([SampleRequestResponse.model_validate(row).model_dump(mode="json") for row in rows])
+
+
+def list_after(db):
+    rows = db.query(SampleRequest).options(*SAMPLE_REQUEST_LIST_LOAD_OPTIONS).order_by(SampleRequest.id).limit(LIST_LIMIT).all()
+    for row in rows:
+        row.workflow_status = row.current_workflow_status
+    return dumps([row_to_dict(row, SampleRequestListResponse) for row in rows])
+
+
+def detail(options):
+    def load(db):
+        row = db.query(SampleRequest).options(*options).filter(SampleRequest.id == REQUESTS // 2).first()
+        row.workflow_status = row.current_workflow_status
+        return dumps(SampleRequestResponse.model_validate(row).model_dump(mode="json"))
+    return load
+
+
+def measure(engine, session_factory, read) -> dict:
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    timings = []
+    for _ in range(REPEAT):
+        statements.clear()
+        db = session_factory()
+        event.listen(engine, "before_cursor_execute", capture)
+        started = time.perf_counter()
+        body = read(db)
+        timings.append(time.perf_counter() - started)
+        event.remove(engine, "before_cursor_execute", capture)
+        db.close()
+
+    # Re-run the captured statements to count what the database sent back
+    raw = engine.raw_connection()
+    try:
+        rows = sum(len(raw.cursor().execute(statement, parameters).fetchall()) for statement, parameters in statements)
+    finally:
+        raw.close()
+    return {
+        "statements": len(statements),
+        "rows": rows,
+        "ms": statistics.median(timings) * 1000,
+        "kib": len(body) / 1024,
+    }
+
+
+def main():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    BaseSamples.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    seed(session_factory)
+
+    runs = (
+        ("list   before", list_before),
+        ("list   after ", list_after),
+        ("detail before", detail(JOINEDLOAD_ALL)),
+        ("detail after ", detail(SAMPLE_REQUEST_DETAIL_LOAD_OPTIONS)),
+    )
+    for name, read in runs:
+        result = measure(engine, session_factory, read)
+        print(
+            f"{name}  statements {result['statements']:2d}  rows {result['rows']:6d}"
+            f"  {result['ms']:7.1f} ms  {result['kib']:7.1f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
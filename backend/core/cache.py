@@ -1,20 +1,103 @@
 """
 Redis Caching Layer for Performance Optimization
 Provides caching decorators and utilities for API endpoints
+
+Two tiers: an optional bounded in-process LRU per worker (master data) in
+front of Redis. Workers keep their local tier coherent through Redis pub/sub
+invalidation messages.
 """
 
 import redis
-import json
 import logging
+import threading
+import time
+from collections import OrderedDict
 from functools import wraps
-from typing import Optional, Any, Callable
+from typing import Optional, Any, Callable, Dict, Tuple, Union
+from starlette.requests import Request
+from starlette.responses import Response
 from .config import settings
+from .serialization import dumps, loads
 
 logger = logging.getLogger(__name__)
 
 # Redis client instance
 redis_client: Optional[redis.Redis] = None
 
+# Per-process hit/miss counters for @cache_response endpoints
+_cache_counters = {"hits": 0, "misses": 0}
+
+# Serialized JSON as stored in the cache tiers (orjson bytes; str when read back from Redis)
+Payload = Union[bytes, str]
+
+# Pub/sub channel carrying invalidated prefixes to every worker's local tier
+INVALIDATION_CHANNEL = "cache_invalidation"
+
+
+class LocalLRUCache:
+    """Bounded, thread-safe in-process LRU with per-entry TTL (first cache tier)"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str, Payload]]" = OrderedDict()  # key -> (expires_at, prefix, payload)
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def generation(self, prefix: str) -> int:
+        """Local generation of a prefix; bumped by every invalidation"""
+        return self._generations.get(prefix, 0)
+
+    def get(self, key: str) -> Optional[Payload]:
+        """Get a serialized payload, or None if missing/expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, key: str, prefix: str, payload: Payload, ttl: int, generation: int):
+        """
+        Store a payload unless the prefix was invalidated since `generation`
+        was read (prevents re-caching data fetched before an invalidation)
+        """
+        with self._lock:
+            if self._generations.get(prefix, 0) != generation:
+                return
+            self._entries[key] = (time.monotonic() + ttl, prefix, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_prefix(self, prefix: str):
+        """Drop all local entries under a prefix"""
+        with self._lock:
+            self._generations[prefix] = self._generations.get(prefix, 0) + 1
+            for key in [k for k, entry in self._entries.items() if entry[1] == prefix]:
+                del self._entries[key]
+
+    def clear(self):
+        """Drop every local entry (e.g. after missing pub/sub messages)"""
+        with self._lock:
+            for prefix in {entry[1] for entry in self._entries.values()}:
+                self._generations[prefix] = self._generations.get(prefix, 0) + 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "max_entries": self.max_entries, "hits": self.hits, "misses": self.misses}
+
+
+local_cache = LocalLRUCache(getattr(settings, 'LOCAL_CACHE_MAX_ENTRIES', 1024))
+
+_listener_thread: Optional[threading.Thread] = None
+_listener_lock = threading.Lock()
+
 
 def get_redis_client() -> Optional[redis.Redis]:
     """Get or create Redis client"""
@@ -44,7 +127,8 @@ def get_redis_client() -> Optional[redis.Redis]:
 def cache_response(
     key_prefix: str,
     ttl: int = 300,
-    key_builder: Optional[Callable] = None
+    key_builder: Optional[Callable] = None,
+    local_ttl: Optional[int] = None
 ):
     """
     Decorator to cache API responses in Redis
@@ -53,48 +137,58 @@ def cache_response(
         key_prefix: Prefix for cache key (e.g., "buyers", "samples")
         ttl: Time-to-live in seconds (default: 300 = 5 minutes)
         key_builder: Custom function to build cache key from function args
+        local_ttl: Also keep results in this worker's in-process LRU for this
+            many seconds (for master data; still served if Redis is down)
 
     Example:
         @cache_response(key_prefix="buyers", ttl=300)
         def get_buyers(skip: int, limit: int):
             ...
+
+        @cache_response(key_prefix="uom", ttl=CacheTTL.LOOKUP_DATA, local_ttl=CacheTTL.LOCAL_MASTER_DATA)
+        def get_uoms(...):
+            ...
     """
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
             # Try to get from cache
-            cache_key = _build_cache_key(key_prefix, func, args, kwargs, key_builder)
-            cached_data = _get_from_cache(cache_key)
+            slot = _CacheSlot(key_prefix, _build_cache_key(func, args, kwargs, key_builder), local_ttl)
+            cached_data = slot.get()
 
             if cached_data is not None:
-                logger.debug(f"🎯 Cache HIT: {cache_key}")
+                _cache_counters["hits"] += 1
+                logger.debug(f"🎯 Cache HIT: {slot.describe()}")
                 return cached_data
 
             # Cache miss - execute function
-            logger.debug(f"❌ Cache MISS: {cache_key}")
+            _cache_counters["misses"] += 1
+            logger.debug(f"❌ Cache MISS: {slot.describe()}")
             result = await func(*args, **kwargs)
 
             # Store in cache
-            _set_in_cache(cache_key, result, ttl)
+            slot.set(result, ttl)
 
             return result
 
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
             # Try to get from cache
-            cache_key = _build_cache_key(key_prefix, func, args, kwargs, key_builder)
-            cached_data = _get_from_cache(cache_key)
+            slot = _CacheSlot(key_prefix, _build_cache_key(func, args, kwargs, key_builder), local_ttl)
+            cached_data = slot.get()
 
             if cached_data is not None:
-                logger.debug(f"🎯 Cache HIT: {cache_key}")
+                _cache_counters["hits"] += 1
+                logger.debug(f"🎯 Cache HIT: {slot.describe()}")
                 return cached_data
 
             # Cache miss - execute function
-            logger.debug(f"❌ Cache MISS: {cache_key}")
+            _cache_counters["misses"] += 1
+            logger.debug(f"❌ Cache MISS: {slot.describe()}")
             result = func(*args, **kwargs)
 
             # Store in cache
-            _set_in_cache(cache_key, result, ttl)
+            slot.set(result, ttl)
 
             return result
 
@@ -108,10 +202,96 @@ def cache_response(
     return decorator
 
 
+class _CacheSlot:
+    """Where one decorated call lives in the local and Redis tiers"""
+
+    def __init__(self, prefix: str, arg_key: str, local_ttl: Optional[int]):
+        self.prefix = prefix
+        self.arg_key = arg_key
+        self.local_ttl = local_ttl
+        self.redis_key: Optional[str] = None
+        if local_ttl:
+            _ensure_invalidation_listener()
+            self.local_key = f"{prefix}:{arg_key}"
+            self.local_generation = local_cache.generation(prefix)
+
+    def describe(self) -> str:
+        return self.redis_key or f"{self.prefix}:{self.arg_key}"
+
+    def get(self) -> Optional[Any]:
+        """Read through local tier, then Redis (promoting Redis hits locally)"""
+        if self.local_ttl:
+            payload = local_cache.get(self.local_key)
+            if payload is not None:
+                return loads(payload)
+
+        self.redis_key = f"{self.prefix}:v{_get_prefix_version(self.prefix)}:{self.arg_key}"
+        payload = _get_from_cache(self.redis_key)
+        if payload is None:
+            return None
+
+        if self.local_ttl:
+            local_cache.set(self.local_key, self.prefix, payload, self.local_ttl, self.local_generation)
+        return loads(payload)
+
+    def set(self, data: Any, ttl: int):
+        """Write a freshly computed result to both tiers"""
+        try:
+            payload = _serialize(data)
+        except Exception as e:
+            logger.error(f"❌ Cache serialization error for {self.describe()}: {e}")
+            return
+
+        if self.redis_key is not None:
+            _set_in_cache(self.redis_key, payload, ttl)
+        if self.local_ttl:
+            local_cache.set(self.local_key, self.prefix, payload, self.local_ttl, self.local_generation)
+
+
+def cached_value(
+    prefix: str,
+    arg_key: str,
+    loader: Callable[[], Any],
+    ttl: int,
+    local_ttl: Optional[int] = None
+) -> Any:
+    """
+    Read-through cache for a value outside an endpoint (same tiers and
+    invalidation as @cache_response). None results are not cached.
+
+    Example:
+        fields = cached_value("principal", username, lambda: load_user(username),
+                              ttl=CacheTTL.PRINCIPAL, local_ttl=CacheTTL.LOCAL_PRINCIPAL)
+    """
+    slot = _CacheSlot(prefix, arg_key, local_ttl)
+    data = slot.get()
+    if data is not None:
+        return data
+
+    data = loader()
+    if data is not None:
+        slot.set(data, ttl)
+    return data
+
+
+def prefix_generation(prefix: str) -> int:
+    """
+    This worker's generation of a prefix. It changes on every invalidation,
+    local or received over pub/sub, so in-process indexes built from the same
+    data can tell when to rebuild.
+    """
+    _ensure_invalidation_listener()
+    return local_cache.generation(prefix)
+
+
 def invalidate_cache(key_pattern: str):
     """
     Invalidate cache entries matching a pattern
 
+    Whole-prefix patterns ("buyers:*") bump the prefix generation counter in
+    O(1); entries under the old generation are never read again and expire
+    by TTL. Any other pattern falls back to an incremental SCAN + UNLINK.
+
     Args:
         key_pattern: Redis key pattern (e.g., "buyers:*", "sample:123")
 
@@ -119,50 +299,160 @@ def invalidate_cache(key_pattern: str):
         invalidate_cache("buyers:*")  # Clear all buyer caches
         invalidate_cache("buyer:123")  # Clear specific buyer cache
     """
+    prefix = _whole_prefix(key_pattern)
+    if prefix is not None:
+        invalidate_prefix(prefix)
+    else:
+        _invalidate_by_scan(key_pattern)
+
+
+def invalidate_prefix(prefix: str):
+    """
+    Invalidate every cache entry under a prefix by bumping its generation,
+    and tell the other workers to drop their local copies
+    """
+    local_cache.invalidate_prefix(prefix)
+
     client = get_redis_client()
     if client is None:
         return
 
     try:
-        keys = client.keys(key_pattern)
-        if keys:
-            client.delete(*keys)
-            logger.info(f"🗑️  Invalidated {len(keys)} cache entries: {key_pattern}")
+        pipe = client.pipeline()
+        pipe.incr(_version_key(prefix))
+        pipe.publish(INVALIDATION_CHANNEL, prefix)
+        version, _ = pipe.execute()
+        logger.info(f"🗑️  Invalidated cache prefix '{prefix}' (generation {version})")
     except Exception as e:
         logger.error(f"❌ Cache invalidation failed: {e}")
 
 
+def _ensure_invalidation_listener():
+    """Start this worker's pub/sub listener thread (lazily, after fork)"""
+    global _listener_thread
+
+    if _listener_thread is not None and _listener_thread.is_alive():
+        return
+
+    with _listener_lock:
+        if _listener_thread is None or not _listener_thread.is_alive():
+            _listener_thread = threading.Thread(
+                target=_listen_for_invalidations,
+                name="cache-invalidation-listener",
+                daemon=True
+            )
+            _listener_thread.start()
+
+
+def _listen_for_invalidations():
+    """Apply invalidations published by other workers to the local tier"""
+    while True:
+        client = get_redis_client()
+        if client is None:
+            # Redis unavailable: local entries simply expire by local_ttl
+            time.sleep(30)
+            continue
+
+        try:
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(INVALIDATION_CHANNEL)
+            # Messages may have been missed while disconnected
+            local_cache.clear()
+            for message in pubsub.listen():
+                if message.get("type") == "message":
+                    local_cache.invalidate_prefix(message["data"])
+        except Exception as e:
+            logger.warning(f"⚠️  Cache invalidation listener error: {e}. Reconnecting...")
+            time.sleep(5)
+
+
+def _invalidate_by_scan(key_pattern: str, batch_size: int = 1000):
+    """Delete keys matching an ad-hoc pattern without blocking Redis (no KEYS)"""
+    client = get_redis_client()
+    if client is None:
+        return
+
+    try:
+        deleted = 0
+        batch = []
+        for key in client.scan_iter(match=key_pattern, count=batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                deleted += client.unlink(*batch)
+                batch = []
+        if batch:
+            deleted += client.unlink(*batch)
+        if deleted:
+            logger.info(f"🗑️  Invalidated {deleted} cache entries: {key_pattern}")
+    except Exception as e:
+        logger.error(f"❌ Cache invalidation failed: {e}")
+
+
+def _whole_prefix(key_pattern: str) -> Optional[str]:
+    """Return the prefix for "prefix:*" patterns, None for any other pattern"""
+    if not key_pattern.endswith(":*"):
+        return None
+    prefix = key_pattern[:-2]
+    if not prefix or any(ch in prefix for ch in "*?[]:"):
+        return None
+    return prefix
+
+
+def _version_key(prefix: str) -> str:
+    """Redis key holding the generation counter for a cache prefix"""
+    return f"cache_version:{prefix}"
+
+
+def _get_prefix_version(prefix: str) -> int:
+    """Current generation of a cache prefix (0 when never invalidated)"""
+    client = get_redis_client()
+    if client is None:
+        return 0
+
+    try:
+        return int(client.get(_version_key(prefix)) or 0)
+    except Exception as e:
+        logger.error(f"❌ Cache version read error for {prefix}: {e}")
+        return 0
+
+
 def _build_cache_key(
-    prefix: str,
     func: Callable,
     args: tuple,
     kwargs: dict,
     key_builder: Optional[Callable] = None
 ) -> str:
-    """Build cache key from function arguments"""
+    """Build the argument part of a cache key (prefix and generation are added per tier)"""
     if key_builder:
-        return f"{prefix}:{key_builder(*args, **kwargs)}"
+        return str(key_builder(*args, **kwargs))
 
     # Default key builder: combine all arguments
-    key_parts = [prefix]
+    key_parts = []
 
-    # Add positional arguments (skip 'db' session)
+    # Add positional arguments (skip 'db' session and request/response objects)
     for arg in args:
-        if hasattr(arg, '__class__') and 'Session' in arg.__class__.__name__:
-            continue  # Skip database session
+        if _is_injected(arg):
+            continue
         key_parts.append(str(arg))
 
-    # Add keyword arguments (skip 'db' session)
+    # Add keyword arguments (skip 'db' session and request/response objects)
     for k, v in sorted(kwargs.items()):
-        if k == 'db':
+        if k == 'db' or _is_injected(v):
             continue
         key_parts.append(f"{k}={v}")
 
     return ":".join(key_parts)
 
 
-def _get_from_cache(key: str) -> Optional[Any]:
-    """Get data from Redis cache"""
+def _is_injected(value: Any) -> bool:
+    """True for framework-injected arguments that must not be part of a cache key"""
+    if 'Session' in value.__class__.__name__:
+        return True  # Database session
+    return isinstance(value, (Request, Response))
+
+
+def _get_from_cache(key: str) -> Optional[Payload]:
+    """Get a serialized payload from Redis cache"""
     client = get_redis_client()
     if client is None:
         return None
@@ -170,47 +460,64 @@ def _get_from_cache(key: str) -> Optional[Any]:
     try:
         cached = client.get(key)
         if cached:
-            return json.loads(cached)
+            return cached
     except Exception as e:
         logger.error(f"❌ Cache read error for {key}: {e}")
 
     return None
 
 
-def _set_in_cache(key: str, data: Any, ttl: int):
-    """Store data in Redis cache"""
+def _serialize(data: Any) -> bytes:
+    """Serialize an endpoint result (Pydantic, SQLAlchemy or plain data) to orjson bytes"""
+    # Convert Pydantic models to dict if needed
+    if hasattr(data, 'model_dump'):
+        data = data.model_dump()
+    elif hasattr(data, '__dict__'):
+        # Handle SQLAlchemy models
+        data = {c.name: getattr(data, c.name) for c in data.__table__.columns}
+    elif isinstance(data, list):
+        # Handle list of models
+        data = [
+            item.model_dump() if hasattr(item, 'model_dump')
+            else {c.name: getattr(item, c.name) for c in item.__table__.columns}
+            if hasattr(item, '__table__') else item
+            for item in data
+        ]
+
+    return dumps(data)
+
+
+def _set_in_cache(key: str, payload: bytes, ttl: int):
+    """Store a serialized payload in Redis cache"""
     client = get_redis_client()
     if client is None:
         return
 
     try:
-        # Convert Pydantic models to dict if needed
-        if hasattr(data, 'model_dump'):
-            data = data.model_dump()
-        elif hasattr(data, '__dict__'):
-            # Handle SQLAlchemy models
-            data = {c.name: getattr(data, c.name) for c in data.__table__.columns}
-        elif isinstance(data, list):
-            # Handle list of models
-            data = [
-                item.model_dump() if hasattr(item, 'model_dump')
-                else {c.name: getattr(item, c.name) for c in item.__table__.columns}
-                if hasattr(item, '__table__') else item
-                for item in data
-            ]
-
-        serialized = json.dumps(data, default=str)  # default=str for dates
-        client.setex(key, ttl, serialized)
+        client.setex(key, ttl, payload)
         logger.debug(f"💾 Cached: {key} (TTL: {ttl}s)")
     except Exception as e:
         logger.error(f"❌ Cache write error for {key}: {e}")
 
 
+def get_endpoint_cache_stats() -> dict:
+    """Get hit/miss counters for @cache_response endpoints in this worker"""
+    hits = _cache_counters["hits"]
+    misses = _cache_counters["misses"]
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / total * 100, 2) if total else 0.0,
+        "local": local_cache.stats()
+    }
+
+
 def get_cache_stats() -> dict:
     """Get Redis cache statistics"""
     client = get_redis_client()
     if client is None:
-        return {"status": "disabled", "connected": False}
+        return {"status": "disabled", "connected": False, "endpoints": get_endpoint_cache_stats()}
 
     try:
         info = client.info()
@@ -225,11 +532,12 @@ def get_cache_stats() -> dict:
                 info.get('keyspace_hits', 0) /
                 (info.get('keyspace_hits', 0) + info.get('keyspace_misses', 0) + 1) * 100,
                 2
-            )
+            ),
+            "endpoints": get_endpoint_cache_stats()
         }
     except Exception as e:
         logger.error(f"❌ Failed to get cache stats: {e}")
-        return {"status": "error", "connected": False, "error": str(e)}
+        return {"status": "error", "connected": False, "error": str(e), "endpoints": get_endpoint_cache_stats()}
 
 
 # Cache TTL configurations (in seconds)
@@ -241,3 +549,6 @@ class CacheTTL:
     MATERIAL_DATA = 1800       # 30 minutes - Material master (rarely changes)
     USER_DATA = 600            # 10 minutes - User profiles
     DASHBOARD_STATS = 120      # 2 minutes - Dashboard statistics
+    LOCAL_MASTER_DATA = 300    # 5 minutes - In-process tier for master data (bounds staleness if pub/sub is down)
+    PRINCIPAL = 60             # 1 minute - Authenticated user records
+    LOCAL_PRINCIPAL = 15       # 15 seconds - In-process tier for authenticated user records
@@ -52,17 +52,53 @@ class Settings(BaseSettings):
     )
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "10080"))  # 7 days default
+    # Authenticate from the signed token claims (department, is_active, is_superuser)
+    # without loading the user. Deactivation and department changes then only apply
+    # to new tokens, so pair this with a short ACCESS_TOKEN_EXPIRE_MINUTES.
+    AUTH_TRUST_TOKEN_CLAIMS: bool = False
+
+    # Password hashing (bcrypt) runs on a process pool during login/registration
+    BCRYPT_ROUNDS: int = 12  # Cost for new hashes
+    PASSWORD_REHASH_ON_LOGIN: bool = False  # Upgrade hashes below BCRYPT_ROUNDS on successful login
+    PASSWORD_HASH_WORKERS: int = max(1, min(os.cpu_count() or 1, 4))  # Concurrent bcrypt operations per worker
+    PASSWORD_HASH_MAX_QUEUE: int = 200  # Callers waiting beyond this get 503 + Retry-After
+    AUTH_DB_THREADS: int = 5  # Threads for login/registration user lookups
 
     # Redis Cache
     REDIS_HOST: str = "redis"
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
     REDIS_PASSWORD: Optional[str] = None
+    LOCAL_CACHE_MAX_ENTRIES: int = 1024  # Per-worker in-process cache tier size
 
     # Database Connection Pool Settings
     POOL_SIZE: int = 10
     MAX_OVERFLOW: int = 10
 
+    # Dedicated thread pool for blocking merchandiser DB work
+    # Keep <= POOL_SIZE + MAX_OVERFLOW so threads never queue on the connection pool
+    MERCHANDISER_DB_THREADS: int = 20
+    # Threads for notification stream snapshots (one short query burst per (re)connect)
+    NOTIFICATION_DB_THREADS: int = 5
+
+    # Transactional outbox replication (SampleRequest <-> SamplePrimaryInfo)
+    OUTBOX_POLL_INTERVAL: float = 1.0  # Seconds between polls when idle
+    OUTBOX_BATCH_SIZE: int = 200
+    OUTBOX_MAX_ATTEMPTS: int = 10  # Then the event is kept as failed
+
+    # Seconds between rewrites of the Redis unread-notification counters from the database
+    UNREAD_RECONCILE_INTERVAL: float = 600.0
+
+    # Numbers reserved per round trip by the ID allocator for block-allocated series
+    # (1 = no gaps and strictly increasing; larger blocks trade gaps on restart for fewer updates)
+    ID_ALLOCATOR_BLOCK_SIZE: int = 1
+
+    # Pagination - hard server-side cap on rows returned by a list endpoint page
+    PAGINATION_MAX_LIMIT: int = 500
+    # Higher cap for the few lists the frontend still loads whole (buyers, orders,
+    # sample requests, sample primary info); passed explicitly by those endpoints
+    PAGINATION_BULK_MAX_LIMIT: int = 10000
+
     # CORS - Configure via environment variable
     # In production, set CORS_ORIGINS to comma-separated list: "https://app.example.com,https://admin.example.com"
     # In development, defaults to allow all for local development
@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import OperationalError, IntegrityError, ProgrammingError
@@ -54,6 +55,32 @@ SessionLocalOrders = sessionmaker(autocommit=False, autoflush=False, bind=engine
 SessionLocalMerchandiser = sessionmaker(autocommit=False, autoflush=False, bind=engines[DatabaseType.MERCHANDISER])
 SessionLocalSettings = sessionmaker(autocommit=False, autoflush=False, bind=engines[DatabaseType.SETTINGS])
 
+# Async engines for each database (asyncpg driver, same pool settings)
+# NOTE: these keep their own pools, so async and sync pools together must stay
+# under PostgreSQL max_connections while routes are being migrated
+def _to_async_url(url: str) -> str:
+    """Convert a sync postgresql:// URL to the asyncpg dialect"""
+    return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+
+async_engines = {
+    DatabaseType.CLIENTS: create_async_engine(_to_async_url(settings.DATABASE_URL_CLIENTS), **POOL_SETTINGS),
+    DatabaseType.SAMPLES: create_async_engine(_to_async_url(settings.DATABASE_URL_SAMPLES), **POOL_SETTINGS),
+    DatabaseType.USERS: create_async_engine(_to_async_url(settings.DATABASE_URL_USERS), **POOL_SETTINGS),
+    DatabaseType.ORDERS: create_async_engine(_to_async_url(settings.DATABASE_URL_ORDERS), **POOL_SETTINGS),
+    DatabaseType.MERCHANDISER: create_async_engine(_to_async_url(settings.DATABASE_URL_MERCHANDISER), **POOL_SETTINGS),
+    DatabaseType.SETTINGS: create_async_engine(_to_async_url(settings.DATABASE_URL_SETTINGS), **POOL_SETTINGS),
+}
+
+# Create AsyncSessionLocal classes for each database
+# expire_on_commit=False avoids implicit lazy refreshes (not allowed under asyncio)
+AsyncSessionLocalClients = async_sessionmaker(bind=async_engines[DatabaseType.CLIENTS], autoflush=False, expire_on_commit=False)
+AsyncSessionLocalSamples = async_sessionmaker(bind=async_engines[DatabaseType.SAMPLES], autoflush=False, expire_on_commit=False)
+AsyncSessionLocalUsers = async_sessionmaker(bind=async_engines[DatabaseType.USERS], autoflush=False, expire_on_commit=False)
+AsyncSessionLocalOrders = async_sessionmaker(bind=async_engines[DatabaseType.ORDERS], autoflush=False, expire_on_commit=False)
+AsyncSessionLocalMerchandiser = async_sessionmaker(bind=async_engines[DatabaseType.MERCHANDISER], autoflush=False, expire_on_commit=False)
+AsyncSessionLocalSettings = async_sessionmaker(bind=async_engines[DatabaseType.SETTINGS], autoflush=False, expire_on_commit=False)
+
 # Create separate Base classes for each database
 BaseClients = declarative_base()
 BaseSamples = declarative_base()
@@ -131,6 +158,48 @@ def get_db():
         db.close()
 
 
+async def get_async_db_clients():
+    """Get async database session for clients DB"""
+    async with AsyncSessionLocalClients() as db:
+        yield db
+
+
+async def get_async_db_samples():
+    """Get async database session for samples DB"""
+    async with AsyncSessionLocalSamples() as db:
+        yield db
+
+
+async def get_async_db_users():
+    """Get async database session for users DB"""
+    async with AsyncSessionLocalUsers() as db:
+        yield db
+
+
+async def get_async_db_orders():
+    """Get async database session for orders DB"""
+    async with AsyncSessionLocalOrders() as db:
+        yield db
+
+
+async def get_async_db_merchandiser():
+    """Get async database session for merchandiser DB"""
+    async with AsyncSessionLocalMerchandiser() as db:
+        yield db
+
+
+async def get_async_db_settings():
+    """Get async database session for settings DB"""
+    async with AsyncSessionLocalSettings() as db:
+        yield db
+
+
+async def dispose_async_engines():
+    """Close all async engine pools (call on application shutdown)"""
+    for async_engine in async_engines.values():
+        await async_engine.dispose()
+
+
 def init_db():
     """Initialize all databases - create all tables"""
     max_retries = 5
@@ -2,10 +2,9 @@
 Common dependencies for FastAPI routes
 Provides reusable dependency functions for authentication and database access
 """
-from fastapi import Depends, HTTPException, status, Header
-from sqlalchemy.orm import Session
+from fastapi import HTTPException, status, Header
 from typing import Optional
-from core.database import get_db_users
+from core.principal import get_principal
 from core.security import decode_token
 from modules.users.models.user import User
 from core.logging import setup_logging
@@ -14,12 +13,15 @@ logger = setup_logging()
 
 
 def get_current_user(
-    authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db_users)
+    authorization: Optional[str] = Header(None)
 ) -> User:
     """
     Dependency to get current authenticated user from JWT token
     
+    The user comes from the principal cache (or the token's signed claims
+    with AUTH_TRUST_TOKEN_CLAIMS), so no users-DB session is opened per
+    request. It is a detached User: query the users DB to modify it.
+    
     Usage:
         @router.post("/endpoint")
         def my_endpoint(
@@ -54,7 +56,7 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = db.query(User).filter(User.username == username).first()
+    user = get_principal(payload)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
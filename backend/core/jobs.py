@@ -0,0 +1,200 @@
+"""
+Background Job Tracking
+Progress records for long-running work started from an API request and run
+after the response (FastAPI BackgroundTasks). Records live in Redis so any
+worker can report them; without Redis they are kept in-process.
+
+A job holds its kind's active marker on a JOB_LEASE lease that every
+update_job call renews, so job bodies must report progress at least that
+often. A queued or running job whose heartbeat is older than the lease is
+treated as lost (its worker died) and reported as failed.
+"""
+import asyncio
+import logging
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+
+from .cache import get_redis_client
+from .serialization import dumps, loads
+from .threadpool import run_blocking
+
+logger = logging.getLogger(__name__)
+
+JOB_TTL = 86400  # Keep finished job records for a day
+JOB_LEASE = 120  # Seconds an active job may go without a heartbeat
+ACTIVE_STATUSES = ("queued", "running")
+
+# In-process fallback when Redis is unavailable
+_local_jobs: Dict[str, dict] = {}
+_local_active: Dict[str, str] = {}
+_local_lock = threading.Lock()
+
+
+def _job_key(job_id: str) -> str:
+    return f"job:{job_id}"
+
+
+def _active_key(kind: str) -> str:
+    return f"job_active:{kind}"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _is_stale(job: dict) -> bool:
+    """Active job whose worker stopped sending heartbeats"""
+    if job["status"] not in ACTIVE_STATUSES:
+        return False
+    heartbeat = datetime.fromisoformat(job.get("heartbeat_at") or job["created_at"])
+    return datetime.now(timezone.utc) - heartbeat > timedelta(seconds=JOB_LEASE)
+
+
+def _fail_if_stale(job: Optional[dict]) -> Optional[dict]:
+    if job is not None and _is_stale(job):
+        job = {**job, "status": "failed", "error": "Job stopped reporting progress", "finished_at": _now()}
+        _save_job(job)
+    return job
+
+
+def get_job(job_id: str) -> Optional[dict]:
+    """Get a job's progress record (lost jobs are reported as failed)"""
+    client = get_redis_client()
+    if client is not None:
+        try:
+            raw = client.get(_job_key(job_id))
+            return _fail_if_stale(loads(raw) if raw else None)
+        except Exception as e:
+            logger.error(f"❌ Job read error for {job_id}: {e}")
+    return _fail_if_stale(_local_jobs.get(job_id))
+
+
+def _save_job(job: dict):
+    client = get_redis_client()
+    if client is not None:
+        try:
+            client.setex(_job_key(job["job_id"]), JOB_TTL, dumps(job))
+            return
+        except Exception as e:
+            logger.error(f"❌ Job write error for {job['job_id']}: {e}")
+    _local_jobs[job["job_id"]] = job
+
+
+def start_job(kind: str) -> Tuple[dict, bool]:
+    """
+    Register a new job of a kind, unless one is already queued/running
+
+    Returns (job, created). When created is False the existing active job is
+    returned so callers can point the client at it instead of starting twice.
+    """
+    job = {
+        "job_id": uuid.uuid4().hex,
+        "kind": kind,
+        "status": "queued",
+        "total": None,
+        "processed": 0,
+        "created_at": _now(),
+        "heartbeat_at": None,
+        "started_at": None,
+        "finished_at": None,
+        "result": None,
+        "error": None,
+    }
+
+    client = get_redis_client()
+    if client is not None:
+        try:
+            if client.set(_active_key(kind), job["job_id"], nx=True, ex=JOB_LEASE):
+                _save_job(job)
+                return job, True
+            existing = get_job(client.get(_active_key(kind)) or "")
+            if existing and existing["status"] in ACTIVE_STATUSES:
+                return existing, False
+            # Stale marker (job finished, expired or lost its worker): take it over
+            client.set(_active_key(kind), job["job_id"], ex=JOB_LEASE)
+            _save_job(job)
+            return job, True
+        except Exception as e:
+            logger.error(f"❌ Job registration via Redis failed: {e}")
+
+    with _local_lock:
+        existing = _fail_if_stale(_local_jobs.get(_local_active.get(kind, "")))
+        if existing and existing["status"] in ACTIVE_STATUSES:
+            return existing, False
+        _local_active[kind] = job["job_id"]
+        _local_jobs[job["job_id"]] = job
+    return job, True
+
+
+def update_job(job: dict, **fields):
+    """Update and persist a job's progress fields (also the job's heartbeat)"""
+    job.update(fields, heartbeat_at=_now())
+    _save_job(job)
+    if job["status"] in ACTIVE_STATUSES:
+        _renew_lease(job)
+
+
+def _renew_lease(job: dict):
+    client = get_redis_client()
+    if client is not None:
+        try:
+            if client.get(_active_key(job["kind"])) == job["job_id"]:
+                client.expire(_active_key(job["kind"]), JOB_LEASE)
+        except Exception as e:
+            logger.error(f"❌ Job lease renewal error for {job['job_id']}: {e}")
+
+
+def _release(job: dict):
+    client = get_redis_client()
+    if client is not None:
+        try:
+            if client.get(_active_key(job["kind"])) == job["job_id"]:
+                client.delete(_active_key(job["kind"]))
+        except Exception as e:
+            logger.error(f"❌ Job release error for {job['job_id']}: {e}")
+    with _local_lock:
+        if _local_active.get(job["kind"]) == job["job_id"]:
+            del _local_active[job["kind"]]
+
+
+def run_job(job: dict, func: Callable[[dict], Any]):
+    """
+    Run func(job) as the job body, recording running/completed/failed
+
+    func reports progress with update_job(job, processed=...) and returns the
+    job result (JSON-serializable). It must call update_job at least every
+    JOB_LEASE seconds, or the job is reported as lost.
+
+    Example:
+        job, created = start_job("sync_to_samples")
+        if created:
+            background_tasks.add_task(run_job, job, SyncService.sync_all_primary_info_to_sample_requests)
+    """
+    update_job(job, status="running", started_at=_now())
+    try:
+        result = func(job)
+        update_job(job, status="completed", result=result, finished_at=_now())
+        logger.info(f"✅ Job {job['kind']} {job['job_id']} completed")
+    except Exception as e:
+        logger.error(f"❌ Job {job['kind']} {job['job_id']} failed: {e}", exc_info=True)
+        update_job(job, status="failed", error=str(e), finished_at=_now())
+    finally:
+        _release(job)
+
+
+async def stream_job_progress(job_id: str, interval: float = 1.0) -> AsyncIterator[str]:
+    """Server-sent events with the job record on each change, until it finishes"""
+    last = None
+    while True:
+        job = await run_blocking("jobs", 4, get_job, job_id)
+        if job is None:
+            yield "event: error\ndata: {\"detail\": \"Job not found\"}\n\n"
+            return
+        if job != last:
+            yield f"data: {dumps(job).decode()}\n\n"
+            last = job
+        if job["status"] not in ACTIVE_STATUSES:
+            return
+        await asyncio.sleep(interval)
@@ -2,15 +2,24 @@
 Notification Service
 Helper functions for sending notifications to users
 """
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
+from sqlalchemy import String, insert, literal, select
 from sqlalchemy.orm import Session
 from core.database import SessionLocalUsers
 from modules.users.models.user import User
 from modules.notifications.models.notification import Notification
+from modules.notifications.schemas.notification import NotificationResponse
 from core.logging import setup_logging
+from core.notification_stream import publish_notifications
+from core.serialization import row_to_dict
+from core.unread_counts import record_unread
 
 logger = setup_logging()
 
+# Background fan-outs (each is a single INSERT ... SELECT, so a small pool suffices)
+_notification_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="notification-fanout")
+
 
 def send_notification_to_department(
     title: str,
@@ -23,6 +32,10 @@ def send_notification_to_department(
     """
     Send notification to all users in a specific department
     
+    The fan-out runs in the database: one INSERT ... SELECT over active users
+    whose department_access JSONB array contains the department (GIN indexed).
+    The created rows are then pushed to the recipients' open notification streams.
+    
     Args:
         title: Notification title
         message: Notification message
@@ -35,39 +48,52 @@ def send_notification_to_department(
         Number of notifications sent
     """
     users_db = SessionLocalUsers()
-    count = 0
     
     try:
-        # Get all active users
-        all_users = users_db.query(User).filter(
-            User.is_active == True
+        recipients = select(
+            User.id,
+            literal(title),
+            literal(message),
+            literal(notification_type),
+            literal(related_entity_type, String),
+            literal(related_entity_id, String),
+            literal(target_department),
+        ).where(
+            User.is_active == True,
+            User.department_access.contains([target_department])
+        )
+        created = users_db.execute(
+            insert(Notification).from_select(
+                ["user_id", "title", "message", "type", "related_entity_type", "related_entity_id", "target_department"],
+                recipients
+            ).returning(Notification.id, Notification.user_id, Notification.created_at)
         ).all()
+        users_db.commit()
         
-        # Filter users who have the target department in their department_access array
-        users = [
-            user for user in all_users 
-            if user.department_access and target_department in user.department_access
-        ]
-        
-        if not users:
+        count = len(created)
+        if not count:
             logger.warning(f"No active users found for department: {target_department}")
             return 0
         
-        # Create notification for each user
-        for user in users:
-            notification = Notification(
-                user_id=user.id,
-                title=title,
-                message=message,
-                type=notification_type,
-                related_entity_type=related_entity_type,
-                related_entity_id=related_entity_id,
-                target_department=target_department
-            )
-            users_db.add(notification)
-            count += 1
+        seq = record_unread((row.user_id, target_department) for row in created)
+        publish_notifications([
+            {
+                "id": row.id,
+                "user_id": row.user_id,
+                "title": title,
+                "message": message,
+                "type": notification_type,
+                "related_entity_type": related_entity_type,
+                "related_entity_id": related_entity_id,
+                "target_department": target_department,
+                "is_read": False,
+                "read_at": None,
+                "created_at": row.created_at,
+                "updated_at": None,
+            }
+            for row in created
+        ], seq=seq)
         
-        users_db.commit()
         logger.info(f"Sent {count} notifications to department: {target_department}")
         return count
         
@@ -79,6 +105,30 @@ def send_notification_to_department(
         users_db.close()
 
 
+def send_notification_to_department_background(
+    title: str,
+    message: str,
+    target_department: str,
+    notification_type: str = "info",
+    related_entity_type: Optional[str] = None,
+    related_entity_id: Optional[str] = None
+) -> None:
+    """
+    Fire-and-forget send_notification_to_department (the caller doesn't wait)
+    
+    Call after the triggering change is committed; failures are logged.
+    """
+    _notification_executor.submit(
+        send_notification_to_department,
+        title=title,
+        message=message,
+        target_department=target_department,
+        notification_type=notification_type,
+        related_entity_type=related_entity_type,
+        related_entity_id=related_entity_id
+    )
+
+
 def send_notification_to_user(
     user_id: int,
     title: str,
@@ -117,6 +167,9 @@ def send_notification_to_user(
         )
         users_db.add(notification)
         users_db.commit()
+        users_db.refresh(notification)
+        seq = record_unread([(user_id, target_department)])
+        publish_notifications([row_to_dict(notification, NotificationResponse)], seq=seq)
         logger.info(f"Sent notification to user ID: {user_id}")
         return True
         
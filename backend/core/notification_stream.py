@@ -0,0 +1,312 @@
+"""
+Push Delivery of Notifications (Server-Sent Events)
+Notification writes publish events on Redis pub/sub; each worker runs one
+dispatcher thread that forwards them to the SSE streams it holds, so open
+tabs no longer poll the unread count.
+
+Stream events:
+- "notification" (with SSE id = notification id): a new notification
+- "unread_count": {"count": n} on connect, {"delta": +1/-1} afterwards
+- "resync": missed too much (or lost pub/sub) - refetch the list
+
+EventSource cannot send an Authorization header, so browsers open the
+stream with a single-use ticket (issue_stream_ticket, valid for
+STREAM_TICKET_TTL seconds) instead of putting the access token in the URL.
+
+A reconnecting client sends Last-Event-ID and gets the notifications it
+missed replayed from the database. Events already covered by the snapshot
+a stream starts from are skipped: notifications by id against the highest
+id, count changes by the unread change sequence (core.unread_counts)
+against the sequence the count was read at. Without Redis, events only
+reach streams held by the worker that wrote them.
+"""
+import asyncio
+import logging
+import secrets
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from .cache import get_redis_client
+from .serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_CHANNEL = "notification_events"
+REPLAY_LIMIT = 100  # Missed notifications replayed on reconnect before asking for a resync
+MAX_PENDING_EVENTS = 256  # Per stream; a slower client is disconnected and replays on reconnect
+HEARTBEAT_INTERVAL = 15  # Seconds between keep-alive comments (keeps proxies from closing idle streams)
+RETRY_MS = 5000  # Client reconnect delay
+STREAM_TICKET_TTL = 30  # Seconds a stream ticket can be redeemed
+
+# Snapshot for a new stream:
+# (unread count, change sequence of the count, highest notification id, missed notifications)
+StreamSnapshot = Tuple[int, Optional[int], Optional[int], List[dict]]
+
+
+def notification_visible(target_department: Optional[str], user_department: Optional[str]) -> bool:
+    """Same department rule as the notification list queries"""
+    if not user_department or target_department is None:
+        return True
+    return user_department.lower() in target_department.lower()
+
+
+class _Subscriber:
+    """One open stream: an asyncio queue fed from the dispatcher thread"""
+
+    def __init__(self, user_id: int, department: Optional[str]):
+        self.user_id = user_id
+        self.department = department
+        self.loop = asyncio.get_running_loop()
+        self.queue: "asyncio.Queue[Optional[dict]]" = asyncio.Queue()
+        self.overflowed = False
+
+    def deliver(self, event: Optional[dict]):
+        """Called from any thread; None asks the stream to resync"""
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event: Optional[dict]):
+        if self.overflowed:
+            return
+        if event is None or self.queue.qsize() >= MAX_PENDING_EVENTS:
+            self.overflowed = True
+            self.queue.put_nowait(None)
+            return
+        self.queue.put_nowait(event)
+
+
+_subscribers: Dict[int, Set[_Subscriber]] = {}
+_subscribers_lock = threading.Lock()
+_dispatcher_thread: Optional[threading.Thread] = None
+_dispatcher_lock = threading.Lock()
+
+# In-process fallback for stream tickets when Redis is unavailable: ticket -> (expires at, claims)
+_local_tickets: Dict[str, Tuple[float, dict]] = {}
+_tickets_lock = threading.Lock()
+
+
+def _ticket_key(ticket: str) -> str:
+    return f"notification_stream_ticket:{ticket}"
+
+
+def issue_stream_ticket(claims: dict) -> str:
+    """Single-use ticket standing in for an access token's claims when opening a stream"""
+    ticket = secrets.token_urlsafe(32)
+    client = get_redis_client()
+    if client is not None:
+        try:
+            client.set(_ticket_key(ticket), dumps(claims), ex=STREAM_TICKET_TTL)
+            return ticket
+        except Exception as e:
+            logger.error(f"❌ Stream ticket write error: {e}")
+    with _tickets_lock:
+        _local_tickets[ticket] = (time.monotonic() + STREAM_TICKET_TTL, claims)
+    return ticket
+
+
+def redeem_stream_ticket(ticket: str) -> Optional[dict]:
+    """The claims a ticket was issued for, or None if unknown, expired or already used"""
+    client = get_redis_client()
+    if client is not None:
+        try:
+            raw = client.getdel(_ticket_key(ticket))
+            if raw:
+                return loads(raw)
+        except Exception as e:
+            logger.error(f"❌ Stream ticket read error: {e}")
+    with _tickets_lock:
+        now = time.monotonic()
+        for expired in [t for t, (expires_at, _) in _local_tickets.items() if expires_at <= now]:
+            del _local_tickets[expired]
+        entry = _local_tickets.pop(ticket, None)
+    return entry[1] if entry else None
+
+
+def _dispatch(events: List[dict]):
+    """Hand events to the streams of their users held by this worker"""
+    with _subscribers_lock:
+        targets = [(event, list(_subscribers.get(event["user_id"], ()))) for event in events]
+    for event, subscribers in targets:
+        for subscriber in subscribers:
+            subscriber.deliver(event)
+
+
+def _resync_all():
+    with _subscribers_lock:
+        subscribers = [s for group in _subscribers.values() for s in group]
+    for subscriber in subscribers:
+        subscriber.deliver(None)
+
+
+def publish_events(events: List[dict]):
+    """
+    Publish stream events to every worker
+
+    Each event is {"user_id": ..., "event": "notification" | "unread_count", "data": {...}},
+    plus "seq" when it changed the unread count (from record_unread/reset_unread).
+    Call after the change is committed.
+    """
+    if not events:
+        return
+
+    client = get_redis_client()
+    if client is not None:
+        try:
+            client.publish(NOTIFICATION_CHANNEL, dumps(events))
+            return
+        except Exception as e:
+            logger.error(f"❌ Notification publish failed: {e}")
+    _dispatch(events)
+
+
+def publish_notifications(notifications: List[dict], seq: Optional[int] = None):
+    """
+    Publish newly created notifications (dicts shaped like NotificationResponse)
+
+    seq is the change sequence record_unread returned for their counters.
+    """
+    publish_events([
+        {"user_id": n["user_id"], "event": "notification", "data": n, "seq": seq}
+        for n in notifications
+    ])
+
+
+def publish_unread_change(
+    user_id: int,
+    delta: Optional[int] = None,
+    count: Optional[int] = None,
+    seq: Optional[int] = None
+):
+    """Publish an unread-count change (a delta, or the new absolute count) with its change sequence"""
+    data = {"delta": delta} if count is None else {"count": count}
+    publish_events([{"user_id": user_id, "event": "unread_count", "data": data, "seq": seq}])
+
+
+def _listen_for_notifications():
+    """Forward published events to this worker's streams"""
+    connected_before = False
+    while True:
+        client = get_redis_client()
+        if client is None:
+            time.sleep(30)
+            continue
+
+        try:
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(NOTIFICATION_CHANNEL)
+            if connected_before:
+                # Events may have been missed while disconnected
+                _resync_all()
+            connected_before = True
+            for message in pubsub.listen():
+                if message.get("type") == "message":
+                    _dispatch(loads(message["data"]))
+        except Exception as e:
+            logger.warning(f"⚠️  Notification dispatcher error: {e}. Reconnecting...")
+            time.sleep(5)
+
+
+def start_notification_dispatcher():
+    """Start this worker's dispatcher thread (idempotent; called at startup)"""
+    global _dispatcher_thread
+
+    with _dispatcher_lock:
+        if _dispatcher_thread is None or not _dispatcher_thread.is_alive():
+            _dispatcher_thread = threading.Thread(
+                target=_listen_for_notifications,
+                name="notification-dispatcher",
+                daemon=True
+            )
+            _dispatcher_thread.start()
+
+
+def get_stream_stats() -> dict:
+    """Open notification streams held by this worker"""
+    with _subscribers_lock:
+        return {
+            "users": len(_subscribers),
+            "streams": sum(len(group) for group in _subscribers.values()),
+        }
+
+
+def _after_snapshot(event: dict, snapshot_seq: Optional[int], default: bool = True) -> bool:
+    """A count change not yet included in the snapshot's count (`default` if either has no sequence)"""
+    seq = event.get("seq")
+    if snapshot_seq is None or seq is None:
+        return default
+    return seq > snapshot_seq
+
+
+def _format_event(event: str, data: Any, event_id: Optional[int] = None) -> str:
+    lines = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{lines}event: {event}\ndata: {dumps(data).decode()}\n\n"
+
+
+async def notification_event_stream(
+    user_id: int,
+    department: Optional[str],
+    load_snapshot: Callable[[], Awaitable[StreamSnapshot]]
+) -> AsyncIterator[str]:
+    """
+    Server-sent events for one user's notifications
+
+    The subscription is opened before load_snapshot runs, so nothing written
+    in between is lost. Live notifications up to the snapshot's highest id
+    are already covered by the replay, and count changes up to its change
+    sequence by the unread count; both are skipped.
+
+    Example:
+        async def load():
+            return await run_blocking("notifications", 10, _load_snapshot, user.id, last_event_id)
+
+        return StreamingResponse(
+            notification_event_stream(user.id, user.department, load),
+            media_type="text/event-stream"
+        )
+    """
+    start_notification_dispatcher()
+    subscriber = _Subscriber(user_id, department)
+    with _subscribers_lock:
+        _subscribers.setdefault(user_id, set()).add(subscriber)
+
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+
+        unread_count, count_seq, high_water, missed = await load_snapshot()
+        if len(missed) > REPLAY_LIMIT:
+            yield _format_event("resync", {"reason": "too_many_missed"})
+        else:
+            for notification in missed:
+                yield _format_event("notification", notification, notification["id"])
+        yield _format_event("unread_count", {"count": unread_count})
+
+        while True:
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), timeout=HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+
+            if event is None:
+                # Fell behind or the dispatcher reconnected: client reconnects with Last-Event-ID
+                yield _format_event("resync", {"reason": "missed_events"})
+                return
+
+            data = event["data"]
+            if event["event"] == "notification":
+                if not notification_visible(data.get("target_department"), department):
+                    continue
+                fresh = high_water is None or data["id"] > high_water
+                if fresh:
+                    yield _format_event("notification", data, data["id"])
+                if not data.get("is_read") and _after_snapshot(event, count_seq, default=fresh):
+                    yield _format_event("unread_count", {"delta": 1})
+            elif _after_snapshot(event, count_seq):
+                yield _format_event(event["event"], data)
+    finally:
+        with _subscribers_lock:
+            group = _subscribers.get(user_id)
+            if group is not None:
+                group.discard(subscriber)
+                if not group:
+                    del _subscribers[user_id]
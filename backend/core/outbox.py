@@ -0,0 +1,265 @@
+"""
+Transactional Outbox for Cross-Database Replication
+Source changes write an outbox row in the same transaction; a background
+replicator drains it in batches into the other database.
+
+Guarantees:
+- A save is one commit; sync work never runs inside the request
+- Events are applied in id order, so per-sample_id order is preserved
+  (a failing event blocks later events of the same sample until it succeeds)
+- Handlers must be idempotent: an event can be re-applied if the process
+  dies between the target commit and marking it processed
+- Failures are retried with backoff and kept (failed_at) after
+  OUTBOX_MAX_ATTEMPTS instead of being dropped
+"""
+import logging
+import threading
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import Column, DateTime, Integer, JSON, String, Text, exists, func, or_, text
+from sqlalchemy.event import listen
+from sqlalchemy.orm import Session, aliased
+
+from .config import settings
+from .serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+_WAKEUP_PENDING = "outbox_wakeup_pending"  # Session.info flag: after_commit wakeup registered
+
+
+class SyncOutboxMixin:
+    """Columns of a sync_outbox table (one per source database)"""
+    __tablename__ = "sync_outbox"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    aggregate_id = Column(String, nullable=False, index=True)  # sample_id
+    event_type = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=True)
+    processed_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    failed_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+def enqueue_event(db: Session, outbox_model: type, event_type: str, aggregate_id: str, payload: Dict[str, Any]):
+    """
+    Add an outbox event to the caller's session (committed with the source change)
+
+    Example:
+        for key, value in update_data.items():
+            setattr(request, key, value)
+        enqueue_event(db, SyncOutbox, "sample_request.updated", request.sample_id, update_data)
+        db.commit()
+    """
+    db.add(outbox_model(
+        aggregate_id=aggregate_id,
+        event_type=event_type,
+        payload=loads(dumps(payload)),  # JSON-safe (datetimes -> ISO strings)
+        attempts=0
+    ))
+    # Wake the replicator once the event is visible, not while it is still uncommitted
+    if not db.info.get(_WAKEUP_PENDING):
+        db.info[_WAKEUP_PENDING] = True
+        listen(db, "after_commit", _wake_after_commit, once=True)
+
+
+def _wake_after_commit(session: Session):
+    session.info.pop(_WAKEUP_PENDING, None)
+    _wakeup.set()
+
+
+# Handler: (target session, payload, aggregate_id, batch context) -> None
+OutboxHandler = Callable[[Session, Dict[str, Any], str, Dict[str, Any]], None]
+
+
+class OutboxRelay:
+    """Drains one source database's outbox into a target database"""
+
+    def __init__(
+        self,
+        name: str,
+        outbox_model: type,
+        source_session: Callable[[], Session],
+        target_session: Callable[[], Session],
+        handlers: Dict[str, OutboxHandler],
+        prepare: Optional[Callable[[List[Any]], Dict[str, Any]]] = None
+    ):
+        self.name = name
+        self.outbox_model = outbox_model
+        self.source_session = source_session
+        self.target_session = target_session
+        self.handlers = handlers
+        self.prepare = prepare
+        self.lock_key = zlib.crc32(f"sync_outbox:{name}".encode())  # advisory lock id
+        self.applied = 0
+        self.retried = 0
+        self.dead = 0
+        self.last_drain_at: Optional[str] = None
+
+    def drain_once(self, batch_size: int) -> int:
+        """Apply one batch of pending events; returns how many were applied"""
+        Outbox = self.outbox_model
+        source = self.source_session()
+        try:
+            # One drainer per outbox across all workers (released at commit)
+            if not source.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": self.lock_key}).scalar():
+                return 0
+
+            # Skip events still backing off, and every later event of their
+            # aggregate, so they don't take up batch slots (per-sample order kept)
+            now = datetime.now(timezone.utc)
+            earlier = aliased(Outbox)
+            aggregate_backing_off = exists().where(
+                earlier.aggregate_id == Outbox.aggregate_id,
+                earlier.id < Outbox.id,
+                earlier.processed_at.is_(None),
+                earlier.failed_at.is_(None),
+                earlier.next_attempt_at > now
+            )
+            events = source.query(Outbox).filter(
+                Outbox.processed_at.is_(None),
+                Outbox.failed_at.is_(None),
+                or_(Outbox.next_attempt_at.is_(None), Outbox.next_attempt_at <= now),
+                ~aggregate_backing_off
+            ).order_by(Outbox.id).limit(batch_size).all()
+            if not events:
+                source.commit()
+                return 0
+
+            applied = self._apply(events)
+            source.commit()
+            self.last_drain_at = datetime.now(timezone.utc).isoformat()
+            return applied
+        except Exception as e:
+            source.rollback()
+            logger.error(f"❌ Outbox relay '{self.name}' batch failed: {e}", exc_info=True)
+            return 0
+        finally:
+            source.close()
+
+    def _apply(self, events: List[Any]) -> int:
+        now = datetime.now(timezone.utc)
+        blocked = set()
+        context = self.prepare(events) if self.prepare else {}
+        results = []
+
+        target = self.target_session()
+        try:
+            for event in events:
+                if event.aggregate_id in blocked:
+                    continue
+                if event.next_attempt_at is not None and event.next_attempt_at > now:
+                    blocked.add(event.aggregate_id)  # keep per-sample order while backing off
+                    continue
+
+                handler = self.handlers.get(event.event_type)
+                try:
+                    if handler is None:
+                        raise ValueError(f"No handler for event type '{event.event_type}'")
+                    with target.begin_nested():
+                        handler(target, event.payload, event.aggregate_id, context)
+                    results.append((event, None))
+                except Exception as e:
+                    blocked.add(event.aggregate_id)
+                    results.append((event, e))
+            target.commit()
+        except Exception:
+            target.rollback()
+            raise
+        finally:
+            target.close()
+
+        applied = 0
+        for event, error in results:
+            if error is None:
+                event.processed_at = now
+                applied += 1
+                continue
+
+            event.attempts = (event.attempts or 0) + 1
+            event.last_error = str(error)
+            if event.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                event.failed_at = now
+                self.dead += 1
+                logger.error(f"❌ Outbox '{self.name}' event {event.id} ({event.event_type}, {event.aggregate_id}) failed permanently: {error}")
+            else:
+                event.next_attempt_at = now + timedelta(seconds=min(2 ** event.attempts, 300))
+                self.retried += 1
+                logger.warning(f"⚠️  Outbox '{self.name}' event {event.id} failed (attempt {event.attempts}): {error}")
+
+        self.applied += applied
+        return applied
+
+    def stats(self) -> dict:
+        """Backlog and lag of this outbox"""
+        Outbox = self.outbox_model
+        source = self.source_session()
+        try:
+            pending, oldest = source.query(func.count(Outbox.id), func.min(Outbox.created_at)).filter(
+                Outbox.processed_at.is_(None), Outbox.failed_at.is_(None)
+            ).one()
+            failed = source.query(func.count(Outbox.id)).filter(Outbox.failed_at.isnot(None)).scalar()
+        finally:
+            source.close()
+
+        lag = (datetime.now(timezone.utc) - oldest).total_seconds() if oldest else 0.0
+        return {
+            "pending": pending,
+            "failed": failed,
+            "lag_seconds": round(max(lag, 0.0), 1),
+            "applied": self.applied,
+            "retried": self.retried,
+            "last_drain_at": self.last_drain_at,
+        }
+
+
+_relays: List[OutboxRelay] = []
+_wakeup = threading.Event()
+_stop = threading.Event()
+_replicator_thread: Optional[threading.Thread] = None
+
+
+def _replicate_forever():
+    while not _stop.is_set():
+        applied = 0
+        for relay in _relays:
+            applied += relay.drain_once(settings.OUTBOX_BATCH_SIZE)
+        if applied == 0:
+            _wakeup.wait(settings.OUTBOX_POLL_INTERVAL)
+            _wakeup.clear()
+
+
+def start_replicator(relays: List[OutboxRelay]):
+    """Start this worker's replicator thread (relays are also locked per outbox)"""
+    global _replicator_thread
+
+    if _replicator_thread is not None and _replicator_thread.is_alive():
+        return
+
+    _relays[:] = relays
+    _stop.clear()
+    _replicator_thread = threading.Thread(target=_replicate_forever, name="outbox-replicator", daemon=True)
+    _replicator_thread.start()
+    logger.info(f"✅ Outbox replicator started ({', '.join(r.name for r in relays)})")
+
+
+def stop_replicator():
+    """Stop the replicator thread after its current batch"""
+    _stop.set()
+    _wakeup.set()
+
+
+def get_outbox_stats() -> dict:
+    """Per-outbox backlog, failures and replication lag"""
+    stats = {}
+    for relay in _relays:
+        try:
+            stats[relay.name] = relay.stats()
+        except Exception as e:
+            stats[relay.name] = {"error": str(e)}
+    return stats
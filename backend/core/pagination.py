@@ -0,0 +1,116 @@
+"""
+Keyset (Cursor) Pagination Utilities
+Shared cursor pagination for list endpoints, with offset pagination as fallback
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import DateTime, and_, or_, tuple_
+from sqlalchemy.orm import Query
+
+from .config import settings
+
+# Response header carrying the opaque cursor for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def clamp_limit(limit: Optional[int], max_limit: Optional[int] = None) -> int:
+    """Apply the server-side maximum page size (None means 'as many as allowed')"""
+    max_limit = max_limit or settings.PAGINATION_MAX_LIMIT
+    if limit is None or limit > max_limit:
+        return max_limit
+    return limit
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode sort-key values of the last row into an opaque cursor string"""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_columns: Sequence[Any]) -> List[Any]:
+    """Decode a cursor produced by encode_cursor for the given sort columns"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(sort_columns):
+            raise ValueError("cursor does not match sort key")
+        return [
+            datetime.fromisoformat(v) if v is not None and isinstance(col.type, DateTime) else v
+            for v, col in zip(values, sort_columns)
+        ]
+    except (ValueError, TypeError, UnicodeError, json.JSONDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def _after_cursor(sort_columns: Sequence[Any], values: List[Any]):
+    """
+    Build the WHERE clause selecting rows strictly after the cursor (descending order)
+
+    The last column must be a unique, non-null key (normally the primary key).
+    A NULL leading value is handled with PostgreSQL's NULLS FIRST semantics for DESC.
+    """
+    if len(sort_columns) == 1:
+        return sort_columns[0] < values[0]
+
+    leading, leading_value = sort_columns[0], values[0]
+    rest_columns, rest_values = sort_columns[1:], values[1:]
+    if leading_value is None:
+        return or_(
+            and_(leading.is_(None), _after_cursor(rest_columns, rest_values)),
+            leading.isnot(None)
+        )
+    return tuple_(*sort_columns) < tuple_(*values)
+
+
+def keyset_paginate(
+    query: Query,
+    sort_columns: Sequence[Any],
+    response: Optional[Response] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    skip: int = 0,
+    max_limit: Optional[int] = None
+) -> list:
+    """
+    Paginate a query newest-first on sort_columns, e.g. (created_at, id) or (id,)
+
+    With a cursor, rows are selected by key (no scanning of earlier pages);
+    without one, the legacy offset `skip` is used. When more rows exist, the
+    cursor for the next page is set in the X-Next-Cursor response header.
+    Pages are capped at PAGINATION_MAX_LIMIT unless `max_limit` overrides it.
+
+    Example:
+        @router.get("/", response_model=List[OrderResponse])
+        def get_orders(response: Response, cursor: Optional[str] = None, ...):
+            query = db.query(OrderManagement)
+            return keyset_paginate(query, (OrderManagement.id,), response, cursor, limit, skip)
+    """
+    page_size = clamp_limit(limit, max_limit)
+
+    if cursor:
+        query = query.filter(_after_cursor(sort_columns, decode_cursor(cursor, sort_columns)))
+
+    query = query.order_by(*[col.desc() for col in sort_columns])
+    if skip and not cursor:
+        query = query.offset(skip)
+
+    rows = query.limit(page_size + 1).all()
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    if response is not None and has_more and rows:
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            [getattr(last, col.key) for col in sort_columns]
+        )
+
+    return rows
@@ -0,0 +1,99 @@
+"""
+Cached Principals for Authentication
+Resolves the user behind a JWT without a users-DB query per request: user
+records are cached briefly in the local and Redis tiers and invalidated when
+a user is updated or deleted. With AUTH_TRUST_TOKEN_CLAIMS, the signed claims
+embedded at login are used directly.
+"""
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from .cache import CacheTTL, cached_value, invalidate_prefix
+from .config import settings
+from .database import SessionLocalUsers
+from modules.users.models.user import User
+
+PRINCIPAL_CACHE_PREFIX = "principal"
+
+# Cached user columns (everything except the password hash)
+PRINCIPAL_FIELDS = (
+    "id", "email", "username", "full_name", "is_active", "is_superuser",
+    "department", "designation", "department_access", "created_at", "updated_at",
+)
+DATETIME_FIELDS = ("created_at", "updated_at")
+
+# Claims that must be present to authenticate from the token alone
+TRUSTED_CLAIMS = ("sub", "user_id", "department", "is_active", "is_superuser")
+
+
+def principal_claims(user: User) -> Dict[str, Any]:
+    """JWT claims for a user (sub and user_id, plus the trusted principal claims)"""
+    return {
+        "sub": user.username,
+        "user_id": user.id,
+        "department": user.department,
+        "department_access": user.department_access or [],
+        "is_active": bool(user.is_active),
+        "is_superuser": bool(user.is_superuser),
+    }
+
+
+def _load_principal(username: str) -> Optional[Dict[str, Any]]:
+    db = SessionLocalUsers()
+    try:
+        user = db.query(User).filter(User.username == username).first()
+        if user is None:
+            return None
+        return {field: getattr(user, field) for field in PRINCIPAL_FIELDS}
+    finally:
+        db.close()
+
+
+def _to_user(fields: Dict[str, Any]) -> User:
+    """Detached User built from cached fields (read-only; not attached to a session)"""
+    fields = dict(fields)
+    for field in DATETIME_FIELDS:
+        if isinstance(fields.get(field), str):
+            fields[field] = datetime.fromisoformat(fields[field].replace("Z", "+00:00"))
+    return User(**fields)
+
+
+def get_principal(payload: Dict[str, Any], allow_trusted_claims: bool = True) -> Optional[User]:
+    """
+    Get the user for a decoded token payload, or None if the user does not exist
+
+    Returns a detached User: use it for identity and permission checks, and
+    query the users database when the endpoint needs to modify the user.
+    Pass allow_trusted_claims=False when the full record is needed (e.g. /me).
+
+    Example:
+        payload = decode_token(token)
+        user = get_principal(payload) if payload else None
+    """
+    username = payload.get("sub")
+    if not username:
+        return None
+
+    if allow_trusted_claims and settings.AUTH_TRUST_TOKEN_CLAIMS and all(c in payload for c in TRUSTED_CLAIMS):
+        return User(
+            id=payload["user_id"],
+            username=username,
+            department=payload["department"],
+            department_access=payload.get("department_access"),
+            is_active=payload["is_active"],
+            is_superuser=payload["is_superuser"],
+        )
+
+    fields = cached_value(
+        PRINCIPAL_CACHE_PREFIX,
+        username,
+        lambda: _load_principal(username),
+        ttl=CacheTTL.PRINCIPAL,
+        local_ttl=CacheTTL.LOCAL_PRINCIPAL
+    )
+    return _to_user(fields) if fields else None
+
+
+def invalidate_principals():
+    """Drop cached principals on every worker (after a user is updated or deleted)"""
+    invalidate_prefix(PRINCIPAL_CACHE_PREFIX)
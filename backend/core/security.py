@@ -1,21 +1,117 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
 import bcrypt as bcrypt_lib
 from .config import settings
 
+logger = logging.getLogger(__name__)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a hash"""
+    """Verify a password against a hash (runs bcrypt in the calling thread)"""
     return bcrypt_lib.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password"""
-    salt = bcrypt_lib.gensalt()
+    """Hash a password with BCRYPT_ROUNDS (runs bcrypt in the calling thread)"""
+    salt = bcrypt_lib.gensalt(rounds=settings.BCRYPT_ROUNDS)
     return bcrypt_lib.hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True if a bcrypt hash uses fewer rounds than BCRYPT_ROUNDS"""
+    try:
+        return int(hashed_password.split("$")[2]) < settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
+
+
+# Password hashing pool: bcrypt is CPU-bound, so request handlers await it
+# on worker processes instead of holding a thread for ~250ms each
+_password_pool: Optional[ProcessPoolExecutor] = None
+_password_slots: Optional[asyncio.Semaphore] = None
+_password_waiting = 0
+_password_in_flight = 0
+
+
+def _get_password_pool() -> ProcessPoolExecutor:
+    global _password_pool, _password_slots
+    if _password_pool is None:
+        # Spawn, not fork: by the first login other threads (Redis, outbox relay,
+        # executors) may hold locks that a forked child would inherit locked
+        _password_pool = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        _password_slots = asyncio.Semaphore(settings.PASSWORD_HASH_WORKERS)
+        logger.info(f"Password hashing pool started with {settings.PASSWORD_HASH_WORKERS} processes")
+    return _password_pool
+
+
+async def _run_password_job(func, *args):
+    """
+    Run a bcrypt function on the process pool, at most PASSWORD_HASH_WORKERS at
+    a time; beyond PASSWORD_HASH_MAX_QUEUE waiting callers, reject with 503
+    """
+    global _password_waiting, _password_in_flight
+
+    pool = _get_password_pool()
+    if _password_waiting >= settings.PASSWORD_HASH_MAX_QUEUE:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent sign-ins, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+    _password_waiting += 1
+    try:
+        await _password_slots.acquire()
+    finally:
+        _password_waiting -= 1
+
+    _password_in_flight += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+    finally:
+        _password_in_flight -= 1
+        _password_slots.release()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the password hashing pool (for async handlers)"""
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the password hashing pool (for async handlers)"""
+    return await _run_password_job(get_password_hash, password)
+
+
+def shutdown_password_pool():
+    """Stop the password hashing processes"""
+    global _password_pool, _password_slots
+    if _password_pool is not None:
+        _password_pool.shutdown(wait=False, cancel_futures=True)
+        _password_pool = None
+        _password_slots = None
+
+
+def get_password_pool_stats() -> dict:
+    """Hashing processes, jobs running and callers queued for a slot"""
+    return {
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "started": _password_pool is not None,
+        "in_flight": _password_in_flight,
+        "waiting": _password_waiting,
+        "max_queue": settings.PASSWORD_HASH_MAX_QUEUE,
+    }
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -0,0 +1,114 @@
+"""
+Fast JSON Serialization
+orjson helpers shared by the response class and the cache layer, plus a fast
+path for hot list endpoints that return trusted ORM rows
+"""
+import typing
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Tuple, Type
+
+import orjson
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+# UTC datetimes end in "Z" like Pydantic's JSON output; dicts may have int keys
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def _default(value: Any) -> Any:
+    """Fallback for types orjson does not handle natively"""
+    if isinstance(value, Decimal):
+        # As a string, like Pydantic's JSON output (keeps the exact value)
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return str(value)
+
+
+def dumps(data: Any) -> bytes:
+    """Serialize to JSON bytes (datetimes, UUIDs, enums natively; Decimal as str)"""
+    return orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON from bytes or str"""
+    return orjson.loads(data)
+
+
+class FastJSONResponse(ORJSONResponse):
+    """App-wide default response class (orjson with the shared options)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _nested_model(annotation: Any) -> Tuple[Optional[Type[BaseModel]], bool]:
+    """Find a nested schema in a field annotation -> (schema, is_list)"""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+
+    origin = typing.get_origin(annotation)
+    for arg in typing.get_args(annotation):
+        schema, is_list = _nested_model(arg)
+        if schema is not None:
+            return schema, is_list or origin in (list, List)
+    return None, False
+
+
+@lru_cache(maxsize=None)
+def _field_plan(schema: Type[BaseModel]) -> tuple:
+    """Per-schema list of (name, default, nested schema, is_list), built once"""
+    plan = []
+    for name, field in schema.model_fields.items():
+        default = None if field.is_required() else field.get_default(call_default_factory=True)
+        nested, is_list = _nested_model(field.annotation)
+        plan.append((name, default, nested, is_list))
+    return tuple(plan)
+
+
+def row_to_dict(row: Any, schema: Type[BaseModel]) -> Optional[dict]:
+    """Read a schema's fields off an ORM row without running validation"""
+    if row is None:
+        return None
+
+    data = {}
+    for name, default, nested, is_list in _field_plan(schema):
+        value = getattr(row, name, default)
+        if nested is not None and value is not None:
+            if is_list:
+                value = [row_to_dict(item, nested) for item in value]
+            else:
+                value = row_to_dict(value, nested)
+        data[name] = value
+    return data
+
+
+def trusted_rows_response(
+    rows: Iterable[Any],
+    schema: Type[BaseModel],
+    response: Optional[Response] = None
+) -> Response:
+    """
+    Serialize ORM rows straight to JSON, skipping per-row response_model validation
+
+    Only for rows loaded from our own tables whose columns already match the
+    schema types (no validators or computed fields). Headers set on the
+    injected `response` (e.g. X-Next-Cursor) are carried over.
+
+    Example:
+        @router.get("/color-master", response_model=List[ColorMasterResponse])
+        def get_color_masters(response: Response, db: Session = Depends(get_db_settings)):
+            rows = db.query(ColorMaster).all()
+            return trusted_rows_response(rows, ColorMasterResponse, response)
+    """
+    return raw_json_response(dumps([row_to_dict(row, schema) for row in rows]), response)
+
+
+def raw_json_response(content: bytes, response: Optional[Response] = None) -> Response:
+    """Wrap already-serialized JSON bytes, keeping headers from the injected response"""
+    headers = None
+    if response is not None:
+        headers = {k: v for k, v in response.headers.items() if k.lower() != "content-length"}
+    return Response(content=content, media_type="application/json", headers=headers)
@@ -1,9 +1,12 @@
 from .buyer_service import buyer_service, BuyerService
 from .style_service import style_service, StyleService
+from .id_allocator import id_allocator, IdAllocator
 
 __all__ = [
     "buyer_service",
     "BuyerService",
     "style_service",
     "StyleService",
+    "id_allocator",
+    "IdAllocator",
 ]
@@ -0,0 +1,185 @@
+"""
+Central Document / Sample ID Allocator
+Numbers are handed out by atomic single-statement updates in the settings
+database (UPDATE ... RETURNING / INSERT ... ON CONFLICT DO UPDATE), so
+concurrent creates never read the same value and never scan the documents
+they number.
+
+- Configured document types use document_numbering.current_number
+- Scoped series (per day, per buyer/product type, per branch) use
+  document_number_counters rows, created on first use and seeded from the
+  existing documents once
+- Optional block pre-allocation: a worker reserves `block_size` numbers per
+  update and hands them out locally (unused numbers are lost on restart)
+"""
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.database import SessionLocalSettings
+
+
+class IdAllocator:
+    """Allocates increasing numbers for document types and scoped series"""
+
+    def __init__(self):
+        # (document_type, scope_key) -> (next number to hand out, last reserved number)
+        self._blocks: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+
+    def get_session(self) -> Session:
+        """Get a new session for settings database"""
+        return SessionLocalSettings()
+
+    def reserve(
+        self,
+        document_type: str,
+        scope_key: str = "",
+        count: int = 1,
+        seed: Optional[Callable[[], int]] = None
+    ) -> int:
+        """
+        Reserve `count` consecutive numbers of a scoped series; returns the last one
+
+        `seed` returns the highest number already used by existing documents and
+        is only called when the series has no counter row yet.
+        """
+        db = self.get_session()
+        try:
+            params = {"document_type": document_type, "scope_key": scope_key, "count": count}
+            last = db.execute(text("""
+                UPDATE document_number_counters
+                SET current_number = current_number + :count, updated_at = now()
+                WHERE document_type = :document_type AND scope_key = :scope_key
+                RETURNING current_number
+            """), params).scalar()
+
+            if last is None:
+                # First use of this series; a concurrent first use lands on the conflict branch
+                last = db.execute(text("""
+                    INSERT INTO document_number_counters (document_type, scope_key, current_number, created_at)
+                    VALUES (:document_type, :scope_key, :seed + :count, now())
+                    ON CONFLICT (document_type, scope_key)
+                    DO UPDATE SET current_number = document_number_counters.current_number + :count,
+                                  updated_at = now()
+                    RETURNING current_number
+                """), {**params, "seed": (seed() if seed else 0) or 0}).scalar()
+
+            db.commit()
+            return last
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def next_number(
+        self,
+        document_type: str,
+        scope_key: str = "",
+        seed: Optional[Callable[[], int]] = None,
+        block_size: Optional[int] = None
+    ) -> int:
+        """
+        Next number of a scoped series
+
+        Example:
+            number = id_allocator.next_number("SAMPLE_REQUEST", "20250114", seed=lambda: last_sample_number(db))
+            sample_id = f"SMP-20250114-{number:04d}"
+        """
+        block_size = max(block_size or settings.ID_ALLOCATOR_BLOCK_SIZE, 1)
+        if block_size == 1:
+            return self.reserve(document_type, scope_key, 1, seed)
+
+        key = (document_type, scope_key)
+        with self._lock:
+            block = self._blocks.pop(key, None)
+            if block is None:
+                last = self.reserve(document_type, scope_key, block_size, seed)
+                block = (last - block_size + 1, last)
+            number, last = block
+            if number < last:
+                self._blocks[key] = (number + 1, last)
+            return number
+
+    def next_document_number(self, document_type: str, branch_id: Optional[int] = None) -> dict:
+        """
+        Allocate the next number of a configured document type (document_numbering)
+
+        Branch-wise types keep a separate series per branch. Raises LookupError
+        if the type is not configured or inactive.
+        """
+        config = self.get_config(document_type, branch_id)
+        if config is None:
+            raise LookupError(f"Document numbering not found for type: {document_type}")
+
+        if branch_id and config["branch_wise"]:
+            number = self.reserve(document_type, f"branch:{branch_id}")
+        else:
+            db = self.get_session()
+            try:
+                number = db.execute(text("""
+                    UPDATE document_numbering
+                    SET current_number = COALESCE(current_number, 0) + 1, updated_at = now()
+                    WHERE id = :id
+                    RETURNING current_number
+                """), {"id": config["id"]}).scalar()
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+
+        return self.format_document_number(config, number)
+
+    def peek_document_number(self, document_type: str, branch_id: Optional[int] = None) -> dict:
+        """The number next_document_number would return now (nothing is reserved)"""
+        config = self.get_config(document_type, branch_id)
+        if config is None:
+            raise LookupError(f"Document numbering not found for type: {document_type}")
+
+        current = config["current_number"] or 0
+        if branch_id and config["branch_wise"]:
+            db = self.get_session()
+            try:
+                current = db.execute(text("""
+                    SELECT current_number FROM document_number_counters
+                    WHERE document_type = :document_type AND scope_key = :scope_key
+                """), {"document_type": document_type, "scope_key": f"branch:{branch_id}"}).scalar() or 0
+            finally:
+                db.close()
+
+        return self.format_document_number(config, current + 1)
+
+    def get_config(self, document_type: str, branch_id: Optional[int] = None) -> Optional[dict]:
+        """Active document_numbering row for a type (branch-wise rows only when branch_id is given)"""
+        db = self.get_session()
+        try:
+            row = db.execute(text(f"""
+                SELECT id, prefix, suffix, current_number, number_length, branch_wise, sample_format
+                FROM document_numbering
+                WHERE document_type = :document_type AND is_active = TRUE
+                {"AND branch_wise = TRUE" if branch_id else ""}
+                LIMIT 1
+            """), {"document_type": document_type}).mappings().first()
+            return dict(row, document_type=document_type) if row else None
+        finally:
+            db.close()
+
+    @staticmethod
+    def format_document_number(config: dict, number: int) -> dict:
+        """{document_type, next_number, formatted_number, sample_format} for a number"""
+        formatted = f"{config['prefix'] or ''}{str(number).zfill(config['number_length'] or 5)}{config['suffix'] or ''}"
+        return {
+            "document_type": config["document_type"],
+            "next_number": number,
+            "formatted_number": formatted,
+            "sample_format": config["sample_format"],
+        }
+
+
+id_allocator = IdAllocator()
@@ -2,156 +2,183 @@
 Shared synchronization service for syncing data between modules
 Eliminates code duplication between merchandiser and samples modules
 """
+import json
+import time
+from datetime import datetime
 from typing import Dict, Any, Optional, List
+from sqlalchemy import func
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from core.logging import setup_logging
 from core.database import SessionLocalMerchandiser, SessionLocalSamples
 from core.services.buyer_service import BuyerService
+from core.jobs import update_job
+from core.outbox import OutboxRelay
 
 logger = setup_logging()
 
+# Rows per bulk INSERT when copying SamplePrimaryInfo to SampleRequest
+SYNC_CHUNK_SIZE = 500
+
+# Outbox event types
+SAMPLE_REQUEST_UPDATED = "sample_request.updated"    # samples -> merchandiser
+SAMPLE_PRIMARY_UPDATED = "sample_primary.updated"    # merchandiser -> samples
+SAMPLE_STATUS_SYNCED = "sample_status.synced"        # either direction
+
+# Payload keys holding datetimes (stored as ISO strings in the outbox)
+DATETIME_FIELDS = {'yarn_handover_date', 'trims_handover_date', 'required_date', 'expecting_end_date'}
+
+
+def _restore_datetimes(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn ISO strings of known datetime fields back into datetimes"""
+    return {
+        key: datetime.fromisoformat(value) if key in DATETIME_FIELDS and isinstance(value, str) else value
+        for key, value in data.items()
+    }
+
 
 class SyncService:
     """Service for syncing data between SampleRequest and SamplePrimaryInfo"""
     
+    # ------------------------------------------------------------------
+    # Outbox replication (see core/outbox.py). Handlers only assign values,
+    # so re-applying an event is harmless.
+    # ------------------------------------------------------------------
+
     @staticmethod
-    def sync_sample_request_to_primary_info(
-        sample_request_id: int,
-        update_data: Dict[str, Any],
-        samples_db: Session
-    ) -> bool:
+    def outbox_relays() -> List[OutboxRelay]:
+        """Relays for both directions: samples -> merchandiser and merchandiser -> samples"""
+        from modules.samples.models.sample import SyncOutbox as SamplesSyncOutbox
+        from modules.merchandiser.models.merchandiser import SyncOutbox as MerchandiserSyncOutbox
+
+        return [
+            OutboxRelay(
+                name="samples_to_merchandiser",
+                outbox_model=SamplesSyncOutbox,
+                source_session=SessionLocalSamples,
+                target_session=SessionLocalMerchandiser,
+                handlers={
+                    SAMPLE_REQUEST_UPDATED: SyncService.apply_sample_request_update,
+                    SAMPLE_STATUS_SYNCED: SyncService.apply_status_to_merchandiser,
+                },
+                prepare=SyncService._prefetch_buyer_names
+            ),
+            OutboxRelay(
+                name="merchandiser_to_samples",
+                outbox_model=MerchandiserSyncOutbox,
+                source_session=SessionLocalMerchandiser,
+                target_session=SessionLocalSamples,
+                handlers={
+                    SAMPLE_PRIMARY_UPDATED: SyncService.apply_primary_info_update,
+                    SAMPLE_STATUS_SYNCED: SyncService.apply_status_to_samples,
+                },
+                prepare=SyncService._prefetch_buyer_names
+            ),
+        ]
+
+    @staticmethod
+    def _prefetch_buyer_names(events: List[Any]) -> Dict[str, Any]:
+        """One clients-DB lookup for every buyer_id changed in a batch"""
+        buyer_ids = {event.payload.get('buyer_id') for event in events if event.payload.get('buyer_id')}
+        buyers = BuyerService().get_by_ids(list(buyer_ids)) if buyer_ids else {}
+        return {"buyer_names": {buyer_id: buyer.get("buyer_name") for buyer_id, buyer in buyers.items()}}
+
+    @staticmethod
+    def apply_sample_request_update(merchandiser_db: Session, payload: Dict[str, Any], sample_id: str, context: Dict[str, Any]) -> None:
+        """Apply a SampleRequest update to SamplePrimaryInfo"""
+        from modules.merchandiser.models.merchandiser import SamplePrimaryInfo
+
+        sample_primary = merchandiser_db.query(SamplePrimaryInfo).filter(
+            SamplePrimaryInfo.sample_id == sample_id
+        ).first()
+        if not sample_primary:
+            logger.info(f"No matching SamplePrimaryInfo found for sample_id {sample_id}")
+            return
+
+        update_data = _restore_datetimes(payload)
+        if 'buyer_id' in update_data:
+            buyer_name = context["buyer_names"].get(update_data['buyer_id'])
+            if buyer_name:
+                sample_primary.buyer_name = buyer_name
+            sample_primary.buyer_id = update_data['buyer_id']
+
+        SyncService._sync_fields_to_primary_info(sample_primary, update_data, None)
+
+    @staticmethod
+    def apply_primary_info_update(samples_db: Session, payload: Dict[str, Any], sample_id: str, context: Dict[str, Any]) -> None:
+        """Apply a SamplePrimaryInfo update to SampleRequest"""
+        from modules.samples.models.sample import SampleRequest
+
+        sample_request = samples_db.query(SampleRequest).filter(
+            SampleRequest.sample_id == sample_id
+        ).first()
+        if not sample_request:
+            logger.info(f"No matching SampleRequest found for sample_id {sample_id}")
+            return
+
+        update_data = _restore_datetimes(payload)
+        if 'buyer_id' in update_data:
+            buyer_name = context["buyer_names"].get(update_data['buyer_id'])
+            if buyer_name:
+                sample_request.buyer_name = buyer_name
+            sample_request.buyer_id = update_data['buyer_id']
+
+        SyncService._sync_fields_to_sample_request(sample_request, update_data, None)
+
+    @staticmethod
+    def apply_status_to_merchandiser(merchandiser_db: Session, payload: Dict[str, Any], sample_id: str, context: Dict[str, Any]) -> None:
         """
-        Sync SampleRequest updates to SamplePrimaryInfo in merchandiser database
-        
-        Args:
-            sample_request_id: ID of the SampleRequest
-            update_data: Dictionary of fields to update
-            samples_db: Samples database session
-            
-        Returns:
-            True if sync successful, False otherwise
+        Mirror a samples-DB status change onto the latest merchandiser SampleStatus
+
+        payload: {"fields": values to set on the latest row,
+                  "create": values for a new row if the sample has none}
         """
-        try:
-            from modules.samples.models.sample import SampleRequest
-            from modules.merchandiser.models.merchandiser import SamplePrimaryInfo
-            
-            # Get the sample request
-            request = samples_db.query(SampleRequest).filter(
-                SampleRequest.id == sample_request_id
-            ).first()
-            
-            if not request:
-                logger.warning(f"SampleRequest {sample_request_id} not found for sync")
-                return False
-            
-            # Open merchandiser database session
-            merchandiser_db = SessionLocalMerchandiser()
-            try:
-                sample_primary = merchandiser_db.query(SamplePrimaryInfo).filter(
-                    SamplePrimaryInfo.sample_id == request.sample_id
-                ).first()
-                
-                if not sample_primary:
-                    logger.info(f"No matching SamplePrimaryInfo found for sample_id {request.sample_id}")
-                    return False
-                
-                # Sync buyer information
-                if 'buyer_id' in update_data:
-                    buyer_service = BuyerService()
-                    buyer_name = None
-                    try:
-                        buyer_info = buyer_service.get_by_id(update_data['buyer_id'])
-                        if buyer_info:
-                            buyer_name = buyer_info.get("buyer_name")
-                    except (KeyError, ValueError, AttributeError) as buyer_error:
-                        logger.warning(f"Could not fetch buyer name for buyer_id {update_data['buyer_id']}: {buyer_error}")
-                    
-                    if buyer_name:
-                        sample_primary.buyer_name = buyer_name
-                    sample_primary.buyer_id = update_data['buyer_id']
-                
-                # Sync all other fields
-                SyncService._sync_fields_to_primary_info(sample_primary, update_data, request)
-                
-                merchandiser_db.commit()
-                logger.info(f"✅ Successfully synced SampleRequest {sample_request_id} to SamplePrimaryInfo")
-                return True
-                
-            except Exception as commit_error:
-                merchandiser_db.rollback()
-                logger.error(f"Failed to commit sync to merchandiser: {commit_error}", exc_info=True)
-                return False
-            finally:
-                merchandiser_db.close()
-                
-        except Exception as sync_error:
-            logger.error(f"Error syncing SampleRequest to SamplePrimaryInfo: {sync_error}", exc_info=True)
-            return False
-    
+        from modules.merchandiser.models.merchandiser import SampleStatus
+
+        existing_status = merchandiser_db.query(SampleStatus).filter(
+            SampleStatus.sample_id == sample_id
+        ).order_by(SampleStatus.created_at.desc(), SampleStatus.id.desc()).first()
+
+        if existing_status:
+            for key, value in _restore_datetimes(payload.get("fields", {})).items():
+                setattr(existing_status, key, value)
+        else:
+            merchandiser_db.add(SampleStatus(sample_id=sample_id, **_restore_datetimes(payload.get("create", {}))))
+
     @staticmethod
-    def sync_primary_info_to_sample_request(
-        sample_primary_id: int,
-        update_data: Dict[str, Any],
-        merchandiser_db: Session
-    ) -> bool:
+    def apply_status_to_samples(samples_db: Session, payload: Dict[str, Any], sample_id: str, context: Dict[str, Any]) -> None:
         """
-        Sync SamplePrimaryInfo updates to SampleRequest in samples database
-        
-        Args:
-            sample_primary_id: ID of the SamplePrimaryInfo
-            update_data: Dictionary of fields to update
-            merchandiser_db: Merchandiser database session
-            
-        Returns:
-            True if sync successful, False otherwise
+        Mirror a merchandiser status change onto the latest samples-DB SampleStatus
+
+        payload: {"fields": ..., "create": ..., "current_status": new SampleRequest.current_status or None}
         """
-        try:
-            from modules.merchandiser.models.merchandiser import SamplePrimaryInfo
-            from modules.samples.models.sample import SampleRequest
-            
-            # Get the sample primary info
-            sample_primary = merchandiser_db.query(SamplePrimaryInfo).filter(
-                SamplePrimaryInfo.id == sample_primary_id
-            ).first()
-            
-            if not sample_primary:
-                logger.warning(f"SamplePrimaryInfo {sample_primary_id} not found for sync")
-                return False
-            
-            # Open samples database session
-            samples_db = SessionLocalSamples()
-            try:
-                sample_request = samples_db.query(SampleRequest).filter(
-                    SampleRequest.sample_id == sample_primary.sample_id
-                ).first()
-                
-                if not sample_request:
-                    logger.info(f"No matching SampleRequest found for sample_id {sample_primary.sample_id}")
-                    return False
-                
-                # Sync all fields
-                SyncService._sync_fields_to_sample_request(sample_request, update_data, sample_primary)
-                
-                samples_db.commit()
-                logger.info(f"✅ Successfully synced SamplePrimaryInfo {sample_primary_id} to SampleRequest")
-                return True
-                
-            except Exception as commit_error:
-                samples_db.rollback()
-                logger.error(f"Failed to commit sync to samples: {commit_error}", exc_info=True)
-                return False
-            finally:
-                samples_db.close()
-                
-        except Exception as sync_error:
-            logger.error(f"Error syncing SamplePrimaryInfo to SampleRequest: {sync_error}", exc_info=True)
-            return False
-    
+        from modules.samples.models.sample import SampleRequest, SampleStatus
+
+        sample_request = samples_db.query(SampleRequest).filter(
+            SampleRequest.sample_id == sample_id
+        ).first()
+        if not sample_request:
+            logger.warning(f"SampleRequest not found for sample_id {sample_id} in samples database - sync skipped")
+            return
+
+        existing_status = samples_db.query(SampleStatus).filter(
+            SampleStatus.sample_request_id == sample_request.id
+        ).order_by(SampleStatus.created_at.desc(), SampleStatus.id.desc()).first()
+
+        if existing_status:
+            for key, value in _restore_datetimes(payload.get("fields", {})).items():
+                setattr(existing_status, key, value)
+        else:
+            samples_db.add(SampleStatus(sample_request_id=sample_request.id, **_restore_datetimes(payload.get("create", {}))))
+
+        if payload.get("current_status"):
+            sample_request.current_status = payload["current_status"]
+
     @staticmethod
     def _sync_fields_to_primary_info(
         sample_primary: Any,
         update_data: Dict[str, Any],
-        request: Any
+        request: Optional[Any]
     ) -> None:
         """Helper to sync fields from SampleRequest to SamplePrimaryInfo"""
         # Basic fields
@@ -234,8 +261,8 @@ class SyncService:
         
         # Techpack files (separate fields -> JSON array)
         if 'techpack_url' in update_data or 'techpack_filename' in update_data:
-            techpack_url = update_data.get('techpack_url') or request.techpack_url
-            techpack_filename = update_data.get('techpack_filename') or request.techpack_filename
+            techpack_url = update_data.get('techpack_url') or (request.techpack_url if request is not None else None)
+            techpack_filename = update_data.get('techpack_filename') or (request.techpack_filename if request is not None else None)
             if techpack_url or techpack_filename:
                 sample_primary.techpack_files = [{
                     'url': techpack_url or '',
@@ -249,7 +276,7 @@ class SyncService:
     def _sync_fields_to_sample_request(
         sample_request: Any,
         update_data: Dict[str, Any],
-        sample_primary: Any
+        sample_primary: Optional[Any]
     ) -> None:
         """Helper to sync fields from SamplePrimaryInfo to SampleRequest"""
         # Basic fields
@@ -337,3 +364,265 @@ class SyncService:
             else:
                 sample_request.techpack_url = None
                 sample_request.techpack_filename = None
+
+    @staticmethod
+    def sync_all_primary_info_to_sample_requests(job: dict, chunk_size: int = SYNC_CHUNK_SIZE) -> Dict[str, Any]:
+        """
+        Copy every SamplePrimaryInfo without a SampleRequest into the samples database
+
+        Runs as a background job (see core.jobs.run_job). Existing sample_ids are
+        prefetched with one IN query, buyer names resolved with one batch lookup,
+        and new rows bulk-inserted in chunks with progress recorded on the job.
+        """
+        from modules.merchandiser.models.merchandiser import SamplePrimaryInfo
+        from modules.samples.models.sample import SampleRequest
+
+        merchandiser_db = SessionLocalMerchandiser()
+        samples_db = SessionLocalSamples()
+        try:
+            all_samples = merchandiser_db.query(SamplePrimaryInfo).all()
+            update_job(job, total=len(all_samples))
+
+            sample_ids = [sample.sample_id for sample in all_samples]
+            existing_ids = {
+                sample_id for (sample_id,) in samples_db.query(SampleRequest.sample_id).filter(
+                    SampleRequest.sample_id.in_(sample_ids)
+                )
+            } if sample_ids else set()
+
+            pending = [sample for sample in all_samples if sample.sample_id not in existing_ids]
+            skipped_count = len(all_samples) - len(pending)
+
+            buyers = BuyerService().get_by_ids(list({sample.buyer_id for sample in pending if sample.buyer_id}))
+
+            synced_count = 0
+            for start in range(0, len(pending), chunk_size):
+                chunk = pending[start:start + chunk_size]
+                rows = [
+                    SyncService._sample_request_values(
+                        sample, (buyers.get(sample.buyer_id) or {}).get("buyer_name")
+                    )
+                    for sample in chunk
+                ]
+                # Rows created concurrently (e.g. by the write path) are skipped, not duplicated
+                inserted = samples_db.execute(
+                    pg_insert(SampleRequest)
+                    .on_conflict_do_nothing(index_elements=[SampleRequest.sample_id])
+                    .returning(SampleRequest.id),
+                    rows
+                ).all()
+                samples_db.commit()
+
+                synced_count += len(inserted)
+                skipped_count += len(chunk) - len(inserted)
+                update_job(job, processed=skipped_count + synced_count)
+
+            update_job(job, processed=len(all_samples))
+            logger.info(f"✅ Sync to samples: {synced_count} synced, {skipped_count} already existed")
+            return {
+                "synced": synced_count,
+                "skipped": skipped_count,
+                "message": f"Sync completed: {synced_count} samples synced, {skipped_count} already existed"
+            }
+        except Exception:
+            samples_db.rollback()
+            raise
+        finally:
+            samples_db.close()
+            merchandiser_db.close()
+
+    @staticmethod
+    def sync_sample_statuses_from_samples(merchandiser_db: Session) -> Dict[str, Any]:
+        """
+        Make each sample's latest merchandiser SampleStatus match its latest samples-DB status
+
+        Set-based: one join for the latest samples status per sample_id, one
+        DISTINCT ON query for the latest merchandiser status per sample_id, a diff
+        in memory and a single INSERT ... ON CONFLICT (id) DO UPDATE transaction.
+        status_from_merchandiser is only copied for new rows (merchandiser owns it).
+        """
+        from modules.samples.models.sample import SampleStatus as SamplesSampleStatus, SampleRequest
+        from modules.merchandiser.models.merchandiser import SampleStatus
+
+        started = time.perf_counter()
+
+        samples_db = SessionLocalSamples()
+        try:
+            latest_samples = samples_db.query(
+                SampleRequest.sample_id,
+                SamplesSampleStatus.status_by_sample,
+                SamplesSampleStatus.status_from_merchandiser,
+                SamplesSampleStatus.notes,
+                SamplesSampleStatus.updated_by,
+            ).join(
+                SampleRequest, SampleRequest.id == SamplesSampleStatus.sample_request_id
+            ).distinct(SampleRequest.sample_id).order_by(
+                SampleRequest.sample_id,
+                SamplesSampleStatus.created_at.desc(),
+                SamplesSampleStatus.id.desc()
+            ).all()
+        finally:
+            samples_db.close()
+
+        sample_ids = [row.sample_id for row in latest_samples]
+        latest_merchandiser = {
+            row.sample_id: row
+            for row in merchandiser_db.query(
+                SampleStatus.id, SampleStatus.sample_id, SampleStatus.status_by_sample,
+                SampleStatus.notes, SampleStatus.updated_by
+            ).filter(SampleStatus.sample_id.in_(sample_ids)).distinct(SampleStatus.sample_id).order_by(
+                SampleStatus.sample_id, SampleStatus.created_at.desc(), SampleStatus.id.desc()
+            )
+        } if sample_ids else {}
+
+        new_rows, changed_rows = [], []
+        for source in latest_samples:
+            existing = latest_merchandiser.get(source.sample_id)
+            if existing is None:
+                new_rows.append({
+                    "sample_id": source.sample_id,
+                    "status_by_sample": source.status_by_sample,
+                    "status_from_merchandiser": source.status_from_merchandiser,
+                    "notes": source.notes,
+                    "updated_by": source.updated_by,
+                })
+                continue
+
+            # updated_by only follows samples when the sample team set the status
+            updated_by = existing.updated_by
+            if source.updated_by and source.status_by_sample:
+                updated_by = source.updated_by
+
+            if (existing.status_by_sample, existing.notes, existing.updated_by) != (source.status_by_sample, source.notes, updated_by):
+                changed_rows.append({
+                    "id": existing.id,
+                    "sample_id": source.sample_id,
+                    "status_by_sample": source.status_by_sample,
+                    "notes": source.notes,
+                    "updated_by": updated_by,
+                })
+
+        if new_rows or changed_rows:
+            stmt = pg_insert(SampleStatus)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[SampleStatus.id],
+                set_={
+                    "status_by_sample": stmt.excluded.status_by_sample,
+                    "notes": stmt.excluded.notes,
+                    "updated_by": stmt.excluded.updated_by,
+                    "updated_at": func.now(),
+                }
+            )
+            try:
+                # New rows (no id) and changed rows (with id) are batched separately, one transaction
+                merchandiser_db.execute(stmt, new_rows + changed_rows)
+                merchandiser_db.commit()
+            except Exception:
+                merchandiser_db.rollback()
+                raise
+
+        created_count = len(new_rows)
+        updated_count = len(changed_rows)
+        skipped_count = len(latest_samples) - created_count - updated_count
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        logger.info(f"✅ Status sync from samples: {created_count} created, {updated_count} updated, {skipped_count} unchanged in {elapsed_ms} ms")
+
+        return {
+            "message": f"Sync completed: {created_count} created, {updated_count} updated, {skipped_count} skipped",
+            "synced": created_count,
+            "updated": updated_count,
+            "skipped": skipped_count,
+            "elapsed_ms": elapsed_ms
+        }
+
+    @staticmethod
+    def _sample_request_values(sample, buyer_name: Optional[str]) -> Dict[str, Any]:
+        """Map a SamplePrimaryInfo row to SampleRequest column values"""
+        def json_list(value):
+            if isinstance(value, str):
+                try:
+                    return json.loads(value)
+                except (json.JSONDecodeError, TypeError):
+                    return []
+            return value
+
+        # JSON arrays stay arrays (SampleRequest model supports JSON)
+        yarn_ids_json = json_list(sample.yarn_ids)
+        trims_ids_json = json_list(sample.trims_ids)
+        color_ids_json = json_list(sample.color_ids)
+        size_ids_json = json_list(sample.size_ids)
+        # Also set yarn_id (first one) for backward compatibility
+        yarn_id = yarn_ids_json[0] if yarn_ids_json and len(yarn_ids_json) > 0 else (sample.yarn_id or None)
+
+        # Map ply (convert string to int if possible)
+        ply_value = None
+        if sample.ply:
+            try:
+                ply_value = int(sample.ply)
+            except (ValueError, TypeError):
+                pass
+
+        # decorative_part: JSON array (or comma-separated string) -> comma-separated string
+        decorative_part_json = sample.decorative_part
+        if isinstance(decorative_part_json, str):
+            try:
+                decorative_part_json = json.loads(decorative_part_json)
+            except (json.JSONDecodeError, TypeError):
+                decorative_part_json = [s.strip() for s in decorative_part_json.split(',')] if decorative_part_json else []
+        decorative_part_str = ", ".join(decorative_part_json) if decorative_part_json and isinstance(decorative_part_json, list) else (str(decorative_part_json) if decorative_part_json else None)
+
+        # additional_instruction: JSON array of objects -> newline-separated string
+        additional_instruction_str = None
+        if sample.additional_instruction:
+            if isinstance(sample.additional_instruction, list):
+                instructions = []
+                for inst in sample.additional_instruction:
+                    if isinstance(inst, dict):
+                        instruction_text = inst.get('instruction', '')
+                        done_marker = "✓" if inst.get('done', False) else ""
+                        instructions.append(f"{done_marker} {instruction_text}".strip())
+                    else:
+                        instructions.append(str(inst))
+                additional_instruction_str = "\n".join(instructions) if instructions else None
+            else:
+                additional_instruction_str = str(sample.additional_instruction)
+
+        # techpack_files: JSON array -> use first file's url/filename
+        techpack_url = None
+        techpack_filename = None
+        if isinstance(sample.techpack_files, list) and len(sample.techpack_files) > 0:
+            first_file = sample.techpack_files[0]
+            if isinstance(first_file, dict):
+                techpack_url = first_file.get('url')
+                techpack_filename = first_file.get('filename')
+
+        return {
+            "sample_id": sample.sample_id,
+            "buyer_id": sample.buyer_id,
+            "buyer_name": buyer_name or sample.buyer_name,
+            "sample_name": sample.sample_name,
+            "item": sample.item,
+            "gauge": sample.gauge,
+            "ply": ply_value,
+            "sample_category": sample.sample_category,
+            "color_ids": color_ids_json,
+            "color_name": sample.color_name,
+            "size_ids": size_ids_json,
+            "size_name": sample.size_name,
+            "yarn_ids": yarn_ids_json,
+            "yarn_id": yarn_id,
+            "yarn_details": sample.yarn_details,
+            "trims_ids": trims_ids_json,
+            "trims_details": sample.trims_details,
+            "decorative_part": decorative_part_str,
+            "decorative_details": None,
+            "yarn_handover_date": sample.yarn_handover_date,
+            "trims_handover_date": sample.trims_handover_date,
+            "required_date": sample.required_date,
+            "request_pcs": sample.request_pcs,
+            "additional_instruction": additional_instruction_str,
+            "techpack_url": techpack_url,
+            "techpack_filename": techpack_filename,
+            "round": 1,
+            "current_status": "Pending",
+        }
@@ -0,0 +1,87 @@
+"""
+Dedicated Thread Pools for Blocking Database Work
+Runs synchronous SQLAlchemy route handlers off the event loop on bounded,
+per-module thread pools instead of FastAPI's shared default pool
+"""
+import asyncio
+import functools
+import logging
+from typing import Callable, Dict, Type
+
+import anyio
+from fastapi.routing import APIRoute
+
+logger = logging.getLogger(__name__)
+
+# Named capacity limiters (one per module pool)
+_limiters: Dict[str, anyio.CapacityLimiter] = {}
+
+
+def get_limiter(pool_name: str, max_threads: int) -> anyio.CapacityLimiter:
+    """Get or create the capacity limiter for a named thread pool"""
+    limiter = _limiters.get(pool_name)
+    if limiter is None:
+        limiter = anyio.CapacityLimiter(max_threads)
+        _limiters[pool_name] = limiter
+        logger.info(f"Thread pool '{pool_name}' created with {max_threads} threads")
+    return limiter
+
+
+async def run_blocking(pool_name: str, max_threads: int, func: Callable, *args, **kwargs):
+    """
+    Run a blocking callable on a named, bounded thread pool
+
+    Example:
+        rows = await run_blocking("merchandiser", 20, db.query(Yarn).all)
+    """
+    limiter = get_limiter(pool_name, max_threads)
+    return await anyio.to_thread.run_sync(
+        functools.partial(func, *args, **kwargs),
+        limiter=limiter
+    )
+
+
+def _offload_endpoint(endpoint: Callable, pool_name: str, max_threads: int) -> Callable:
+    """Wrap a sync endpoint so FastAPI awaits it on the named pool"""
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        return await run_blocking(pool_name, max_threads, endpoint, *args, **kwargs)
+
+    return wrapper
+
+
+def blocking_route_class(pool_name: str, max_threads: int) -> Type[APIRoute]:
+    """
+    Build an APIRoute class that runs sync endpoints on a dedicated pool
+
+    Sync (def) handlers are dispatched to a bounded thread pool owned by the
+    module, so a slow endpoint can only exhaust its own threads. Async handlers
+    are left untouched and still run on the event loop.
+
+    Example:
+        router = APIRouter(route_class=blocking_route_class("merchandiser", 20))
+
+        @router.get("/yarn")
+        def get_all_yarn_details(db: Session = Depends(get_db_merchandiser)):
+            ...
+    """
+    class BlockingIORoute(APIRoute):
+        def __init__(self, path: str, endpoint: Callable, **kwargs):
+            if not asyncio.iscoroutinefunction(endpoint):
+                endpoint = _offload_endpoint(endpoint, pool_name, max_threads)
+            super().__init__(path, endpoint, **kwargs)
+
+    BlockingIORoute.__name__ = f"{pool_name.title()}BlockingIORoute"
+    return BlockingIORoute
+
+
+def get_threadpool_stats() -> dict:
+    """Get usage statistics for all named thread pools"""
+    return {
+        name: {
+            "total_threads": int(limiter.total_tokens),
+            "borrowed_threads": limiter.borrowed_tokens,
+            "waiting": limiter.statistics().tasks_waiting,
+        }
+        for name, limiter in _limiters.items()
+    }
@@ -0,0 +1,243 @@
+"""
+Per-User Unread Notification Counters
+Unread counts kept in Redis and maintained by the notification writers, so
+reading a user's count is a single HGETALL instead of a COUNT(*) query.
+
+Each user has a hash of unread counts per target_department (the read side
+applies the department visibility rule). A hash is seeded from the database
+on first read under WATCH, so an increment that lands while the seed is
+being computed aborts it instead of being lost or counted twice (one
+committed before the seed's query but applied after its write is still
+counted twice until the next reconcile). Hashes expire after
+UNREAD_COUNTER_TTL; a periodic reconciler rewrites existing hashes from the
+database to correct any drift. Without Redis, counts are computed from the
+database.
+
+Every counter change also bumps one global sequence in the same MULTI, and
+a snapshot reads the hash and the sequence together. A stream compares the
+sequence carried by each count event with its snapshot's, so changes the
+snapshot already includes are not applied twice.
+"""
+import logging
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+from redis.exceptions import WatchError
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from .cache import get_redis_client
+from .config import settings
+from .database import SessionLocalUsers
+from .notification_stream import notification_visible
+from modules.notifications.models.notification import Notification
+
+logger = logging.getLogger(__name__)
+
+UNREAD_COUNTER_TTL = 7 * 86400  # Idle counters are dropped and re-seeded on next read
+SEEDED_FIELD = "_seeded"  # Present once the hash holds complete counts
+NO_DEPARTMENT = "_broadcast"  # Field for notifications without a target_department (visible to all)
+RECONCILE_LOCK_KEY = "notifications_unread:reconcile_lock"
+CHANGE_SEQ_KEY = "notifications_unread_seq"  # Bumped with every counter change
+SEED_ATTEMPTS = 3
+
+_reconciler_thread: Optional[threading.Thread] = None
+_stop = threading.Event()
+
+
+def _counter_key(user_id: int) -> str:
+    return f"notifications_unread:{user_id}"
+
+
+def _field(target_department: Optional[str]) -> str:
+    return NO_DEPARTMENT if target_department is None else target_department
+
+
+def _unread_by_department(db: Session, user_id: int) -> Dict[str, int]:
+    rows = db.query(Notification.target_department, func.count(Notification.id)).filter(
+        Notification.user_id == user_id,
+        Notification.is_read == False
+    ).group_by(Notification.target_department).all()
+    return {_field(department): count for department, count in rows}
+
+
+def _visible_total(counts: Dict[str, int], department: Optional[str]) -> int:
+    return sum(
+        max(int(count), 0)
+        for field, count in counts.items()
+        if field != SEEDED_FIELD and notification_visible(field if field != NO_DEPARTMENT else None, department)
+    )
+
+
+def _write_counts(pipe, user_id: int, counts: Dict[str, int]):
+    """Replace a user's hash with complete counts (queued on a pipeline)"""
+    key = _counter_key(user_id)
+    pipe.delete(key)
+    pipe.hset(key, mapping={SEEDED_FIELD: 1, **counts})
+    pipe.expire(key, UNREAD_COUNTER_TTL)
+
+
+def get_unread_count(db: Session, user_id: int, department: Optional[str]) -> int:
+    """Unread notifications visible to the user (seeds the counter on a miss)"""
+    return unread_snapshot(db, user_id, department)[0]
+
+
+def unread_snapshot(db: Session, user_id: int, department: Optional[str]) -> Tuple[int, Optional[int]]:
+    """
+    Visible unread count and the change sequence it reflects
+
+    Count events with a sequence at or below the returned one are already
+    included. The sequence is None without Redis (apply every event).
+    """
+    client = get_redis_client()
+    if client is None:
+        return _visible_total(_unread_by_department(db, user_id), department), None
+
+    key = _counter_key(user_id)
+    try:
+        pipe = client.pipeline()
+        pipe.hgetall(key)
+        pipe.get(CHANGE_SEQ_KEY)
+        counts, seq = pipe.execute()
+        if SEEDED_FIELD in counts:
+            return _visible_total(counts, department), int(seq or 0)
+    except Exception as e:
+        logger.error(f"❌ Unread counter read error for user {user_id}: {e}")
+        return _visible_total(_unread_by_department(db, user_id), department), None
+
+    for _ in range(SEED_ATTEMPTS):
+        with client.pipeline() as pipe:
+            # Watch before reading the database: a record_unread landing before
+            # EXEC may or may not be in the rows read, so the seed is retried
+            try:
+                pipe.watch(key)
+                counts = pipe.hgetall(key)
+                seq = int(pipe.get(CHANGE_SEQ_KEY) or 0)
+            except Exception as e:
+                logger.error(f"❌ Unread counter read error for user {user_id}: {e}")
+                break
+            if SEEDED_FIELD in counts:
+                return _visible_total(counts, department), seq
+
+            counts = _unread_by_department(db, user_id)
+            try:
+                pipe.multi()
+                _write_counts(pipe, user_id, counts)
+                pipe.execute()
+                return _visible_total(counts, department), seq
+            except WatchError:
+                logger.debug(f"Unread counter seed for user {user_id} raced an update, retrying")
+            except Exception as e:
+                logger.error(f"❌ Unread counter seed error for user {user_id}: {e}")
+                return _visible_total(counts, department), None
+
+    # Left unseeded; the next read seeds it
+    return _visible_total(_unread_by_department(db, user_id), department), None
+
+
+def record_unread(notifications: Iterable[Tuple[int, Optional[str]]], delta: int = 1) -> Optional[int]:
+    """
+    Adjust counters for (user_id, target_department) pairs; call after commit
+
+    Returns the change sequence to publish with the count events (None if
+    the counters were not updated).
+    """
+    client = get_redis_client()
+    if client is None:
+        return None
+
+    try:
+        pipe = client.pipeline()
+        for user_id, target_department in notifications:
+            pipe.hincrby(_counter_key(user_id), _field(target_department), delta)
+        pipe.incr(CHANGE_SEQ_KEY)
+        return pipe.execute()[-1]
+    except Exception as e:
+        # Counters are re-seeded on expiry and corrected by the reconciler
+        logger.error(f"❌ Unread counter update error: {e}")
+        return None
+
+
+def reset_unread(user_id: int) -> Optional[int]:
+    """All of a user's notifications were marked read; returns the change sequence"""
+    client = get_redis_client()
+    if client is None:
+        return None
+
+    try:
+        pipe = client.pipeline()
+        _write_counts(pipe, user_id, {})
+        pipe.incr(CHANGE_SEQ_KEY)
+        return pipe.execute()[-1]
+    except Exception as e:
+        logger.error(f"❌ Unread counter reset error for user {user_id}: {e}")
+        return None
+
+
+def reconcile_unread_counts() -> int:
+    """Rewrite every live counter from the database; returns counters rewritten"""
+    client = get_redis_client()
+    if client is None:
+        return 0
+
+    user_ids = []
+    for key in client.scan_iter(match=_counter_key("*"), count=1000):
+        suffix = key.rsplit(":", 1)[-1]
+        if suffix.isdigit():
+            user_ids.append(int(suffix))
+    if not user_ids:
+        return 0
+
+    db = SessionLocalUsers()
+    try:
+        rows = db.query(
+            Notification.user_id, Notification.target_department, func.count(Notification.id)
+        ).filter(
+            Notification.user_id.in_(user_ids),
+            Notification.is_read == False
+        ).group_by(Notification.user_id, Notification.target_department).all()
+    finally:
+        db.close()
+
+    counts: Dict[int, Dict[str, int]] = {user_id: {} for user_id in user_ids}
+    for user_id, department, count in rows:
+        counts[user_id][_field(department)] = count
+
+    pipe = client.pipeline()
+    for user_id, user_counts in counts.items():
+        _write_counts(pipe, user_id, user_counts)
+    pipe.execute()
+    return len(counts)
+
+
+def _reconcile_forever():
+    interval = settings.UNREAD_RECONCILE_INTERVAL
+    while not _stop.wait(interval):
+        client = get_redis_client()
+        if client is None:
+            continue
+        try:
+            # One reconciler per interval across all workers
+            if not client.set(RECONCILE_LOCK_KEY, 1, nx=True, ex=max(int(interval) - 1, 1)):
+                continue
+            rewritten = reconcile_unread_counts()
+            if rewritten:
+                logger.info(f"✅ Reconciled {rewritten} unread notification counters")
+        except Exception as e:
+            logger.error(f"❌ Unread counter reconciliation failed: {e}", exc_info=True)
+
+
+def start_unread_reconciler():
+    """Start this worker's reconciliation thread (called at startup)"""
+    global _reconciler_thread
+
+    if _reconciler_thread is not None and _reconciler_thread.is_alive():
+        return
+
+    _stop.clear()
+    _reconciler_thread = threading.Thread(target=_reconcile_forever, name="unread-reconciler", daemon=True)
+    _reconciler_thread.start()
+
+
+def stop_unread_reconciler():
+    _stop.set()
@@ -7,6 +7,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from core import settings, init_db, setup_logging
+from core.serialization import FastJSONResponse
 import traceback
 import os
 
@@ -16,7 +17,8 @@ logger = setup_logging()
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=FastJSONResponse  # orjson instead of stdlib json
 )
 
 # Set up CORS - Configure based on environment
@@ -89,12 +91,31 @@ async def startup_event():
         from migrations.add_performance_indexes import add_performance_indexes
         add_performance_indexes()
         
+        from migrations.convert_department_access_to_jsonb import convert_department_access_to_jsonb
+        convert_department_access_to_jsonb()
+        
+        from migrations.add_color_search_indexes import add_color_search_indexes
+        add_color_search_indexes()
+        
         logger.info("Migrations completed successfully")
     except ImportError as e:
         logger.warning(f"Could not import migration (may be expected): {str(e)}")
     except Exception as e:
         logger.warning(f"Migration warning (may already be applied): {str(e)}")
 
+    # Replicate sample changes between samples and merchandiser databases
+    from core.outbox import start_replicator
+    from core.services.sync_service import SyncService
+    start_replicator(SyncService.outbox_relays())
+
+    # Forward published notifications to this worker's SSE streams
+    from core.notification_stream import start_notification_dispatcher
+    start_notification_dispatcher()
+
+    # Correct drift in the per-user unread notification counters
+    from core.unread_counts import start_unread_reconciler
+    start_unread_reconciler()
+
     # Initialize sample data in users database
     from core.database import SessionLocalUsers
     from init_data import init_sample_data
@@ -105,6 +126,19 @@ async def startup_event():
         db.close()
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers and release async database connections on shutdown"""
+    from core.outbox import stop_replicator
+    from core.unread_counts import stop_unread_reconciler
+    from core.security import shutdown_password_pool
+    from core.database import dispose_async_engines
+    stop_replicator()
+    stop_unread_reconciler()
+    shutdown_password_pool()
+    await dispose_async_engines()
+
+
 @app.get("/")
 async def root():
     return {
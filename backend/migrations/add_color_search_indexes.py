@@ -0,0 +1,50 @@
+"""
+Migration: Trigram indexes for colour typeahead search
+Enables pg_trgm and adds GIN trigram indexes so substring (ILIKE '%navy%')
+and fuzzy (word_similarity) matches on colour names and codes use an index
+instead of scanning the whole colour master
+"""
+from sqlalchemy import text
+from core.database import engines, DatabaseType
+import logging
+
+logger = logging.getLogger(__name__)
+
+COLOR_SEARCH_INDEXES = {
+    # samples DB: buyer-specific + general colours
+    DatabaseType.SAMPLES: [
+        ("idx_color_master_name_trgm", "color_master", "color_name"),
+        ("idx_color_master_tcx_trgm", "color_master", "tcx_code"),
+    ],
+    # settings DB: colour master with TCX/internal codes
+    DatabaseType.SETTINGS: [
+        ("idx_color_master_name_trgm", "color_master", "color_name"),
+        ("idx_color_master_code_trgm", "color_master", "color_code"),
+    ],
+}
+
+
+def add_color_search_indexes():
+    """Enable pg_trgm and create the colour search indexes in each database"""
+    for db_type, indexes in COLOR_SEARCH_INDEXES.items():
+        engine = engines[db_type]
+
+        try:
+            with engine.begin() as conn:
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        except Exception as e:
+            # Needs CREATE privilege on the database; fuzzy search is unavailable without it
+            logger.warning(f"⚠️  Could not enable pg_trgm on {db_type.value}: {e}")
+            continue
+
+        with engine.begin() as conn:
+            for index_name, table, column in indexes:
+                conn.execute(text(f"""
+                    CREATE INDEX IF NOT EXISTS {index_name}
+                    ON {table} USING gin ({column} gin_trgm_ops)
+                """))
+        logger.info(f"✅ Colour search indexes ready on {db_type.value}")
+
+
+if __name__ == "__main__":
+    add_color_search_indexes()
@@ -0,0 +1,42 @@
+"""
+Migration: Store users.department_access as JSONB with a GIN index
+Lets department notification fan-out select recipients with a single
+containment query (department_access @> '["merchandising"]')
+"""
+from sqlalchemy import text
+from core.database import engines, DatabaseType
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def convert_department_access_to_jsonb():
+    """Convert users.department_access from JSON to JSONB and index it"""
+    engine = engines[DatabaseType.USERS]
+    
+    with engine.begin() as conn:
+        column_type = conn.execute(text("""
+            SELECT data_type
+            FROM information_schema.columns
+            WHERE table_name = 'users' AND column_name = 'department_access'
+        """)).scalar()
+        
+        if column_type == "json":
+            conn.execute(text("""
+                ALTER TABLE users
+                ALTER COLUMN department_access TYPE jsonb
+                USING department_access::jsonb
+            """))
+            logger.info("✅ Converted users.department_access to JSONB")
+        else:
+            logger.info(f"ℹ️  users.department_access is already {column_type}")
+        
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_users_department_access
+            ON users USING gin (department_access jsonb_path_ops)
+        """))
+        logger.info("✅ GIN index idx_users_department_access ready")
+
+
+if __name__ == "__main__":
+    convert_department_access_to_jsonb()
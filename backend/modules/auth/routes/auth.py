@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Header
 from sqlalchemy.orm import Session
 from core.database import get_db_users
-from core import get_password_hash, verify_password, create_access_token
-from core.security import decode_token
+from core import create_access_token, settings
+from core.principal import get_principal, principal_claims
+from core.security import decode_token, get_password_hash_async, password_needs_rehash, verify_password_async
+from core.threadpool import run_blocking
 from core.logging import setup_logging
 from modules.users.models.user import User
 from modules.users.schemas.user import UserCreate, UserResponse, Token, LoginRequest
@@ -14,14 +16,19 @@ logger = setup_logging()
 router = APIRouter()
 
 
+def _run_auth_query(func, *args):
+    """Run a short users-DB call on the auth pool (keeps async auth handlers off the event loop)"""
+    return run_blocking("auth", settings.AUTH_DB_THREADS, func, *args)
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserCreate, db: Session = Depends(get_db_users)):
+async def register(user_data: UserCreate, db: Session = Depends(get_db_users)):
     """Register a new user"""
     try:
         # Check if user already exists
-        existing_user = db.query(User).filter(
+        existing_user = await _run_auth_query(db.query(User).filter(
             (User.email == user_data.email) | (User.username == user_data.username)
-        ).first()
+        ).first)
 
         if existing_user:
             raise HTTPException(
@@ -30,7 +37,7 @@ def register(user_data: UserCreate, db: Session = Depends(get_db_users)):
             )
 
         # Create new user
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash_async(user_data.password)
         new_user = User(
             email=user_data.email,
             username=user_data.username,
@@ -42,15 +49,15 @@ def register(user_data: UserCreate, db: Session = Depends(get_db_users)):
         )
 
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        await _run_auth_query(db.commit)
+        await _run_auth_query(db.refresh, new_user)
 
         return new_user
     except HTTPException:
         # Re-raise HTTP exceptions
         raise
     except Exception as e:
-        db.rollback()
+        await _run_auth_query(db.rollback)
         logger.error(f"Registration error: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -59,11 +66,11 @@ def register(user_data: UserCreate, db: Session = Depends(get_db_users)):
 
 
 @router.post("/login", response_model=Token)
-def login(login_data: LoginRequest, db: Session = Depends(get_db_users)):
-    """Login and get access token"""
-    user = db.query(User).filter(User.username == login_data.username).first()
+async def login(login_data: LoginRequest, db: Session = Depends(get_db_users)):
+    """Login and get access token (bcrypt runs on the password hashing pool)"""
+    user = await _run_auth_query(db.query(User).filter(User.username == login_data.username).first)
 
-    if not user or not verify_password(login_data.password, user.hashed_password):
+    if not user or not await verify_password_async(login_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -76,17 +83,26 @@ def login(login_data: LoginRequest, db: Session = Depends(get_db_users)):
             detail="Inactive user"
         )
 
-    access_token = create_access_token(
-        data={"sub": user.username, "user_id": user.id}
-    )
+    if settings.PASSWORD_REHASH_ON_LOGIN and password_needs_rehash(user.hashed_password):
+        # Upgrade to the current cost while the plain password is at hand
+        try:
+            user.hashed_password = await get_password_hash_async(login_data.password)
+            await _run_auth_query(db.commit)
+            logger.info(f"Upgraded password hash cost for user {user.username}")
+        except HTTPException:
+            await _run_auth_query(db.rollback)  # Hashing pool saturated: keep the old hash, still log in
+        except Exception as e:
+            await _run_auth_query(db.rollback)
+            logger.error(f"Password rehash failed for user {user.username}: {e}")
+
+    access_token = create_access_token(data=principal_claims(user))
 
     return {"access_token": access_token, "token_type": "bearer"}
 
 
 @router.get("/me", response_model=UserResponse)
 def get_current_user(
-    authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db_users)
+    authorization: Optional[str] = Header(None)
 ):
     """Get current user info from JWT token"""
     # Get token from Authorization header
@@ -112,7 +128,7 @@ def get_current_user(
             detail="Invalid token"
         )
     
-    user = db.query(User).filter(User.username == username).first()
+    user = get_principal(payload, allow_trusted_claims=False)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session, joinedload
-from typing import List
+from typing import List, Optional
 from core.database import get_db_clients
 from core.logging import setup_logging
+from core.config import settings
+from core.pagination import keyset_paginate, NEXT_CURSOR_HEADER
+from core.cache import cache_response, invalidate_cache, CacheTTL
+from core.serialization import dumps, raw_json_response
 from modules.clients.models.client import Buyer, BuyerType, ContactPerson, ShippingInfo, BankingInfo
 from modules.clients.schemas.buyer import (
     BuyerTypeCreate, BuyerTypeResponse, BuyerTypeUpdate,
@@ -79,6 +83,7 @@ def update_buyer_type(buyer_type_id: int, buyer_type_data: BuyerTypeUpdate, db:
             setattr(buyer_type, key, value)
 
         db.commit()
+        invalidate_cache("buyers:*")
         db.refresh(buyer_type)
         return buyer_type
     except HTTPException:
@@ -107,6 +112,7 @@ def delete_buyer_type(buyer_type_id: int, db: Session = Depends(get_db_clients))
 
         db.delete(buyer_type)
         db.commit()
+        invalidate_cache("buyers:*")
         return None
     except HTTPException:
         raise
@@ -193,6 +199,7 @@ def create_buyer(buyer_data: BuyerCreate, db: Session = Depends(get_db_clients))
         new_buyer = Buyer(**buyer_data.model_dump())
         db.add(new_buyer)
         db.commit()
+        invalidate_cache("buyers:*")
         db.refresh(new_buyer)
         return new_buyer
     except Exception as e:
@@ -201,15 +208,35 @@ def create_buyer(buyer_data: BuyerCreate, db: Session = Depends(get_db_clients))
         raise HTTPException(status_code=500, detail="Failed to create buyer")
 
 
+@cache_response(key_prefix="buyers", ttl=CacheTTL.LOOKUP_DATA)
+def _get_buyers_page(db: Session, cursor: Optional[str], skip: int, limit: int) -> dict:
+    """Serialized buyer page plus next cursor (cached so the header survives cache hits)"""
+    page_response = Response()
+    query = db.query(Buyer).options(joinedload(Buyer.buyer_type))
+    buyers = keyset_paginate(
+        query, (Buyer.id,), page_response, cursor, limit, skip,
+        max_limit=settings.PAGINATION_BULK_MAX_LIMIT
+    )
+    return {
+        "items": [BuyerResponse.model_validate(buyer).model_dump(mode="json") for buyer in buyers],
+        "next_cursor": page_response.headers.get(NEXT_CURSOR_HEADER),
+    }
+
+
 @router.get("/", response_model=List[BuyerResponse])
 def get_buyers(
-    skip: int = Query(default=0, ge=0, description="Number of records to skip"),
+    response: Response,
+    cursor: Optional[str] = Query(default=None, description="Opaque cursor from X-Next-Cursor"),
+    skip: int = Query(default=0, ge=0, description="Number of records to skip (ignored with cursor)"),
     limit: int = Query(default=10000, ge=1, le=10000, description="Max records per request"),
     db: Session = Depends(get_db_clients)
 ):
-    """Get all buyers"""
-    buyers = db.query(Buyer).options(joinedload(Buyer.buyer_type)).order_by(Buyer.id.desc()).offset(skip).limit(limit).all()
-    return buyers
+    """Get all buyers (newest first, keyset paginated)"""
+    page = _get_buyers_page(db, cursor=cursor, skip=skip, limit=limit)
+    if page["next_cursor"]:
+        response.headers[NEXT_CURSOR_HEADER] = page["next_cursor"]
+    # Items were already dumped through BuyerResponse when the page was cached
+    return raw_json_response(dumps(page["items"]), response)
 
 
 @router.get("/{buyer_id}", response_model=BuyerResponse)
@@ -233,6 +260,7 @@ def update_buyer(buyer_id: int, buyer_data: BuyerUpdate, db: Session = Depends(g
             setattr(buyer, key, value)
 
         db.commit()
+        invalidate_cache("buyers:*")
         db.refresh(buyer)
         return buyer
     except HTTPException:
@@ -253,6 +281,7 @@ def delete_buyer(buyer_id: int, db: Session = Depends(get_db_clients)):
 
         db.delete(buyer)
         db.commit()
+        invalidate_cache("buyers:*")
         return None
     except Exception as e:
         db.rollback()
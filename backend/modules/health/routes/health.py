@@ -11,6 +11,11 @@ from core.database import (
     SessionLocalClients, SessionLocalSamples, SessionLocalUsers,
     SessionLocalOrders, SessionLocalMerchandiser, SessionLocalSettings
 )
+from core.threadpool import get_threadpool_stats
+from core.cache import get_cache_stats
+from core.outbox import get_outbox_stats
+from core.notification_stream import get_stream_stats
+from core.security import get_password_pool_stats
 
 router = APIRouter()
 
@@ -61,6 +66,12 @@ async def health_check():
     if not all_healthy:
         health_status["status"] = "unhealthy"
 
+    health_status["thread_pools"] = get_threadpool_stats()
+    health_status["cache"] = get_cache_stats()
+    health_status["sync_outbox"] = get_outbox_stats()
+    health_status["notification_streams"] = get_stream_stats()
+    health_status["password_hashing"] = get_password_pool_stats()
+
     return health_status
 
 
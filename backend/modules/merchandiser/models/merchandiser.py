@@ -6,6 +6,7 @@ from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Tex
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from core.database import BaseMerchandiser as Base
+from core.outbox import SyncOutboxMixin
 
 
 # ============================================================================
@@ -477,3 +478,7 @@ class CMCalculation(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+
+class SyncOutbox(SyncOutboxMixin, Base):
+    """Pending replication events to the other sample database (transactional outbox)"""
+    pass
@@ -2,17 +2,25 @@
 Merchandiser Department Routes
 Complete REST API endpoints for all merchandising operations
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
 from typing import List, Optional
+import logging
+from core.config import settings
 from core.database import get_db_merchandiser
+from core.jobs import get_job, run_job, start_job, stream_job_progress
+from core.outbox import enqueue_event
+from core.services.sync_service import SAMPLE_PRIMARY_UPDATED, SAMPLE_STATUS_SYNCED
+from core.pagination import keyset_paginate
+from core.threadpool import blocking_route_class
 from modules.merchandiser.models.merchandiser import (
     YarnDetail, FabricDetail, TrimsDetail, AccessoriesDetail,
     FinishedGoodDetail, PackingGoodDetail, SizeChart,
     SamplePrimaryInfo, SampleTNAColorWise, SampleStatus,
     StyleCreation, StyleBasicInfo, StyleMaterialLink,
-    StyleColor, StyleSize, StyleVariant, CMCalculation
+    StyleColor, StyleSize, StyleVariant, CMCalculation, SyncOutbox
 )
 from modules.merchandiser.schemas.merchandiser import (
     # Yarn schemas
@@ -44,7 +52,14 @@ from modules.merchandiser.schemas.merchandiser import (
     CMCalculationCreate, CMCalculationUpdate, CMCalculationResponse,
 )
 
-router = APIRouter(tags=["Merchandiser"])
+logger = logging.getLogger(__name__)
+
+# Handlers are plain `def` and run on a dedicated bounded thread pool, so blocking
+# Session queries (e.g. sync-to-samples) never stall the event loop for other requests
+router = APIRouter(
+    tags=["Merchandiser"],
+    route_class=blocking_route_class("merchandiser", settings.MERCHANDISER_DB_THREADS)
+)
 
 
 # ============================================================================
@@ -52,7 +67,7 @@ router = APIRouter(tags=["Merchandiser"])
 # ============================================================================
 
 @router.get("/")
-async def merchandiser_root():
+def merchandiser_root():
     """
     Merchandiser Module Root - Overview of all available endpoints
     """
@@ -96,7 +111,7 @@ async def merchandiser_root():
 # ============================================================================
 
 @router.post("/yarn", response_model=YarnDetailResponse, status_code=status.HTTP_201_CREATED)
-async def create_yarn_detail(
+def create_yarn_detail(
     yarn: YarnDetailCreate,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -117,7 +132,7 @@ async def create_yarn_detail(
 
 
 @router.get("/yarn", response_model=List[YarnDetailResponse])
-async def get_all_yarn_details(
+def get_all_yarn_details(
     skip: int = 0,
     limit: Optional[int] = None,
     db: Session = Depends(get_db_merchandiser)
@@ -128,7 +143,7 @@ async def get_all_yarn_details(
 
 
 @router.get("/yarn/{yarn_id}", response_model=YarnDetailResponse)
-async def get_yarn_detail(
+def get_yarn_detail(
     yarn_id: str,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -143,7 +158,7 @@ async def get_yarn_detail(
 
 
 @router.put("/yarn/{yarn_id}", response_model=YarnDetailResponse)
-async def update_yarn_detail(
+def update_yarn_detail(
     yarn_id: str,
     yarn_update: YarnDetailUpdate,
     db: Session = Depends(get_db_merchandiser)
@@ -166,7 +181,7 @@ async def update_yarn_detail(
 
 
 @router.delete("/yarn/{yarn_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_yarn_detail(
+def delete_yarn_detail(
     yarn_id: str,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -188,7 +203,7 @@ async def delete_yarn_detail(
 # ============================================================================
 
 @router.post("/fabric", response_model=FabricDetailResponse, status_code=status.HTTP_201_CREATED)
-async def create_fabric_detail(
+def create_fabric_detail(
     fabric: FabricDetailCreate,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -208,7 +223,7 @@ async def create_fabric_detail(
 
 
 @router.get("/fabric", response_model=List[FabricDetailResponse])
-async def get_all_fabric_details(
+def get_all_fabric_details(
     skip: int = 0,
     limit: Optional[int] = None,
     db: Session = Depends(get_db_merchandiser)
@@ -219,7 +234,7 @@ async def get_all_fabric_details(
 
 
 @router.get("/fabric/{fabric_id}", response_model=FabricDetailResponse)
-async def get_fabric_detail(
+def get_fabric_detail(
     fabric_id: str,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -234,7 +249,7 @@ async def get_fabric_detail(
 
 
 @router.put("/fabric/{fabric_id}", response_model=FabricDetailResponse)
-async def update_fabric_detail(
+def update_fabric_detail(
     fabric_id: str,
     fabric_update: FabricDetailUpdate,
     db: Session = Depends(get_db_merchandiser)
@@ -257,7 +272,7 @@ async def update_fabric_detail(
 
 
 @router.delete("/fabric/{fabric_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_fabric_detail(
+def delete_fabric_detail(
     fabric_id: str,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -279,7 +294,7 @@ async def delete_fabric_detail(
 # ============================================================================
 
 @router.post("/trims", response_model=TrimsDetailResponse, status_code=status.HTTP_201_CREATED)
-async def create_trims_detail(
+def create_trims_detail(
     trims: TrimsDetailCreate,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -299,7 +314,7 @@ async def create_trims_detail(
 
 
 @router.get("/trims", response_model=List[TrimsDetailResponse])
-async def get_all_trims_details(
+def get_all_trims_details(
     skip: int = 0,
     limit: Optional[int] = None,
     db: Session = Depends(get_db_merchandiser)
@@ -315,7 +330,7 @@ async def get_all_trims_details(
 
 
 @router.get("/trims/{product_id}", response_model=TrimsDetailResponse)
-async def get_trims_detail(
+def get_trims_detail(
     product_id: str,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -330,7 +345,7 @@ async def get_trims_detail(
 
 
 @router.put("/trims/{product_id}", response_model=TrimsDetailResponse)
-async def update_trims_detail(
+def update_trims_detail(
     product_id: str,
     trims_update: TrimsDetailUpdate,
     db: Session = Depends(get_db_merchandiser)
@@ -353,7 +368,7 @@ async def update_trims_detail(
 
 
 @router.delete("/trims/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_trims_detail(
+def delete_trims_detail(
     product_id: str,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -375,7 +390,7 @@ async def delete_trims_detail(
 # ============================================================================
 
 @router.post("/accessories", response_model=AccessoriesDetailResponse, status_code=status.HTTP_201_CREATED)
-async def create_accessories_detail(
+def create_accessories_detail(
     accessories: AccessoriesDetailCreate,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -395,7 +410,7 @@ async def create_accessories_detail(
 
 
 @router.get("/accessories", response_model=List[AccessoriesDetailResponse])
-async def get_all_accessories_details(
+def get_all_accessories_details(
     skip: int = 0,
     limit: Optional[int] = None,
     db: Session = Depends(get_db_merchandiser)
@@ -411,7 +426,7 @@ async def get_all_accessories_details(
 
 
 @router.get("/accessories/{product_id}", response_model=AccessoriesDetailResponse)
-async def get_accessories_detail(
+def get_accessories_detail(
     product_id: str,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -426,7 +441,7 @@ async def get_accessories_detail(
 
 
 @router.put("/accessories/{product_id}", response_model=AccessoriesDetailResponse)
-async def update_accessories_detail(
+def update_accessories_detail(
     product_id: str,
     accessories_update: AccessoriesDetailUpdate,
     db: Session = Depends(get_db_merchandiser)
@@ -449,7 +464,7 @@ async def update_accessories_detail(
 
 
 @router.delete("/accessories/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_accessories_detail(
+def delete_accessories_detail(
     product_id: str,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -471,7 +486,7 @@ async def delete_accessories_detail(
 # ============================================================================
 
 @router.post("/finished-good", response_model=FinishedGoodDetailResponse, status_code=status.HTTP_201_CREATED)
-async def create_finished_good_detail(
+def create_finished_good_detail(
     finished_good: FinishedGoodDetailCreate,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -491,7 +506,7 @@ async def create_finished_good_detail(
 
 
 @router.get("/finished-good", response_model=List[FinishedGoodDetailResponse])
-async def get_all_finished_good_details(
+def get_all_finished_good_details(
     skip: int = 0,
     limit: Optional[int] = None,
     db: Session = Depends(get_db_merchandiser)
@@ -507,7 +522,7 @@ async def get_all_finished_good_details(
 
 
 @router.get("/finished-good/{product_id}", response_model=FinishedGoodDetailResponse)
-async def get_finished_good_detail(
+def get_finished_good_detail(
     product_id: str,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -522,7 +537,7 @@ async def get_finished_good_detail(
 
 
 @router.put("/finished-good/{product_id}", response_model=FinishedGoodDetailResponse)
-async def update_finished_good_detail(
+def update_finished_good_detail(
     product_id: str,
     finished_good_update: FinishedGoodDetailUpdate,
     db: Session = Depends(get_db_merchandiser)
@@ -545,7 +560,7 @@ async def update_finished_good_detail(
 
 
 @router.delete("/finished-good/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_finished_good_detail(
+def delete_finished_good_detail(
     product_id: str,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -567,7 +582,7 @@ async def delete_finished_good_detail(
 # ============================================================================
 
 @router.post("/packing-good", response_model=PackingGoodDetailResponse, status_code=status.HTTP_201_CREATED)
-async def create_packing_good_detail(
+def create_packing_good_detail(
     packing_good: PackingGoodDetailCreate,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -598,7 +613,7 @@ async def create_packing_good_detail(
 
 
 @router.get("/packing-good", response_model=List[PackingGoodDetailResponse])
-async def get_all_packing_good_details(
+def get_all_packing_good_details(
     skip: int = 0,
     limit: Optional[int] = None,
     db: Session = Depends(get_db_merchandiser)
@@ -614,7 +629,7 @@ async def get_all_packing_good_details(
 
 
 @router.get("/packing-good/{product_id}", response_model=PackingGoodDetailResponse)
-async def get_packing_good_detail(
+def get_packing_good_detail(
     product_id: str,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -629,7 +644,7 @@ async def get_packing_good_detail(
 
 
 @router.put("/packing-good/{product_id}", response_model=PackingGoodDetailResponse)
-async def update_packing_good_detail(
+def update_packing_good_detail(
     product_id: str,
     packing_good_update: PackingGoodDetailUpdate,
     db: Session = Depends(get_db_merchandiser)
@@ -652,7 +667,7 @@ async def update_packing_good_detail(
 
 
 @router.delete("/packing-good/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_packing_good_detail(
+def delete_packing_good_detail(
     product_id: str,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -674,7 +689,7 @@ async def delete_packing_good_detail(
 # ============================================================================
 
 @router.post("/size-chart", response_model=SizeChartResponse, status_code=status.HTTP_201_CREATED)
-async def create_size_chart(
+def create_size_chart(
     size_chart: SizeChartCreate,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -694,7 +709,7 @@ async def create_size_chart(
 
 
 @router.get("/size-chart", response_model=List[SizeChartResponse])
-async def get_all_size_charts(
+def get_all_size_charts(
     skip: int = 0,
     limit: Optional[int] = None,
     db: Session = Depends(get_db_merchandiser)
@@ -705,7 +720,7 @@ async def get_all_size_charts(
 
 
 @router.get("/size-chart/{size_id}", response_model=SizeChartResponse)
-async def get_size_chart(
+def get_size_chart(
     size_id: str,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -720,7 +735,7 @@ async def get_size_chart(
 
 
 @router.put("/size-chart/{size_id}", response_model=SizeChartResponse)
-async def update_size_chart(
+def update_size_chart(
     size_id: str,
     size_chart_update: SizeChartUpdate,
     db: Session = Depends(get_db_merchandiser)
@@ -743,7 +758,7 @@ async def update_size_chart(
 
 
 @router.delete("/size-chart/{size_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_size_chart(
+def delete_size_chart(
     size_id: str,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -765,7 +780,7 @@ async def delete_size_chart(
 # ============================================================================
 
 @router.post("/sample-primary", response_model=SamplePrimaryInfoResponse, status_code=status.HTTP_201_CREATED)
-async def create_sample_primary_info(
+def create_sample_primary_info(
     sample_data: SamplePrimaryInfoCreate,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -813,188 +828,62 @@ async def create_sample_primary_info(
     return db_sample
 
 
-@router.post("/sample-primary/sync-to-samples", status_code=status.HTTP_200_OK)
-async def sync_samples_to_samples_db(db: Session = Depends(get_db_merchandiser)):
-    """Sync all existing SamplePrimaryInfo records to SampleRequest in samples database"""
-    from core.database import SessionLocalSamples
-    from modules.samples.models.sample import SampleRequest
-    from core.services.buyer_service import BuyerService
-    
-    all_samples = db.query(SamplePrimaryInfo).all()
-    synced_count = 0
-    skipped_count = 0
-    
-    samples_db = SessionLocalSamples()
-    try:
-        buyer_service = BuyerService()
-        for sample in all_samples:
-            # Check if SampleRequest already exists
-            existing_request = samples_db.query(SampleRequest).filter(
-                SampleRequest.sample_id == sample.sample_id
-            ).first()
-            
-            if existing_request:
-                skipped_count += 1
-                continue
-            
-            # Get buyer name
-            buyer_name = None
-            try:
-                buyer_info = buyer_service.get_by_id(sample.buyer_id)
-                if buyer_info:
-                    buyer_name = buyer_info.get("buyer_name")
-            except (KeyError, ValueError, AttributeError) as buyer_error:
-                logger.warning(f"Could not fetch buyer name for buyer_id {sample.buyer_id}: {buyer_error}")
-                pass
-            
-            import json
-            
-            # Handle yarn_ids - keep as JSON array (SampleRequest model supports JSON)
-            yarn_ids_json = sample.yarn_ids
-            if isinstance(yarn_ids_json, str):
-                try:
-                    yarn_ids_json = json.loads(yarn_ids_json)
-                except (json.JSONDecodeError, TypeError):
-                    yarn_ids_json = []
-            # Also set yarn_id (first one) for backward compatibility
-            yarn_id = yarn_ids_json[0] if yarn_ids_json and len(yarn_ids_json) > 0 else (sample.yarn_id or None)
-            
-            # Handle trims_ids - keep as JSON (SampleRequest model supports JSON)
-            trims_ids_json = sample.trims_ids
-            if isinstance(trims_ids_json, str):
-                try:
-                    trims_ids_json = json.loads(trims_ids_json)
-                except (json.JSONDecodeError, TypeError):
-                    trims_ids_json = []
-            
-            # Handle color_ids - keep as JSON array
-            color_ids_json = sample.color_ids
-            if isinstance(color_ids_json, str):
-                try:
-                    color_ids_json = json.loads(color_ids_json)
-                except (json.JSONDecodeError, TypeError):
-                    color_ids_json = []
-            # Also set color_id (first one) for backward compatibility
-            color_id = color_ids_json[0] if color_ids_json and len(color_ids_json) > 0 else (sample.color_id or None)
-            
-            # Handle size_ids - keep as JSON array
-            size_ids_json = sample.size_ids
-            if isinstance(size_ids_json, str):
-                try:
-                    size_ids_json = json.loads(size_ids_json)
-                except (json.JSONDecodeError, TypeError):
-                    size_ids_json = []
-            # Also set size_id (first one) for backward compatibility
-            size_id = size_ids_json[0] if size_ids_json and len(size_ids_json) > 0 else (sample.size_id or None)
-            
-            # Map ply (convert string to int if possible)
-            ply_value = None
-            if sample.ply:
-                try:
-                    ply_value = int(sample.ply)
-                except (ValueError, TypeError):
-                    pass
-            
-            # Handle decorative_part - keep as JSON array (SampleRequest model supports JSON)
-            decorative_part_json = sample.decorative_part
-            if isinstance(decorative_part_json, str):
-                try:
-                    decorative_part_json = json.loads(decorative_part_json)
-                except (json.JSONDecodeError, TypeError):
-                    # If not valid JSON, treat as comma-separated string
-                    decorative_part_json = [s.strip() for s in decorative_part_json.split(',')] if decorative_part_json else []
-            # Also create comma-separated string for backward compatibility (decorative_part is String in SampleRequest)
-            decorative_part_str = ", ".join(decorative_part_json) if decorative_part_json and isinstance(decorative_part_json, list) else (str(decorative_part_json) if decorative_part_json else None)
-            
-            # additional_instruction: JSON array of objects -> newline-separated string
-            additional_instruction_str = None
-            if sample.additional_instruction:
-                if isinstance(sample.additional_instruction, list):
-                    instructions = []
-                    for inst in sample.additional_instruction:
-                        if isinstance(inst, dict):
-                            instruction_text = inst.get('instruction', '')
-                            done_marker = "✓" if inst.get('done', False) else ""
-                            instructions.append(f"{done_marker} {instruction_text}".strip())
-                        else:
-                            instructions.append(str(inst))
-                    additional_instruction_str = "\n".join(instructions) if instructions else None
-                else:
-                    additional_instruction_str = str(sample.additional_instruction)
-            
-            # techpack_files: JSON array -> use first file's url/filename
-            techpack_url = None
-            techpack_filename = None
-            if sample.techpack_files:
-                if isinstance(sample.techpack_files, list) and len(sample.techpack_files) > 0:
-                    first_file = sample.techpack_files[0]
-                    if isinstance(first_file, dict):
-                        techpack_url = first_file.get('url')
-                        techpack_filename = first_file.get('filename')
-            
-            # Build color_name and size_name from arrays if not set
-            color_name_final = sample.color_name
-            if not color_name_final and color_ids_json:
-                # Try to get color names from color IDs (would need color service)
-                color_name_final = None  # Will be set by frontend if needed
-            
-            size_name_final = sample.size_name
-            if not size_name_final and size_ids_json:
-                # Try to get size names from size IDs (would need size service)
-                size_name_final = None  # Will be set by frontend if needed
-            
-            # Create SampleRequest with all matching fields
-            sample_request = SampleRequest(
-                sample_id=sample.sample_id,
-                buyer_id=sample.buyer_id,
-                buyer_name=buyer_name or sample.buyer_name,
-                sample_name=sample.sample_name,
-                item=sample.item,
-                gauge=sample.gauge,
-                ply=ply_value,
-                sample_category=sample.sample_category,
-                color_ids=color_ids_json,  # All color IDs
-                color_name=color_name_final or sample.color_name,
-                size_ids=size_ids_json,  # All size IDs
-                size_name=size_name_final or sample.size_name,
-                yarn_ids=yarn_ids_json,  # All yarn IDs
-                yarn_id=yarn_id,  # First yarn ID for backward compatibility
-                yarn_details=sample.yarn_details,
-                trims_ids=trims_ids_json,
-                trims_details=sample.trims_details,
-                decorative_part=decorative_part_str,  # Comma-separated string (backward compatibility)
-                decorative_details=None,  # Removed field
-                yarn_handover_date=sample.yarn_handover_date,
-                trims_handover_date=sample.trims_handover_date,
-                required_date=sample.required_date,
-                request_pcs=sample.request_pcs,
-                additional_instruction=additional_instruction_str,  # Converted from JSON array to string
-                techpack_url=techpack_url,  # From first techpack file
-                techpack_filename=techpack_filename,  # From first techpack file
-                current_status="Pending"
-            )
-            samples_db.add(sample_request)
-            synced_count += 1
-        
-        samples_db.commit()
-    finally:
-        samples_db.close()
-    
+@router.post("/sample-primary/sync-to-samples", status_code=status.HTTP_202_ACCEPTED)
+def sync_samples_to_samples_db(background_tasks: BackgroundTasks):
+    """
+    Sync all existing SamplePrimaryInfo records to SampleRequest in samples database
+
+    Runs as a background job; poll /sample-primary/sync-to-samples/jobs/{job_id}
+    or follow .../jobs/{job_id}/stream for progress.
+    """
+    from core.services.sync_service import SyncService
+
+    job, created = start_job("sync_to_samples")
+    if created:
+        background_tasks.add_task(run_job, job, SyncService.sync_all_primary_info_to_sample_requests)
+
     return {
-        "message": f"Sync completed: {synced_count} samples synced, {skipped_count} already existed"
+        "message": "Sync started" if created else "Sync already in progress",
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "status_url": f"{settings.API_V1_STR}/merchandiser/sample-primary/sync-to-samples/jobs/{job['job_id']}"
     }
 
 
+@router.get("/sample-primary/sync-to-samples/jobs/{job_id}")
+def get_sync_to_samples_job(job_id: str):
+    """Get progress of a sync-to-samples job"""
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Sync job not found")
+    return job
+
+
+@router.get("/sample-primary/sync-to-samples/jobs/{job_id}/stream")
+async def stream_sync_to_samples_job(job_id: str):
+    """Stream progress of a sync-to-samples job as server-sent events"""
+    return StreamingResponse(stream_job_progress(job_id), media_type="text/event-stream")
+
+
 @router.get("/sample-primary", response_model=List[SamplePrimaryInfoResponse])
-async def get_all_sample_primary_info(
+def get_all_sample_primary_info(
+    response: Response,
+    cursor: Optional[str] = None,
     skip: int = 0,
     limit: Optional[int] = None,
     db: Session = Depends(get_db_merchandiser)
 ):
-    """Get all sample primary info, sorted by created_at descending (newest first)"""
+    """Get all sample primary info, sorted by created_at descending (newest first, keyset paginated via cursor)"""
     try:
-        samples = db.query(SamplePrimaryInfo).order_by(SamplePrimaryInfo.created_at.desc()).offset(skip).limit(limit).all()
+        samples = keyset_paginate(
+            db.query(SamplePrimaryInfo),
+            (SamplePrimaryInfo.created_at, SamplePrimaryInfo.id),
+            response, cursor, limit, skip,
+            max_limit=settings.PAGINATION_BULK_MAX_LIMIT
+        )
         return samples or []
+    except HTTPException:
+        raise
     except Exception as e:
         import logging
         logger = logging.getLogger(__name__)
@@ -1006,7 +895,7 @@ async def get_all_sample_primary_info(
 
 
 @router.get("/sample-primary/{sample_id}", response_model=SamplePrimaryInfoResponse)
-async def get_sample_primary_info(
+def get_sample_primary_info(
     sample_id: str,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -1021,16 +910,12 @@ async def get_sample_primary_info(
 
 
 @router.put("/sample-primary/{sample_id}", response_model=SamplePrimaryInfoResponse)
-async def update_sample_primary_info(
+def update_sample_primary_info(
     sample_id: str,
     sample_update: SamplePrimaryInfoUpdate,
     db: Session = Depends(get_db_merchandiser)
 ):
     """Update a sample primary info and sync changes to SampleRequest in samples database"""
-    from core.database import SessionLocalSamples
-    from modules.samples.models.sample import SampleRequest
-    from core.services.buyer_service import BuyerService
-    
     db_sample = db.query(SamplePrimaryInfo).filter(SamplePrimaryInfo.sample_id == sample_id).first()
     if not db_sample:
         raise HTTPException(
@@ -1041,144 +926,18 @@ async def update_sample_primary_info(
     update_data = sample_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_sample, field, value)
+
+    # Replicated to SampleRequest by the outbox relay (same transaction)
+    enqueue_event(db, SyncOutbox, SAMPLE_PRIMARY_UPDATED, sample_id, update_data)
     
     db.commit()
     db.refresh(db_sample)
     
-    # Sync update to SampleRequest in samples database
-    try:
-        samples_db = SessionLocalSamples()
-        try:
-            sample_request = samples_db.query(SampleRequest).filter(
-                SampleRequest.sample_id == sample_id
-            ).first()
-            
-            if sample_request:
-                # Get buyer name if buyer_id changed
-                if 'buyer_id' in update_data:
-                    buyer_service = BuyerService()
-                    buyer_name = None
-                    try:
-                        buyer_info = buyer_service.get_by_id(update_data['buyer_id'])
-                        if buyer_info:
-                            buyer_name = buyer_info.get("buyer_name")
-                    except (KeyError, ValueError, AttributeError) as buyer_error:
-                        logger.warning(f"Could not fetch buyer name for buyer_id {update_data['buyer_id']}: {buyer_error}")
-                        pass
-                    if buyer_name:
-                        sample_request.buyer_name = buyer_name
-                    sample_request.buyer_id = update_data['buyer_id']
-                
-                # Update all matching fields
-                if 'sample_name' in update_data:
-                    sample_request.sample_name = update_data['sample_name']
-                if 'item' in update_data:
-                    sample_request.item = update_data['item']
-                if 'gauge' in update_data:
-                    sample_request.gauge = update_data['gauge']
-                if 'ply' in update_data:
-                    try:
-                        sample_request.ply = int(update_data['ply']) if update_data['ply'] else None
-                    except (ValueError, TypeError):
-                        pass
-                if 'sample_category' in update_data:
-                    sample_request.sample_category = update_data['sample_category']
-                if 'color_ids' in update_data:
-                    # SamplePrimaryInfo has color_ids as JSON array, SampleRequest also has it as JSON
-                    sample_request.color_ids = update_data['color_ids']
-                    # Also set color_name if not provided
-                    if 'color_name' not in update_data and update_data['color_ids']:
-                        # Will be set by frontend if needed
-                        pass
-                if 'color_name' in update_data:
-                    sample_request.color_name = update_data['color_name']
-                if 'size_ids' in update_data:
-                    # SamplePrimaryInfo has size_ids as JSON array, SampleRequest also has it as JSON
-                    sample_request.size_ids = update_data['size_ids']
-                    # Also set size_name if not provided
-                    if 'size_name' not in update_data and update_data['size_ids']:
-                        # Will be set by frontend if needed
-                        pass
-                if 'size_name' in update_data:
-                    sample_request.size_name = update_data['size_name']
-                if 'yarn_ids' in update_data:
-                    # SamplePrimaryInfo has yarn_ids as JSON array, SampleRequest also has it as JSON
-                    sample_request.yarn_ids = update_data['yarn_ids']
-                    # Also set yarn_id (first one) for backward compatibility
-                    yarn_id = update_data['yarn_ids'][0] if update_data['yarn_ids'] and len(update_data['yarn_ids']) > 0 else None
-                    sample_request.yarn_id = yarn_id
-                if 'yarn_id' in update_data:
-                    sample_request.yarn_id = update_data['yarn_id']
-                    # Also update yarn_ids array if yarn_id is set (but yarn_ids takes precedence)
-                    if 'yarn_ids' not in update_data and update_data['yarn_id']:
-                        sample_request.yarn_ids = [update_data['yarn_id']]
-                if 'yarn_details' in update_data:
-                    sample_request.yarn_details = update_data['yarn_details']
-                if 'trims_ids' in update_data:
-                    sample_request.trims_ids = update_data['trims_ids']
-                if 'trims_details' in update_data:
-                    sample_request.trims_details = update_data['trims_details']
-                if 'decorative_part' in update_data:
-                    # Convert JSON array to comma-separated string for samples database
-                    decorative_part = update_data['decorative_part']
-                    if isinstance(decorative_part, list):
-                        sample_request.decorative_part = ", ".join(decorative_part) if decorative_part else None
-                    elif decorative_part is not None:
-                        sample_request.decorative_part = str(decorative_part)
-                    else:
-                        sample_request.decorative_part = None
-                # decorative_details field removed
-                if 'yarn_handover_date' in update_data:
-                    sample_request.yarn_handover_date = update_data['yarn_handover_date']
-                if 'trims_handover_date' in update_data:
-                    sample_request.trims_handover_date = update_data['trims_handover_date']
-                if 'required_date' in update_data:
-                    sample_request.required_date = update_data['required_date']
-                if 'request_pcs' in update_data:
-                    sample_request.request_pcs = update_data['request_pcs']
-                if 'additional_instruction' in update_data:
-                    # Convert JSON array of objects to newline-separated string for samples database
-                    additional_instruction = update_data['additional_instruction']
-                    if isinstance(additional_instruction, list):
-                        instructions = []
-                        for inst in additional_instruction:
-                            if isinstance(inst, dict):
-                                instruction_text = inst.get('instruction', '')
-                                done_marker = "✓" if inst.get('done', False) else ""
-                                instructions.append(f"{done_marker} {instruction_text}".strip())
-                            else:
-                                instructions.append(str(inst))
-                        sample_request.additional_instruction = "\n".join(instructions) if instructions else None
-                    elif additional_instruction is not None:
-                        sample_request.additional_instruction = str(additional_instruction)
-                    else:
-                        sample_request.additional_instruction = None
-                if 'techpack_files' in update_data:
-                    # Convert JSON array to first file's url/filename for samples database
-                    techpack_files = update_data['techpack_files']
-                    if isinstance(techpack_files, list) and len(techpack_files) > 0:
-                        first_file = techpack_files[0]
-                        if isinstance(first_file, dict):
-                            sample_request.techpack_url = first_file.get('url')
-                            sample_request.techpack_filename = first_file.get('filename')
-                    else:
-                        sample_request.techpack_url = None
-                        sample_request.techpack_filename = None
-                
-                samples_db.commit()
-        finally:
-            samples_db.close()
-    except Exception as e:
-        # Log error but don't fail the merchandiser update
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.warning(f"Failed to sync sample update to samples database: {str(e)}")
-    
     return db_sample
 
 
 @router.delete("/sample-primary/{sample_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_sample_primary_info(
+def delete_sample_primary_info(
     sample_id: str,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -1200,7 +959,7 @@ async def delete_sample_primary_info(
 # ============================================================================
 
 @router.post("/sample-tna", response_model=SampleTNAColorWiseResponse, status_code=status.HTTP_201_CREATED)
-async def create_sample_tna(
+def create_sample_tna(
     sample_tna: SampleTNAColorWiseCreate,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -1213,7 +972,7 @@ async def create_sample_tna(
 
 
 @router.get("/sample-tna", response_model=List[SampleTNAColorWiseResponse])
-async def get_all_sample_tna(
+def get_all_sample_tna(
     sample_id: Optional[str] = None,
     skip: int = 0,
     limit: Optional[int] = None,
@@ -1229,7 +988,7 @@ async def get_all_sample_tna(
 
 
 @router.get("/sample-tna/{id}", response_model=SampleTNAColorWiseResponse)
-async def get_sample_tna(
+def get_sample_tna(
     id: int,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -1244,7 +1003,7 @@ async def get_sample_tna(
 
 
 @router.put("/sample-tna/{id}", response_model=SampleTNAColorWiseResponse)
-async def update_sample_tna(
+def update_sample_tna(
     id: int,
     sample_tna_update: SampleTNAColorWiseUpdate,
     db: Session = Depends(get_db_merchandiser)
@@ -1267,7 +1026,7 @@ async def update_sample_tna(
 
 
 @router.delete("/sample-tna/{id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_sample_tna(
+def delete_sample_tna(
     id: int,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -1293,7 +1052,7 @@ async def delete_sample_tna(
 # Merchandiser can only update existing status records via PUT endpoint
 
 @router.get("/sample-status", response_model=List[SampleStatusResponse])
-async def get_all_sample_status(
+def get_all_sample_status(
     sample_id: Optional[str] = None,
     skip: int = 0,
     limit: Optional[int] = None,
@@ -1380,7 +1139,7 @@ async def get_all_sample_status(
 
 
 @router.get("/sample-status/{id}", response_model=SampleStatusResponse)
-async def get_sample_status(
+def get_sample_status(
     id: int,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -1395,14 +1154,12 @@ async def get_sample_status(
 
 
 @router.put("/sample-status/{id}", response_model=SampleStatusResponse)
-async def update_sample_status(
+def update_sample_status(
     id: int,
     sample_status_update: SampleStatusUpdate,
     db: Session = Depends(get_db_merchandiser)
 ):
     """Update a sample status and auto-sync to samples module"""
-    from core.database import SessionLocalSamples
-    from modules.samples.models.sample import SampleRequest, SampleStatus as SamplesSampleStatus
     from core.logging import setup_logging
     
     logger = setup_logging()
@@ -1447,6 +1204,15 @@ async def update_sample_status(
             # Still return the existing record
             db.refresh(db_sample_status)
             return db_sample_status
+
+        # Auto-sync to samples module (outbox relay, same transaction)
+        sync_fields = ['status_from_merchandiser', 'notes', 'updated_by', 'expecting_end_date']
+        enqueue_event(db, SyncOutbox, SAMPLE_STATUS_SYNCED, sample_id, {
+            "fields": {key: update_data[key] for key in sync_fields if key in update_data},
+            # Note: expecting_end_date is set by samples department, not merchandiser
+            "create": {key: update_data.get(key) for key in ['status_from_merchandiser', 'notes', 'updated_by']},
+            "current_status": update_data.get('status_from_merchandiser') or None,
+        })
     
         try:
             db.commit()
@@ -1461,88 +1227,6 @@ async def update_sample_status(
                 detail=f"Failed to update sample status: {str(commit_error)}"
             )
         
-        # Auto-sync to samples module
-        try:
-            samples_db = SessionLocalSamples()
-            try:
-                # Find the corresponding SampleRequest by sample_id
-                sample_request = samples_db.query(SampleRequest).filter(
-                    SampleRequest.sample_id == sample_id
-                ).first()
-                
-                if sample_request:
-                    # Find or create corresponding SampleStatus in samples module
-                    # Try to find existing status record for this sample (get the most recent one)
-                    existing_status = samples_db.query(SamplesSampleStatus).filter(
-                        SamplesSampleStatus.sample_request_id == sample_request.id
-                    ).order_by(SamplesSampleStatus.created_at.desc()).first()
-                    
-                    if existing_status:
-                        # Update existing status record - update all fields that were provided
-                        has_changes = False
-                        if 'status_from_merchandiser' in update_data:
-                            existing_status.status_from_merchandiser = update_data['status_from_merchandiser']
-                            has_changes = True
-                        if 'notes' in update_data:
-                            existing_status.notes = update_data['notes']
-                            has_changes = True
-                        if 'updated_by' in update_data:
-                            existing_status.updated_by = update_data['updated_by']
-                            has_changes = True
-                        if 'expecting_end_date' in update_data:
-                            existing_status.expecting_end_date = update_data['expecting_end_date']
-                            has_changes = True
-                        
-                        if has_changes:
-                            try:
-                                samples_db.commit()
-                                samples_db.refresh(existing_status)
-                                logger.info(f"Updated existing SampleStatus in samples module for sample_id {sample_id}")
-                            except Exception as commit_error:
-                                samples_db.rollback()
-                                logger.error(f"Failed to commit status update in samples database: {str(commit_error)}", exc_info=True)
-                                # Don't fail the request - merchandiser update succeeded
-                        else:
-                            logger.info(f"No changes to sync for sample_id {sample_id}")
-                    else:
-                        # Create new status record in samples module
-                        new_status = SamplesSampleStatus(
-                            sample_request_id=sample_request.id,
-                            status_from_merchandiser=update_data.get('status_from_merchandiser'),
-                            notes=update_data.get('notes'),
-                            updated_by=update_data.get('updated_by')
-                            # Note: expecting_end_date is set by samples department, not merchandiser
-                        )
-                        samples_db.add(new_status)
-                        try:
-                            samples_db.commit()
-                            samples_db.refresh(new_status)
-                            logger.info(f"Created new SampleStatus in samples module for sample_id {sample_id}")
-                        except Exception as commit_error:
-                            samples_db.rollback()
-                            logger.error(f"Failed to create status in samples database: {str(commit_error)}", exc_info=True)
-                            # Don't fail the request - merchandiser update succeeded
-                    
-                    # Update current_status on SampleRequest if status_from_merchandiser is set and not empty
-                    if 'status_from_merchandiser' in update_data and update_data.get('status_from_merchandiser'):
-                        sample_request.current_status = update_data['status_from_merchandiser']
-                        try:
-                            samples_db.commit()
-                            logger.info(f"Updated SampleRequest.current_status to '{update_data['status_from_merchandiser']}' for sample_id {sample_id}")
-                        except Exception as commit_error:
-                            samples_db.rollback()
-                            logger.error(f"Failed to update SampleRequest.current_status: {str(commit_error)}", exc_info=True)
-                            # Don't fail the request - merchandiser update succeeded
-                        
-                    logger.info(f"✅ Successfully synced sample status update for sample_id {sample_id} to samples module")
-                else:
-                    logger.warning(f"SampleRequest not found for sample_id {sample_id} in samples database - sync skipped")
-            finally:
-                samples_db.close()
-        except Exception as e:
-            logger.error(f"Failed to sync sample status to samples module for sample_id {sample_id}: {str(e)}", exc_info=True)
-            # Don't fail the request if sync fails - merchandiser update succeeded
-        
         # Ensure the object is properly refreshed and all fields are accessible
         try:
             db.refresh(db_sample_status)
@@ -1552,8 +1236,8 @@ async def update_sample_status(
         
         # Send notification to sample department
         try:
-            from core.notification_service import send_notification_to_department
-            send_notification_to_department(
+            from core.notification_service import send_notification_to_department_background
+            send_notification_to_department_background(
                 title="Sample Status Updated",
                 message=f"Sample status for {sample_id} has been updated by Merchandising Department",
                 target_department="sample_department",
@@ -1580,103 +1264,22 @@ async def update_sample_status(
 
 
 @router.post("/sample-status/sync-from-samples", status_code=status.HTTP_200_OK)
-async def sync_sample_status_from_samples(db: Session = Depends(get_db_merchandiser)):
-    """Sync all sample status records from samples database to merchandiser database"""
-    from core.database import SessionLocalSamples
-    from modules.samples.models.sample import SampleStatus as SamplesSampleStatus, SampleRequest
-    from core.logging import setup_logging
-    
-    logger = setup_logging()
-    
-    synced_count = 0
-    updated_count = 0
-    skipped_count = 0
-    
+def sync_sample_status_from_samples(db: Session = Depends(get_db_merchandiser)):
+    """Sync the latest sample status of every sample from samples database to merchandiser database"""
+    from core.services.sync_service import SyncService
+
     try:
-        samples_db = SessionLocalSamples()
-        try:
-            # Get all status records from samples database
-            samples_statuses = samples_db.query(SamplesSampleStatus).order_by(
-                SamplesSampleStatus.created_at.desc()
-            ).all()
-            
-            logger.info(f"Found {len(samples_statuses)} status records in samples database. Syncing to merchandiser...")
-            
-            for samples_status in samples_statuses:
-                # Get the sample_id from SampleRequest
-                sample_request = samples_db.query(SampleRequest).filter(
-                    SampleRequest.id == samples_status.sample_request_id
-                ).first()
-                
-                if sample_request:
-                    # Check if already exists in merchandiser (by sample_id and created_at to match the record)
-                    existing = db.query(SampleStatus).filter(
-                        SampleStatus.sample_id == sample_request.sample_id
-                    ).order_by(SampleStatus.created_at.desc()).first()
-                    
-                    if existing:
-                        # Update existing record - always update status_by_sample from samples (merchandiser can't change it)
-                        # Only update status_by_sample, notes, updated_by from samples
-                        # Don't overwrite status_from_merchandiser (that comes from merchandiser)
-                        needs_update = False
-                        if existing.status_by_sample != samples_status.status_by_sample:
-                            existing.status_by_sample = samples_status.status_by_sample
-                            needs_update = True
-                        if existing.notes != samples_status.notes:
-                            existing.notes = samples_status.notes
-                            needs_update = True
-                        if samples_status.updated_by and existing.updated_by != samples_status.updated_by:
-                            # Only update updated_by if it's from samples (when status_by_sample is set)
-                            if samples_status.status_by_sample:
-                                existing.updated_by = samples_status.updated_by
-                                needs_update = True
-                        
-                        if needs_update:
-                            try:
-                                db.commit()
-                                updated_count += 1
-                                logger.info(f"Updated status record for sample_id {sample_request.sample_id}")
-                            except Exception as commit_error:
-                                db.rollback()
-                                logger.error(f"Failed to commit status update for sample_id {sample_request.sample_id}: {str(commit_error)}", exc_info=True)
-                                skipped_count += 1
-                        else:
-                            skipped_count += 1
-                    else:
-                        # Create new record in merchandiser database
-                        new_status = SampleStatus(
-                            sample_id=sample_request.sample_id,
-                            status_by_sample=samples_status.status_by_sample,
-                            status_from_merchandiser=samples_status.status_from_merchandiser,
-                            notes=samples_status.notes,
-                            updated_by=samples_status.updated_by
-                        )
-                        db.add(new_status)
-                        synced_count += 1
-                        logger.info(f"Synced status record for sample_id {sample_request.sample_id} from samples to merchandiser")
-            
-            db.commit()
-            logger.info(f"Sync completed: {synced_count} created, {updated_count} updated, {skipped_count} skipped")
-        finally:
-            samples_db.close()
+        return SyncService.sync_sample_statuses_from_samples(db)
     except Exception as sync_error:
-        db.rollback()
         logger.error(f"Failed to sync sample status from samples database: {str(sync_error)}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to sync: {str(sync_error)}"
         )
-    
-    return {
-        "message": f"Sync completed: {synced_count} created, {updated_count} updated, {skipped_count} skipped",
-        "synced": synced_count,
-        "updated": updated_count,
-        "skipped": skipped_count
-    }
 
 
 @router.delete("/sample-status/{id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_sample_status(
+def delete_sample_status(
     id: int,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -1698,7 +1301,7 @@ async def delete_sample_status(
 # ============================================================================
 
 @router.post("/style-creation", response_model=StyleCreationResponse, status_code=status.HTTP_201_CREATED)
-async def create_style(
+def create_style(
     style: StyleCreationCreate,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -1718,7 +1321,7 @@ async def create_style(
 
 
 @router.get("/style-creation", response_model=List[StyleCreationResponse])
-async def get_all_styles(
+def get_all_styles(
     skip: int = 0,
     limit: Optional[int] = None,
     db: Session = Depends(get_db_merchandiser)
@@ -1729,7 +1332,7 @@ async def get_all_styles(
 
 
 @router.get("/style-creation/{style_id}", response_model=StyleCreationResponse)
-async def get_style(
+def get_style(
     style_id: str,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -1744,7 +1347,7 @@ async def get_style(
 
 
 @router.put("/style-creation/{style_id}", response_model=StyleCreationResponse)
-async def update_style(
+def update_style(
     style_id: str,
     style_update: StyleCreationUpdate,
     db: Session = Depends(get_db_merchandiser)
@@ -1767,7 +1370,7 @@ async def update_style(
 
 
 @router.delete("/style-creation/{style_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_style(
+def delete_style(
     style_id: str,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -1789,7 +1392,7 @@ async def delete_style(
 # ============================================================================
 
 @router.post("/style-basic-info", response_model=StyleBasicInfoResponse, status_code=status.HTTP_201_CREATED)
-async def create_style_basic_info(
+def create_style_basic_info(
     style_info: StyleBasicInfoCreate,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -1809,7 +1412,7 @@ async def create_style_basic_info(
 
 
 @router.get("/style-basic-info", response_model=List[StyleBasicInfoResponse])
-async def get_all_style_basic_info(
+def get_all_style_basic_info(
     skip: int = 0,
     limit: Optional[int] = None,
     db: Session = Depends(get_db_merchandiser)
@@ -1820,7 +1423,7 @@ async def get_all_style_basic_info(
 
 
 @router.get("/style-basic-info/{style_id}", response_model=StyleBasicInfoResponse)
-async def get_style_basic_info(
+def get_style_basic_info(
     style_id: str,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -1835,7 +1438,7 @@ async def get_style_basic_info(
 
 
 @router.put("/style-basic-info/{style_id}", response_model=StyleBasicInfoResponse)
-async def update_style_basic_info(
+def update_style_basic_info(
     style_id: str,
     style_info_update: StyleBasicInfoUpdate,
     db: Session = Depends(get_db_merchandiser)
@@ -1858,7 +1461,7 @@ async def update_style_basic_info(
 
 
 @router.delete("/style-basic-info/{style_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_style_basic_info(
+def delete_style_basic_info(
     style_id: str,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -1880,7 +1483,7 @@ async def delete_style_basic_info(
 # ============================================================================
 
 @router.post("/style-material-link", response_model=StyleMaterialLinkResponse, status_code=status.HTTP_201_CREATED)
-async def create_style_material_link(
+def create_style_material_link(
     material_link: StyleMaterialLinkCreate,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -1907,7 +1510,7 @@ async def create_style_material_link(
 
 
 @router.get("/style-material-link", response_model=List[StyleMaterialLinkResponse])
-async def get_all_style_material_links(
+def get_all_style_material_links(
     style_id: Optional[str] = None,
     skip: int = 0,
     limit: Optional[int] = None,
@@ -1923,7 +1526,7 @@ async def get_all_style_material_links(
 
 
 @router.get("/style-material-link/{style_material_id}", response_model=StyleMaterialLinkResponse)
-async def get_style_material_link(
+def get_style_material_link(
     style_material_id: str,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -1940,7 +1543,7 @@ async def get_style_material_link(
 
 
 @router.put("/style-material-link/{style_material_id}", response_model=StyleMaterialLinkResponse)
-async def update_style_material_link(
+def update_style_material_link(
     style_material_id: str,
     material_link_update: StyleMaterialLinkUpdate,
     db: Session = Depends(get_db_merchandiser)
@@ -1973,7 +1576,7 @@ async def update_style_material_link(
 
 
 @router.delete("/style-material-link/{style_material_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_style_material_link(
+def delete_style_material_link(
     style_material_id: str,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -1997,7 +1600,7 @@ async def delete_style_material_link(
 # ============================================================================
 
 @router.post("/style-color", response_model=StyleColorResponse, status_code=status.HTTP_201_CREATED)
-async def create_style_color(
+def create_style_color(
     style_color: StyleColorCreate,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -2010,7 +1613,7 @@ async def create_style_color(
 
 
 @router.get("/style-color", response_model=List[StyleColorResponse])
-async def get_all_style_colors(
+def get_all_style_colors(
     style_id: Optional[str] = None,
     skip: int = 0,
     limit: Optional[int] = None,
@@ -2026,7 +1629,7 @@ async def get_all_style_colors(
 
 
 @router.get("/style-color/{id}", response_model=StyleColorResponse)
-async def get_style_color(
+def get_style_color(
     id: int,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -2041,7 +1644,7 @@ async def get_style_color(
 
 
 @router.put("/style-color/{id}", response_model=StyleColorResponse)
-async def update_style_color(
+def update_style_color(
     id: int,
     style_color_update: StyleColorUpdate,
     db: Session = Depends(get_db_merchandiser)
@@ -2064,7 +1667,7 @@ async def update_style_color(
 
 
 @router.delete("/style-color/{id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_style_color(
+def delete_style_color(
     id: int,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -2086,7 +1689,7 @@ async def delete_style_color(
 # ============================================================================
 
 @router.post("/style-size", response_model=StyleSizeResponse, status_code=status.HTTP_201_CREATED)
-async def create_style_size(
+def create_style_size(
     style_size: StyleSizeCreate,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -2099,7 +1702,7 @@ async def create_style_size(
 
 
 @router.get("/style-size", response_model=List[StyleSizeResponse])
-async def get_all_style_sizes(
+def get_all_style_sizes(
     style_id: Optional[str] = None,
     skip: int = 0,
     limit: Optional[int] = None,
@@ -2115,7 +1718,7 @@ async def get_all_style_sizes(
 
 
 @router.get("/style-size/{id}", response_model=StyleSizeResponse)
-async def get_style_size(
+def get_style_size(
     id: int,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -2130,7 +1733,7 @@ async def get_style_size(
 
 
 @router.put("/style-size/{id}", response_model=StyleSizeResponse)
-async def update_style_size(
+def update_style_size(
     id: int,
     style_size_update: StyleSizeUpdate,
     db: Session = Depends(get_db_merchandiser)
@@ -2153,7 +1756,7 @@ async def update_style_size(
 
 
 @router.delete("/style-size/{id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_style_size(
+def delete_style_size(
     id: int,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -2175,7 +1778,7 @@ async def delete_style_size(
 # ============================================================================
 
 @router.post("/style-variant/auto-generate", response_model=List[StyleVariantResponse])
-async def auto_generate_style_variants(
+def auto_generate_style_variants(
     request: StyleVariantAutoGenerate,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -2239,7 +1842,7 @@ async def auto_generate_style_variants(
 
 
 @router.post("/style-variant", response_model=StyleVariantResponse, status_code=status.HTTP_201_CREATED)
-async def create_style_variant(
+def create_style_variant(
     style_variant: StyleVariantCreate,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -2261,7 +1864,7 @@ async def create_style_variant(
 
 
 @router.get("/style-variant", response_model=List[StyleVariantResponse])
-async def get_all_style_variants(
+def get_all_style_variants(
     style_id: Optional[str] = None,
     skip: int = 0,
     limit: Optional[int] = None,
@@ -2277,7 +1880,7 @@ async def get_all_style_variants(
 
 
 @router.get("/style-variant/{style_variant_id}", response_model=StyleVariantResponse)
-async def get_style_variant(
+def get_style_variant(
     style_variant_id: str,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -2294,7 +1897,7 @@ async def get_style_variant(
 
 
 @router.put("/style-variant/{style_variant_id}", response_model=StyleVariantResponse)
-async def update_style_variant(
+def update_style_variant(
     style_variant_id: str,
     style_variant_update: StyleVariantUpdate,
     db: Session = Depends(get_db_merchandiser)
@@ -2319,7 +1922,7 @@ async def update_style_variant(
 
 
 @router.delete("/style-variant/{style_variant_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_style_variant(
+def delete_style_variant(
     style_variant_id: str,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -2343,7 +1946,7 @@ async def delete_style_variant(
 # ============================================================================
 
 @router.post("/cm-calculation", response_model=CMCalculationResponse, status_code=status.HTTP_201_CREATED)
-async def create_cm_calculation(
+def create_cm_calculation(
     cm_calc: CMCalculationCreate,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -2383,7 +1986,7 @@ async def create_cm_calculation(
 
 
 @router.get("/cm-calculation", response_model=List[CMCalculationResponse])
-async def get_all_cm_calculations(
+def get_all_cm_calculations(
     style_id: Optional[str] = None,
     skip: int = 0,
     limit: Optional[int] = None,
@@ -2399,7 +2002,7 @@ async def get_all_cm_calculations(
 
 
 @router.get("/cm-calculation/{cm_id}", response_model=CMCalculationResponse)
-async def get_cm_calculation(
+def get_cm_calculation(
     cm_id: str,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -2414,7 +2017,7 @@ async def get_cm_calculation(
 
 
 @router.put("/cm-calculation/{cm_id}", response_model=CMCalculationResponse)
-async def update_cm_calculation(
+def update_cm_calculation(
     cm_id: str,
     cm_calc_update: CMCalculationUpdate,
     db: Session = Depends(get_db_merchandiser)
@@ -2466,7 +2069,7 @@ async def update_cm_calculation(
 
 
 @router.delete("/cm-calculation/{cm_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_cm_calculation(
+def delete_cm_calculation(
     cm_id: str,
     db: Session = Depends(get_db_merchandiser)
 ):
@@ -1,12 +1,30 @@
 """
 Notification Routes
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from typing import List, Optional
-from core.database import get_db_users
+from core.config import settings
+from core.database import SessionLocalUsers, get_db_users
+from core.notification_stream import (
+    REPLAY_LIMIT,
+    STREAM_TICKET_TTL,
+    StreamSnapshot,
+    issue_stream_ticket,
+    notification_event_stream,
+    notification_visible,
+    publish_notifications,
+    publish_unread_change,
+    redeem_stream_ticket
+)
+from core.pagination import keyset_paginate
+from core.principal import get_principal
 from core.security import decode_token
+from core.serialization import row_to_dict
+from core.threadpool import run_blocking
+from core import unread_counts
 from modules.notifications.models.notification import Notification
 from modules.notifications.schemas.notification import (
     NotificationResponse,
@@ -19,25 +37,52 @@ router = APIRouter(tags=["Notifications"])
 
 
 def get_current_user(
-    authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db_users)
+    authorization: Optional[str] = Header(None)
 ) -> User:
     """Dependency to get current authenticated user"""
-    if not authorization or not authorization.startswith("Bearer "):
+    return _user_from_payload(_bearer_payload(authorization))
+
+
+def get_stream_user(
+    authorization: Optional[str] = Header(None),
+    ticket: Optional[str] = Query(None, description="Single-use ticket from POST /stream-ticket (EventSource cannot send headers)")
+) -> User:
+    """Dependency for the SSE stream: Bearer header or ?ticket= from /stream-ticket"""
+    if authorization and authorization.startswith("Bearer "):
+        return _user_from_payload(_bearer_payload(authorization))
+    if not ticket:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated"
         )
     
-    token = authorization.replace("Bearer ", "")
-    payload = decode_token(token)
+    payload = redeem_stream_ticket(ticket)
+    if not payload:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired stream ticket"
+        )
+    return _user_from_payload(payload)
+
+
+def _bearer_payload(authorization: Optional[str]) -> dict:
+    """Decoded claims of a Bearer Authorization header (401 if missing or invalid)"""
+    if not authorization or not authorization.startswith("Bearer "):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated"
+        )
     
+    payload = decode_token(authorization.replace("Bearer ", ""))
     if not payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token"
         )
-    
+    return payload
+
+
+def _user_from_payload(payload: dict) -> User:
     username = payload.get("sub")
     if not username:
         raise HTTPException(
@@ -45,15 +90,28 @@ def get_current_user(
             detail="Invalid token"
         )
     
-    user = db.query(User).filter(User.username == username).first()
+    user = get_principal(payload)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     return user
 
 
+def _visible_to_department(query, department: Optional[str]):
+    """Only notifications for the user's department (or with no target_department, legacy)"""
+    if not department:
+        return query
+    # Match if: target_department contains user's department (case-insensitive)
+    return query.filter(
+        (Notification.target_department == None) | 
+        (func.lower(Notification.target_department).contains(department.lower()))
+    )
+
+
 @router.get("/", response_model=List[NotificationResponse])
 async def get_notifications(
+    response: Response,
+    cursor: Optional[str] = None,
     skip: int = 0,
     limit: Optional[int] = None,
     unread_only: bool = False,
@@ -64,19 +122,14 @@ async def get_notifications(
     query = db.query(Notification).filter(Notification.user_id == current_user.id)
     
     # Filter by department - only show notifications for user's department
-    if current_user.department:
-        # Show notifications that match user's department or have no target_department (legacy)
-        # Match if: target_department contains user's department (case-insensitive)
-        user_dept_lower = current_user.department.lower()
-        query = query.filter(
-            (Notification.target_department == None) | 
-            (func.lower(Notification.target_department).contains(user_dept_lower))
-        )
+    query = _visible_to_department(query, current_user.department)
     
     if unread_only:
         query = query.filter(Notification.is_read == False)
     
-    notifications = query.order_by(Notification.created_at.desc()).offset(skip).limit(limit).all()
+    notifications = keyset_paginate(
+        query, (Notification.created_at, Notification.id), response, cursor, limit, skip
+    )
     return notifications
 
 
@@ -85,22 +138,80 @@ async def get_unread_count(
     db: Session = Depends(get_db_users),
     current_user: User = Depends(get_current_user)
 ):
-    """Get count of unread notifications - filtered by department"""
-    query = db.query(Notification).filter(
-        Notification.user_id == current_user.id,
-        Notification.is_read == False
-    )
+    """Get count of unread notifications - filtered by department (from the per-user counter)"""
+    count = unread_counts.get_unread_count(db, current_user.id, current_user.department)
+    return {"count": count}
+
+
+def _load_stream_snapshot(user_id: int, department: Optional[str], last_event_id: Optional[int]) -> StreamSnapshot:
+    """Unread count and its change sequence, highest id and (on reconnect) missed notifications, in one session"""
+    db = SessionLocalUsers()
+    try:
+        visible = _visible_to_department(
+            db.query(Notification).filter(Notification.user_id == user_id), department
+        )
+        unread_count, count_seq = unread_counts.unread_snapshot(db, user_id, department)
+        high_water = visible.with_entities(func.max(Notification.id)).scalar()
+        
+        missed = []
+        if last_event_id is not None:
+            rows = visible.filter(
+                Notification.id > last_event_id
+            ).order_by(Notification.id).limit(REPLAY_LIMIT + 1).all()
+            missed = [row_to_dict(row, NotificationResponse) for row in rows]
+        return unread_count, count_seq, high_water, missed
+    finally:
+        db.close()
+
+
+@router.post("/stream-ticket", response_model=dict)
+async def create_stream_ticket(authorization: Optional[str] = Header(None)):
+    """
+    Single-use ticket for opening /stream from a browser
+    
+    EventSource cannot send an Authorization header; pass the ticket as
+    /stream?ticket=... within STREAM_TICKET_TTL seconds instead of the
+    access token, which would end up in URLs and access logs.
+    """
+    payload = _bearer_payload(authorization)
+    _user_from_payload(payload)
+    return {"ticket": issue_stream_ticket(payload), "expires_in": STREAM_TICKET_TTL}
+
+
+@router.get("/stream")
+async def stream_notifications(
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    after: Optional[str] = Query(None, description="Last seen notification id, for reconnects that cannot send Last-Event-ID"),
+    current_user: User = Depends(get_stream_user)
+):
+    """
+    Server-sent events with new notifications and unread-count changes
+    
+    Replaces polling /unread-count: the stream starts with the current
+    unread count, then pushes each new notification (SSE id = notification
+    id) and count deltas. Clients reconnect with Last-Event-ID (or ?after=)
+    and get missed notifications replayed. A ticket opens one stream, so
+    browsers fetch a new one from /stream-ticket before reconnecting.
+    """
+    last_event_id = last_event_id or after
+    try:
+        after_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        after_id = None
     
-    # Filter by department - only count notifications for user's department
-    if current_user.department:
-        user_dept_lower = current_user.department.lower()
-        query = query.filter(
-            (Notification.target_department == None) | 
-            (func.lower(Notification.target_department).contains(user_dept_lower))
+    user_id, department = current_user.id, current_user.department
+    
+    async def load_snapshot() -> StreamSnapshot:
+        return await run_blocking(
+            "notifications", settings.NOTIFICATION_DB_THREADS,
+            _load_stream_snapshot, user_id, department, after_id
         )
     
-    count = query.count()
-    return {"count": count}
+    return StreamingResponse(
+        notification_event_stream(user_id, department, load_snapshot),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.put("/{notification_id}/read", response_model=NotificationResponse)
@@ -123,11 +234,17 @@ async def mark_notification_read(
             detail="Notification not found"
         )
     
+    was_unread = not notification.is_read
     notification.is_read = True
     notification.read_at = func.now()
     db.commit()
     db.refresh(notification)
     
+    if was_unread:
+        seq = unread_counts.record_unread([(current_user.id, notification.target_department)], delta=-1)
+        if notification_visible(notification.target_department, current_user.department):
+            publish_unread_change(current_user.id, delta=-1, seq=seq)
+    
     return notification
 
 
@@ -148,6 +265,10 @@ async def mark_all_notifications_read(
     })
     
     db.commit()
+    
+    if updated:
+        seq = unread_counts.reset_unread(current_user.id)
+        publish_unread_change(current_user.id, count=0, seq=seq)
     return {"message": f"{updated} notifications marked as read"}
 
 
@@ -161,5 +282,7 @@ async def create_notification(
     db.add(db_notification)
     db.commit()
     db.refresh(db_notification)
+    seq = unread_counts.record_unread([(db_notification.user_id, db_notification.target_department)])
+    publish_notifications([row_to_dict(db_notification, NotificationResponse)], seq=seq)
     return db_notification
 
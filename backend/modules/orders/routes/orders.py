@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from core.database import get_db_orders
 from core.logging import setup_logging
+from core.config import settings
+from core.pagination import keyset_paginate
 from modules.orders.models.order import OrderManagement
 from modules.orders.schemas.order import OrderCreate, OrderUpdate, OrderResponse
 
@@ -42,13 +44,15 @@ def create_order(order_data: OrderCreate, db: Session = Depends(get_db_orders)):
 
 @router.get("/", response_model=List[OrderResponse])
 def get_orders(
+    response: Response,
     buyer_id: int = None,
     order_status: str = None,
+    cursor: Optional[str] = None,
     skip: int = 0,
     limit: int = 10000,
     db: Session = Depends(get_db_orders)
 ):
-    """Get all orders with optional filters"""
+    """Get all orders with optional filters (newest first, keyset paginated via cursor)"""
     query = db.query(OrderManagement)
     
     if buyer_id:
@@ -56,8 +60,10 @@ def get_orders(
     if order_status:
         query = query.filter(OrderManagement.order_status == order_status)
     
-    orders = query.order_by(OrderManagement.id.desc()).offset(skip).limit(limit).all()
-    return orders
+    return keyset_paginate(
+        query, (OrderManagement.id,), response, cursor, limit, skip,
+        max_limit=settings.PAGINATION_BULK_MAX_LIMIT
+    )
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
@@ -2,6 +2,7 @@ from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Tex
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from core.database import BaseSamples as Base
+from core.outbox import SyncOutboxMixin
 
 
 # =============================================================================
@@ -547,3 +548,8 @@ class GarmentSize(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
+class SyncOutbox(SyncOutboxMixin, Base):
+    """Pending replication events to the other sample database (transactional outbox)"""
+    pass
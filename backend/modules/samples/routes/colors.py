@@ -6,12 +6,19 @@ Handles color management with buyer-specific filtering
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import text, or_
-from typing import List, Optional
-from pydantic import BaseModel
+from typing import List, Literal, Optional, Tuple, Union
+from pydantic import BaseModel, Field
 from core.database import get_db_samples
+from core.cache import cache_response, cached_value, invalidate_cache, CacheTTL
+from core.logging import setup_logging
+from ..services.color_matcher import color_matcher, parse_hex
 
+logger = setup_logging()
 router = APIRouter()
 
+COLOR_COLUMNS = "id, color_name, tcx_code, hex_code, rgb_r, rgb_g, rgb_b, buyer_id, is_general, is_active"
+MIN_TRIGRAM_QUERY = 3  # Shorter queries have no usable trigrams; served from the cached colour scope
+
 
 @router.get("/colors/test")
 async def test_colors_db(db: Session = Depends(get_db_samples)):
@@ -47,6 +54,31 @@ class ColorResponse(BaseModel):
         from_attributes = True
 
 
+class NearestColorMatch(BaseModel):
+    id: int
+    color_name: str
+    tcx_code: Optional[str]
+    hex_code: str
+    rgb_r: int
+    rgb_g: int
+    rgb_b: int
+    buyer_id: Optional[int]
+    is_general: bool
+    delta_e: float
+
+
+class NearestColorResult(BaseModel):
+    query: str  # Query colour as #RRGGBB
+    matches: List[NearestColorMatch]
+
+
+class NearestColorBatchRequest(BaseModel):
+    colors: List[Union[str, Tuple[int, int, int]]] = Field(..., min_length=1, max_length=500)  # Hex strings or [r, g, b]
+    k: int = Field(5, ge=1, le=50)
+    buyer_id: Optional[int] = None
+    metric: Literal["ciede2000", "cie76"] = "ciede2000"
+
+
 class ColorCreate(BaseModel):
     color_name: str
     tcx_code: Optional[str] = None
@@ -59,6 +91,7 @@ class ColorCreate(BaseModel):
 
 
 @router.get("/colors")
+@cache_response(key_prefix="colors", ttl=CacheTTL.LOOKUP_DATA, local_ttl=CacheTTL.LOCAL_MASTER_DATA)
 async def get_colors(
     buyer_id: Optional[int] = Query(None, description="Filter by buyer ID"),
     is_active: bool = Query(True, description="Filter by active status"),
@@ -93,7 +126,6 @@ async def get_colors(
         
         colors = []
         rows = result.fetchall()
-        print(f"DEBUG: Found {len(rows)} colors in database")
         for row in rows:
             color_dict = {
                 "id": row[0],
@@ -108,13 +140,155 @@ async def get_colors(
                 "is_active": row[9]
             }
             colors.append(color_dict)
-        
-        print(f"DEBUG: Returning {len(colors)} colors")
+
         return colors
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch colors: {str(e)}")
 
 
+def _like_pattern(value: str, prefix_only: bool = False) -> str:
+    """ILIKE pattern for a literal search string"""
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%" if prefix_only else f"%{escaped}%"
+
+
+def _load_color_scope(db: Session, buyer_id: Optional[int]) -> List[dict]:
+    """Active colours visible for a buyer (buyer-specific + general), or all when no buyer"""
+    scope = "(buyer_id = :buyer_id OR is_general = TRUE) AND " if buyer_id else ""
+    rows = db.execute(text(f"""
+        SELECT {COLOR_COLUMNS}
+        FROM color_master
+        WHERE {scope}is_active = TRUE
+        ORDER BY color_name
+    """), {"buyer_id": buyer_id}).mappings().all()
+    return [dict(row) for row in rows]
+
+
+def _search_color_scope(db: Session, q: str, buyer_id: Optional[int], limit: int) -> List[dict]:
+    """Short-query typeahead over the buyer's cached colour scope"""
+    scope = cached_value(
+        "colors", f"scope:{buyer_id or 'all'}", lambda: _load_color_scope(db, buyer_id),
+        ttl=CacheTTL.LOOKUP_DATA, local_ttl=CacheTTL.LOCAL_MASTER_DATA
+    )
+    needle = q.lower()
+    ranked = []
+    for color in scope:
+        name, tcx = color["color_name"].lower(), (color["tcx_code"] or "").lower()
+        if name.startswith(needle) or tcx.startswith(needle):
+            ranked.append((0, color))
+        elif any(word.startswith(needle) for word in name.split()):
+            ranked.append((1, color))
+    ranked.sort(key=lambda item: item[0])  # stable: keeps name order within a rank
+    return [color for _, color in ranked[:limit]]
+
+
+@router.get("/colors/search", response_model=List[ColorResponse])
+@cache_response(key_prefix="colors", ttl=CacheTTL.LOOKUP_DATA, local_ttl=CacheTTL.LOCAL_MASTER_DATA)
+def search_colors(
+    q: str = Query(..., min_length=1, max_length=100, description="Colour name or TCX code"),
+    buyer_id: Optional[int] = Query(None, description="Search buyer-specific + general colours"),
+    fuzzy: bool = Query(True, description="Also match misspelled names (trigram similarity)"),
+    limit: int = Query(20, ge=1, le=50, description="Maximum results"),
+    db: Session = Depends(get_db_samples)
+):
+    """
+    Typeahead search over active colours by name and TCX code
+    Prefix matches first, then substring, then fuzzy matches (pg_trgm indexes)
+    """
+    q = q.strip()
+    if not q:
+        return []
+    if len(q) < MIN_TRIGRAM_QUERY:
+        return _search_color_scope(db, q, buyer_id, limit)
+
+    try:
+        match = "color_name ILIKE :contains OR tcx_code ILIKE :contains"
+        if fuzzy:
+            match += " OR :q <% color_name"
+        scope = "(buyer_id = :buyer_id OR is_general = TRUE) AND " if buyer_id else ""
+        query = text(f"""
+            SELECT {COLOR_COLUMNS}
+            FROM color_master
+            WHERE {scope}is_active = TRUE
+              AND ({match})
+            ORDER BY
+                CASE
+                    WHEN color_name ILIKE :prefix OR tcx_code ILIKE :prefix THEN 0
+                    WHEN color_name ILIKE :contains OR tcx_code ILIKE :contains THEN 1
+                    ELSE 2
+                END,
+                word_similarity(:q, color_name) DESC,
+                color_name
+            LIMIT :limit
+        """)
+        rows = db.execute(query, {
+            "q": q,
+            "prefix": _like_pattern(q, prefix_only=True),
+            "contains": _like_pattern(q),
+            "buyer_id": buyer_id,
+            "limit": limit
+        }).mappings().all()
+        return [dict(row) for row in rows]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to search colors: {str(e)}")
+
+
+def _query_rgb(value: Union[str, Tuple[int, int, int]]) -> Tuple[int, int, int]:
+    """Hex string or (r, g, b) -> validated (r, g, b); 400 on bad input"""
+    try:
+        rgb = parse_hex(value) if isinstance(value, str) else tuple(value)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if any(not 0 <= channel <= 255 for channel in rgb):
+        raise HTTPException(status_code=400, detail=f"RGB values must be 0-255, got {list(rgb)}")
+    return rgb
+
+
+def _as_hex(rgb: Tuple[int, int, int]) -> str:
+    return "#{:02X}{:02X}{:02X}".format(*rgb)
+
+
+@router.get("/nearest", response_model=NearestColorResult)
+def get_nearest_colors(
+    hex: Optional[str] = Query(None, description="Colour to match, e.g. #1A2B3C"),
+    r: Optional[int] = Query(None, ge=0, le=255),
+    g: Optional[int] = Query(None, ge=0, le=255),
+    b: Optional[int] = Query(None, ge=0, le=255),
+    k: int = Query(5, ge=1, le=50, description="Number of matches"),
+    buyer_id: Optional[int] = Query(None, description="Match buyer-specific + general colours only"),
+    metric: Literal["ciede2000", "cie76"] = Query("ciede2000", description="Delta-E formula"),
+    db: Session = Depends(get_db_samples)
+):
+    """
+    Find the closest colours to a hex or RGB value by Delta-E in CIELAB
+    Served from an in-memory index of active colours (no per-request scan of the table)
+    Sync handler: an index rebuild queries the database in the threadpool, not on the event loop
+    """
+    if hex is not None:
+        rgb = _query_rgb(hex)
+    elif None not in (r, g, b):
+        rgb = (r, g, b)
+    else:
+        raise HTTPException(status_code=400, detail="Provide hex or all of r, g, b")
+
+    matches = color_matcher.index(db).nearest([rgb], k=k, buyer_id=buyer_id, metric=metric)[0]
+    return {"query": _as_hex(rgb), "matches": matches}
+
+
+@router.post("/nearest/batch", response_model=List[NearestColorResult])
+def get_nearest_colors_batch(request: NearestColorBatchRequest, db: Session = Depends(get_db_samples)):
+    """
+    Match a whole palette in one call (vectorized Delta-E over all colours)
+    Sync handler: the CPU work runs in the threadpool, not on the event loop
+    """
+    palette = [_query_rgb(value) for value in request.colors]
+    matches = color_matcher.index(db).nearest(palette, k=request.k, buyer_id=request.buyer_id, metric=request.metric)
+    return [
+        {"query": _as_hex(rgb), "matches": color_matches}
+        for rgb, color_matches in zip(palette, matches)
+    ]
+
+
 @router.get("/colors/{color_id}", response_model=ColorResponse)
 async def get_color(color_id: int, db: Session = Depends(get_db_samples)):
     """Get a specific color by ID"""
@@ -185,6 +359,7 @@ async def create_color(color: ColorCreate, db: Session = Depends(get_db_samples)
             "is_general": color.is_general
         })
         db.commit()
+        invalidate_cache("colors:*")
         
         row = result.fetchone()
         return {
@@ -241,6 +416,7 @@ async def update_color(
             "is_general": color.is_general
         })
         db.commit()
+        invalidate_cache("colors:*")
         
         row = result.fetchone()
         if not row:
@@ -278,6 +454,7 @@ async def delete_color(color_id: int, db: Session = Depends(get_db_samples)):
         
         result = db.execute(query, {"color_id": color_id})
         db.commit()
+        invalidate_cache("colors:*")
         
         if not result.fetchone():
             raise HTTPException(status_code=404, detail="Color not found")
@@ -509,10 +686,11 @@ async def seed_pantone_tcx_colors(db: Session = Depends(get_db_samples)):
                     })
                     inserted += 1
             except Exception as e:
-                print(f"Failed to process color {color_name}: {e}")
+                logger.warning(f"Failed to process color {color_name}: {e}")
                 continue
         
         db.commit()
+        invalidate_cache("colors:*")
         
         # Get total count
         result = db.execute(text("SELECT COUNT(*) FROM color_master WHERE is_general = TRUE"))
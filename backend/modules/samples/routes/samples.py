@@ -1,8 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.orm import Session, joinedload, selectinload
 from typing import List, Optional
 from core.database import get_db_samples
 from core.logging import setup_logging
+from core.config import settings
+from core.pagination import keyset_paginate
+from core.serialization import trusted_rows_response
+from core.outbox import enqueue_event
+from core.services.id_allocator import id_allocator
+from core.services.sync_service import SAMPLE_REQUEST_UPDATED, SAMPLE_STATUS_SYNCED
 from modules.workflows.models.workflow import SampleWorkflow
 from modules.samples.models.sample import (
     # Style models
@@ -12,7 +18,7 @@ from modules.samples.models.sample import (
     GarmentColor, GarmentSize,
     # Sample core (NEW)
     SampleRequest, SamplePlan, SampleRequiredMaterial,
-    SampleOperation, SampleTNA, SampleStatus,
+    SampleOperation, SampleTNA, SampleStatus, SyncOutbox,
     # Style variant materials & SMV
     StyleVariantMaterial, SMVCalculation,
     # Legacy (deprecated)
@@ -29,7 +35,7 @@ from modules.samples.schemas.sample import (
     GarmentColorCreate, GarmentColorUpdate, GarmentColorResponse,
     GarmentSizeCreate, GarmentSizeUpdate, GarmentSizeResponse,
     # Sample core schemas (NEW)
-    SampleRequestCreate, SampleRequestUpdate, SampleRequestResponse,
+    SampleRequestCreate, SampleRequestUpdate, SampleRequestResponse, SampleRequestListResponse,
     SamplePlanCreate, SamplePlanUpdate, SamplePlanResponse,
     SampleRequiredMaterialCreate, SampleRequiredMaterialUpdate, SampleRequiredMaterialResponse,
     SampleOperationCreate, SampleOperationUpdate, SampleOperationResponse,
@@ -196,25 +202,44 @@ def delete_manufacturing_operation(op_id: int, db: Session = Depends(get_db_samp
 # SAMPLE REQUEST ENDPOINTS (NEW - Primary Sample Info)
 # =============================================================================
 
-def generate_sample_id(db: Session) -> str:
-    """Generate a unique sample ID like SMP-YYYYMMDD-XXXX"""
-    today = datetime.now().strftime("%Y%m%d")
-    prefix = f"SMP-{today}-"
+# Loader strategies for SampleRequest reads: joinedload only for many-to-one/one-to-one
+# relations, selectinload for collections so children are fetched in one batched
+# IN query each instead of multiplying rows in a single Cartesian-product SELECT
+SAMPLE_REQUEST_LIST_LOAD_OPTIONS = (
+    joinedload(SampleRequest.style),
+    selectinload(SampleRequest.workflows).selectinload(SampleWorkflow.cards),  # Needed for workflow_status (Requirements 10.2, 10.3)
+)
+
+SAMPLE_REQUEST_DETAIL_LOAD_OPTIONS = (
+    joinedload(SampleRequest.style),
+    joinedload(SampleRequest.plan).joinedload(SamplePlan.machine),
+    selectinload(SampleRequest.required_materials),
+    selectinload(SampleRequest.operations),
+    selectinload(SampleRequest.tna_items),
+    selectinload(SampleRequest.status_history),
+    selectinload(SampleRequest.workflows).selectinload(SampleWorkflow.cards),  # Load workflow data (Requirements 10.2, 10.3)
+)
 
-    # Find the highest number for today
-    last_sample = db.query(SampleRequest).filter(
+
+def _last_sample_number(db: Session, prefix: str) -> int:
+    """Highest number already used under a sample ID prefix (seeds a new day's series)"""
+    last_sample = db.query(SampleRequest.sample_id).filter(
         SampleRequest.sample_id.like(f"{prefix}%")
     ).order_by(SampleRequest.sample_id.desc()).first()
 
     if last_sample:
         try:
-            last_num = int(last_sample.sample_id.split("-")[-1])
-            new_num = last_num + 1
+            return int(last_sample.sample_id.split("-")[-1])
         except (ValueError, IndexError, AttributeError):
-            new_num = 1
-    else:
-        new_num = 1
+            pass
+    return 0
+
 
+def generate_sample_id(db: Session) -> str:
+    """Generate a unique sample ID like SMP-YYYYMMDD-XXXX (per-day series from the ID allocator)"""
+    today = datetime.now().strftime("%Y%m%d")
+    prefix = f"SMP-{today}-"
+    new_num = id_allocator.next_number("SAMPLE_REQUEST", today, seed=lambda: _last_sample_number(db, prefix))
     return f"{prefix}{new_num:04d}"
 
 
@@ -239,25 +264,19 @@ def create_sample_request(request_data: SampleRequestCreate, db: Session = Depen
         raise HTTPException(status_code=500, detail=f"Failed to create sample request: {str(e)}")
 
 
-@router.get("/requests", response_model=List[SampleRequestResponse])
+@router.get("/requests", response_model=List[SampleRequestListResponse])
 def get_sample_requests(
+    response: Response,
     buyer_id: Optional[int] = None,
     sample_category: Optional[str] = None,
     current_status: Optional[str] = None,
+    cursor: Optional[str] = None,
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=100, ge=1, le=1000),
     db: Session = Depends(get_db_samples)
 ):
-    """Get all sample requests with optional filters"""
-    query = db.query(SampleRequest).options(
-        joinedload(SampleRequest.style),
-        joinedload(SampleRequest.plan).joinedload(SamplePlan.machine),
-        joinedload(SampleRequest.required_materials),
-        joinedload(SampleRequest.operations),
-        joinedload(SampleRequest.tna_items),
-        joinedload(SampleRequest.status_history),
-        joinedload(SampleRequest.workflows).joinedload(SampleWorkflow.cards)  # Load workflow data (Requirements 10.2, 10.3)
-    )
+    """Get all sample requests with optional filters (slim rows, use /requests/{id} for children)"""
+    query = db.query(SampleRequest).options(*SAMPLE_REQUEST_LIST_LOAD_OPTIONS)
 
     if buyer_id:
         query = query.filter(SampleRequest.buyer_id == buyer_id)
@@ -266,27 +285,22 @@ def get_sample_requests(
     if current_status:
         query = query.filter(SampleRequest.current_status == current_status)
 
-    results = query.order_by(SampleRequest.id.desc()).offset(skip).limit(limit).all()
+    results = keyset_paginate(
+        query, (SampleRequest.id,), response, cursor, limit, skip,
+        max_limit=settings.PAGINATION_BULK_MAX_LIMIT
+    )
     
     # Add workflow status to each result (Requirements 10.2, 10.3)
     for request in results:
         request.workflow_status = request.current_workflow_status
     
-    return results
+    return trusted_rows_response(results, SampleRequestListResponse, response)
 
 
 @router.get("/requests/by-sample-id/{sample_id}", response_model=SampleRequestResponse)
 def get_sample_request_by_sample_id(sample_id: str, db: Session = Depends(get_db_samples)):
     """Get a sample request by its sample_id string"""
-    request = db.query(SampleRequest).options(
-        joinedload(SampleRequest.style),
-        joinedload(SampleRequest.plan).joinedload(SamplePlan.machine),
-        joinedload(SampleRequest.required_materials),
-        joinedload(SampleRequest.operations),
-        joinedload(SampleRequest.tna_items),
-        joinedload(SampleRequest.status_history),
-        joinedload(SampleRequest.workflows).joinedload(SampleWorkflow.cards)  # Load workflow data (Requirements 10.2, 10.3)
-    ).filter(SampleRequest.sample_id == sample_id).first()
+    request = db.query(SampleRequest).options(*SAMPLE_REQUEST_DETAIL_LOAD_OPTIONS).filter(SampleRequest.sample_id == sample_id).first()
 
     if not request:
         raise HTTPException(status_code=404, detail="Sample request not found")
@@ -299,15 +313,7 @@ def get_sample_request_by_sample_id(sample_id: str, db: Session = Depends(get_db
 @router.get("/requests/{request_id}", response_model=SampleRequestResponse)
 def get_sample_request(request_id: int, db: Session = Depends(get_db_samples)):
     """Get a specific sample request by ID"""
-    request = db.query(SampleRequest).options(
-        joinedload(SampleRequest.style),
-        joinedload(SampleRequest.plan).joinedload(SamplePlan.machine),
-        joinedload(SampleRequest.required_materials),
-        joinedload(SampleRequest.operations),
-        joinedload(SampleRequest.tna_items),
-        joinedload(SampleRequest.status_history),
-        joinedload(SampleRequest.workflows).joinedload(SampleWorkflow.cards)  # Load workflow data (Requirements 10.2, 10.3)
-    ).filter(SampleRequest.id == request_id).first()
+    request = db.query(SampleRequest).options(*SAMPLE_REQUEST_DETAIL_LOAD_OPTIONS).filter(SampleRequest.id == request_id).first()
 
     if not request:
         raise HTTPException(status_code=404, detail="Sample request not found")
@@ -329,6 +335,13 @@ def update_sample_request(request_id: int, request_data: SampleRequestUpdate, db
         for key, value in update_data.items():
             setattr(request, key, value)
 
+        # Replicated to SamplePrimaryInfo by the outbox relay (BIDIRECTIONAL SYNC)
+        sync_data = dict(update_data)
+        if 'techpack_url' in update_data or 'techpack_filename' in update_data:
+            sync_data['techpack_url'] = request.techpack_url
+            sync_data['techpack_filename'] = request.techpack_filename
+        enqueue_event(db, SyncOutbox, SAMPLE_REQUEST_UPDATED, request.sample_id, sync_data)
+
         db.commit()
         db.refresh(request)
     except Exception as e:
@@ -339,180 +352,20 @@ def update_sample_request(request_id: int, request_data: SampleRequestUpdate, db
             detail=f"Failed to update sample request: {str(e)}"
         )
     
-    # Sync update to SamplePrimaryInfo in merchandiser database (BIDIRECTIONAL SYNC)
+    # Notify merchandising department (one INSERT ... SELECT fan-out in the background)
     try:
-        from core.database import SessionLocalMerchandiser
-        from modules.merchandiser.models.merchandiser import SamplePrimaryInfo
-        from core.services.buyer_service import BuyerService
-        
-        merchandiser_db = SessionLocalMerchandiser()
-        try:
-            sample_primary = merchandiser_db.query(SamplePrimaryInfo).filter(
-                SamplePrimaryInfo.sample_id == request.sample_id
-            ).first()
-            
-            if sample_primary:
-                # Get buyer name if buyer_id changed
-                if 'buyer_id' in update_data:
-                    buyer_service = BuyerService()
-                    buyer_name = None
-                    try:
-                        buyer_info = buyer_service.get_by_id(update_data['buyer_id'])
-                        if buyer_info:
-                            buyer_name = buyer_info.get("buyer_name")
-                    except (KeyError, ValueError, AttributeError) as buyer_error:
-                        logger.warning(f"Could not fetch buyer name for buyer_id {update_data['buyer_id']}: {buyer_error}")
-                        pass
-                    if buyer_name:
-                        sample_primary.buyer_name = buyer_name
-                    sample_primary.buyer_id = update_data['buyer_id']
-                
-                # Update all matching fields (map SampleRequest to SamplePrimaryInfo)
-                if 'sample_name' in update_data:
-                    sample_primary.sample_name = update_data['sample_name']
-                if 'item' in update_data:
-                    sample_primary.item = update_data['item']
-                if 'gauge' in update_data:
-                    sample_primary.gauge = update_data['gauge']
-                if 'ply' in update_data:
-                    # SampleRequest has ply as int, SamplePrimaryInfo has it as string
-                    sample_primary.ply = str(update_data['ply']) if update_data['ply'] is not None else None
-                if 'sample_category' in update_data:
-                    sample_primary.sample_category = update_data['sample_category']
-                if 'color_ids' in update_data:
-                    # SampleRequest has color_ids as List[int], SamplePrimaryInfo has it as JSON
-                    sample_primary.color_ids = update_data['color_ids']
-                    # Also set color_id (first one) for backward compatibility
-                    if update_data['color_ids'] and len(update_data['color_ids']) > 0:
-                        sample_primary.color_id = str(update_data['color_ids'][0])
-                if 'color_name' in update_data:
-                    sample_primary.color_name = update_data['color_name']
-                if 'size_ids' in update_data:
-                    # SampleRequest has size_ids as List[str], SamplePrimaryInfo has it as JSON
-                    sample_primary.size_ids = update_data['size_ids']
-                    # Also set size_id (first one) for backward compatibility
-                    if update_data['size_ids'] and len(update_data['size_ids']) > 0:
-                        sample_primary.size_id = update_data['size_ids'][0]
-                if 'size_name' in update_data:
-                    sample_primary.size_name = update_data['size_name']
-                if 'yarn_ids' in update_data:
-                    # SampleRequest has yarn_ids as List[str], SamplePrimaryInfo has it as JSON
-                    sample_primary.yarn_ids = update_data['yarn_ids']
-                    # Also set yarn_id (first one) for backward compatibility
-                    if update_data['yarn_ids'] and len(update_data['yarn_ids']) > 0:
-                        sample_primary.yarn_id = update_data['yarn_ids'][0]
-                if 'yarn_id' in update_data:
-                    sample_primary.yarn_id = update_data['yarn_id']
-                    # Also update yarn_ids array if yarn_id is set (but yarn_ids takes precedence)
-                    if 'yarn_ids' not in update_data and update_data['yarn_id']:
-                        sample_primary.yarn_ids = [update_data['yarn_id']]
-                if 'yarn_details' in update_data:
-                    sample_primary.yarn_details = update_data['yarn_details']
-                if 'trims_ids' in update_data:
-                    # SampleRequest has trims_ids as List[str], SamplePrimaryInfo also has it as JSON
-                    sample_primary.trims_ids = update_data['trims_ids']
-                if 'trims_details' in update_data:
-                    sample_primary.trims_details = update_data['trims_details']
-                if 'decorative_part' in update_data:
-                    # SampleRequest has decorative_part as string (comma-separated), SamplePrimaryInfo has it as JSON array
-                    decorative_part = update_data['decorative_part']
-                    if isinstance(decorative_part, str):
-                        # Convert comma-separated string to array
-                        sample_primary.decorative_part = [p.strip() for p in decorative_part.split(',') if p.strip()] if decorative_part else None
-                    elif isinstance(decorative_part, list):
-                        sample_primary.decorative_part = decorative_part
-                    else:
-                        sample_primary.decorative_part = None
-                if 'yarn_handover_date' in update_data:
-                    sample_primary.yarn_handover_date = update_data['yarn_handover_date']
-                if 'trims_handover_date' in update_data:
-                    sample_primary.trims_handover_date = update_data['trims_handover_date']
-                if 'required_date' in update_data:
-                    sample_primary.required_date = update_data['required_date']
-                if 'request_pcs' in update_data:
-                    sample_primary.request_pcs = update_data['request_pcs']
-                if 'additional_instruction' in update_data:
-                    # SampleRequest has additional_instruction as string (newline-separated with ✓ markers),
-                    # SamplePrimaryInfo has it as JSON array of objects
-                    additional_instruction = update_data['additional_instruction']
-                    if isinstance(additional_instruction, str):
-                        # Parse newline-separated string with optional ✓ markers
-                        lines = additional_instruction.split('\n')
-                        instructions = []
-                        for line in lines:
-                            trimmed = line.strip()
-                            if not trimmed:
-                                continue
-                            done = trimmed.startswith('✓')
-                            instruction_text = trimmed[1:].strip() if done else trimmed
-                            instructions.append({'instruction': instruction_text, 'done': done})
-                        sample_primary.additional_instruction = instructions if instructions else None
-                    elif isinstance(additional_instruction, list):
-                        sample_primary.additional_instruction = additional_instruction
-                    else:
-                        sample_primary.additional_instruction = None
-                if 'techpack_url' in update_data or 'techpack_filename' in update_data:
-                    # SampleRequest has techpack_url/filename as separate fields,
-                    # SamplePrimaryInfo has techpack_files as JSON array
-                    techpack_url = update_data.get('techpack_url') or request.techpack_url
-                    techpack_filename = update_data.get('techpack_filename') or request.techpack_filename
-                    if techpack_url or techpack_filename:
-                        sample_primary.techpack_files = [{
-                            'url': techpack_url or '',
-                            'filename': techpack_filename or '',
-                            'type': 'file'
-                        }]
-                    else:
-                        sample_primary.techpack_files = None
-                
-                try:
-                    merchandiser_db.commit()
-                    logger.info(f"✅ Successfully synced sample request update for sample_id {request.sample_id} to merchandiser database")
-                except Exception as commit_error:
-                    merchandiser_db.rollback()
-                    logger.error(f"Failed to commit sync to merchandiser database for sample_id {request.sample_id}: {str(commit_error)}", exc_info=True)
-                    raise
-        finally:
-            merchandiser_db.close()
-    except (HTTPException, ValueError, AttributeError, KeyError) as sync_error:
-        # Log error but don't fail the samples update for sync issues
-        logger.warning(f"Failed to sync sample request update to merchandiser database for sample_id {request.sample_id}: {str(sync_error)}", exc_info=True)
-    except Exception as sync_error:
-        # Log unexpected errors but don't fail the samples update
-        logger.error(f"Unexpected error syncing to merchandiser database for sample_id {request.sample_id}: {str(sync_error)}", exc_info=True)
-    
-    # Create notifications for all merchandiser department users
-    try:
-        from core.database import SessionLocalUsers
-        from modules.notifications.models.notification import Notification
-        from modules.users.models.user import User
-        
-        users_db = SessionLocalUsers()
-        try:
-            # Get all users in the merchandiser department
-            merchandiser_users = users_db.query(User).filter(
-                User.department.ilike("%merchandis%")
-            ).all()
-            
-            # Create a notification for each merchandiser department user
-            for user in merchandiser_users:
-                notification = Notification(
-                    user_id=user.id,
-                    title="Sample Request Updated",
-                    message=f"Sample request has been updated by Sample Department - Sample ID: {request.sample_id}",
-                    type="info",
-                    related_entity_type="sample_request",
-                    related_entity_id=request.sample_id,
-                    target_department="Merchandiser"  # Only visible to Merchandiser department
-                )
-                users_db.add(notification)
-            
-            users_db.commit()
-        finally:
-            users_db.close()
+        from core.notification_service import send_notification_to_department_background
+        send_notification_to_department_background(
+            title="Sample Request Updated",
+            message=f"Sample request has been updated by Sample Department - Sample ID: {request.sample_id}",
+            target_department="merchandising",
+            notification_type="info",
+            related_entity_type="sample_request",
+            related_entity_id=request.sample_id
+        )
     except Exception as notify_error:
         # Log error but don't fail the update
-        logger.warning(f"Failed to create notifications for sample update: {str(notify_error)}")
+        logger.warning(f"Failed to send notifications for sample update: {str(notify_error)}")
     
     return request
 
@@ -814,8 +667,6 @@ def create_sample_status(status_data: SampleStatusCreate, db: Session = Depends(
     try:
         new_status = SampleStatus(**status_data.model_dump())
         db.add(new_status)
-        db.commit()
-        db.refresh(new_status)
 
         # Get the sample request for syncing
         request = db.query(SampleRequest).filter(
@@ -826,55 +677,32 @@ def create_sample_status(status_data: SampleStatusCreate, db: Session = Depends(
             # Update current_status on the sample request
             if status_data.status_by_sample or status_data.status_from_merchandiser:
                 request.current_status = status_data.status_by_sample or status_data.status_from_merchandiser
-                db.commit()
-            
-            # Auto-sync to merchandiser module
-            try:
-                from core.database import SessionLocalMerchandiser
-                from modules.merchandiser.models.merchandiser import SampleStatus as MerchandiserSampleStatus
-                
-                logger.info(f"Starting sync to merchandiser database for sample_id: {request.sample_id}, sample_request_id: {status_data.sample_request_id}")
-                
-                merchandiser_db = SessionLocalMerchandiser()
-                try:
-                    # Check if status record already exists in merchandiser database
-                    existing_status = merchandiser_db.query(MerchandiserSampleStatus).filter(
-                        MerchandiserSampleStatus.sample_id == request.sample_id
-                    ).order_by(MerchandiserSampleStatus.created_at.desc()).first()
-                    
-                    if existing_status:
-                        # Update existing status record
-                        existing_status.status_by_sample = status_data.status_by_sample
-                        existing_status.notes = status_data.notes
-                        if status_data.updated_by:
-                            existing_status.updated_by = status_data.updated_by
-                        if hasattr(status_data, 'expecting_end_date') and status_data.expecting_end_date:
-                            existing_status.expecting_end_date = status_data.expecting_end_date
-                        merchandiser_db.commit()
-                        logger.info(f"✅ Updated existing sample status in merchandiser database for sample_id {request.sample_id}")
-                    else:
-                        # Create new status record in merchandiser database
-                        new_merchandiser_status = MerchandiserSampleStatus(
-                            sample_id=request.sample_id,
-                            status_by_sample=status_data.status_by_sample,
-                            status_from_merchandiser=status_data.status_from_merchandiser,
-                            notes=status_data.notes,
-                            updated_by=status_data.updated_by,
-                            expecting_end_date=getattr(status_data, 'expecting_end_date', None)
-                        )
-                        merchandiser_db.add(new_merchandiser_status)
-                        merchandiser_db.commit()
-                        logger.info(f"✅ Created new sample status in merchandiser database for sample_id {request.sample_id}")
-                finally:
-                    merchandiser_db.close()
-            except Exception as sync_error:
-                logger.error(f"❌ Failed to sync sample status to merchandiser database for sample_id {request.sample_id}: {str(sync_error)}", exc_info=True)
-                # Don't fail the request if sync fails
-            
+
+            # Auto-sync to merchandiser module (outbox relay, same transaction)
+            fields = {'status_by_sample': status_data.status_by_sample, 'notes': status_data.notes}
+            if status_data.updated_by:
+                fields['updated_by'] = status_data.updated_by
+            if status_data.expecting_end_date:
+                fields['expecting_end_date'] = status_data.expecting_end_date
+            enqueue_event(db, SyncOutbox, SAMPLE_STATUS_SYNCED, request.sample_id, {
+                "fields": fields,
+                "create": {
+                    'status_by_sample': status_data.status_by_sample,
+                    'status_from_merchandiser': status_data.status_from_merchandiser,
+                    'notes': status_data.notes,
+                    'updated_by': status_data.updated_by,
+                    'expecting_end_date': status_data.expecting_end_date,
+                },
+            })
+
+        db.commit()
+        db.refresh(new_status)
+
+        if request:
             # Send notification to merchandising department
             try:
-                from core.notification_service import send_notification_to_department
-                send_notification_to_department(
+                from core.notification_service import send_notification_to_department_background
+                send_notification_to_department_background(
                     title="Sample Status Created",
                     message=f"Sample status for {request.sample_id} has been created by Sample Department",
                     target_department="merchandising",
@@ -921,6 +749,23 @@ def update_sample_status(status_id: int, status_data: SampleStatusUpdate, db: Se
     for key, value in update_data.items():
         setattr(status_record, key, value)
 
+    # Auto-sync to merchandiser module (outbox relay, same transaction)
+    request = db.query(SampleRequest).filter(SampleRequest.id == sample_request_id).first()
+    if request:
+        sync_fields = ['status_by_sample', 'notes', 'updated_by', 'expecting_end_date']
+        enqueue_event(db, SyncOutbox, SAMPLE_STATUS_SYNCED, request.sample_id, {
+            "fields": {key: update_data[key] for key in sync_fields if key in update_data},
+            "create": {
+                'status_by_sample': status_record.status_by_sample,
+                'status_from_merchandiser': status_record.status_from_merchandiser,
+                'notes': status_record.notes,
+                'updated_by': status_record.updated_by,
+                'expecting_end_date': status_record.expecting_end_date,
+            },
+        })
+    else:
+        logger.warning(f"SampleRequest not found for sample_request_id {sample_request_id} - sync skipped")
+
     try:
         db.commit()
         db.refresh(status_record)
@@ -932,83 +777,10 @@ def update_sample_status(status_id: int, status_data: SampleStatusUpdate, db: Se
             detail=f"Failed to update sample status: {str(commit_error)}"
         )
     
-    # Auto-sync to merchandiser module
-    try:
-        from core.database import SessionLocalMerchandiser
-        from modules.samples.models.sample import SampleRequest
-        from modules.merchandiser.models.merchandiser import SampleStatus as MerchandiserSampleStatus
-        
-        # Get the SampleRequest to get sample_id
-        request = db.query(SampleRequest).filter(SampleRequest.id == sample_request_id).first()
-        
-        if request:
-            logger.info(f"Starting sync to merchandiser database for sample_id: {request.sample_id}, status_id: {status_id}")
-            
-            merchandiser_db = SessionLocalMerchandiser()
-            try:
-                # Find existing status record in merchandiser database
-                existing_status = merchandiser_db.query(MerchandiserSampleStatus).filter(
-                    MerchandiserSampleStatus.sample_id == request.sample_id
-                ).order_by(MerchandiserSampleStatus.created_at.desc()).first()
-                
-                if existing_status:
-                    # Update existing status record - update fields that come from samples
-                    has_changes = False
-                    if 'status_by_sample' in update_data:
-                        existing_status.status_by_sample = update_data['status_by_sample']
-                        has_changes = True
-                    if 'notes' in update_data:
-                        existing_status.notes = update_data['notes']
-                        has_changes = True
-                    if 'updated_by' in update_data:
-                        existing_status.updated_by = update_data['updated_by']
-                        has_changes = True
-                    if 'expecting_end_date' in update_data:
-                        existing_status.expecting_end_date = update_data['expecting_end_date']
-                        has_changes = True
-                    
-                    if has_changes:
-                        try:
-                            merchandiser_db.commit()
-                            merchandiser_db.refresh(existing_status)
-                            logger.info(f"✅ Updated existing sample status in merchandiser database for sample_id {request.sample_id}")
-                        except Exception as sync_error:
-                            merchandiser_db.rollback()
-                            logger.error(f"Failed to sync status update to merchandiser: {str(sync_error)}", exc_info=True)
-                            # Don't fail the request - samples update succeeded
-                    else:
-                        logger.info(f"No changes to sync for sample_id {request.sample_id}")
-                else:
-                    # Create new status record in merchandiser database if it doesn't exist
-                    new_merchandiser_status = MerchandiserSampleStatus(
-                        sample_id=request.sample_id,
-                        status_by_sample=status_record.status_by_sample,
-                        status_from_merchandiser=status_record.status_from_merchandiser,
-                        notes=status_record.notes,
-                        updated_by=status_record.updated_by,
-                        expecting_end_date=status_record.expecting_end_date
-                    )
-                    merchandiser_db.add(new_merchandiser_status)
-                    try:
-                        merchandiser_db.commit()
-                        merchandiser_db.refresh(new_merchandiser_status)
-                        logger.info(f"✅ Created new sample status in merchandiser database for sample_id {request.sample_id}")
-                    except Exception as sync_error:
-                        merchandiser_db.rollback()
-                        logger.error(f"Failed to create status in merchandiser: {str(sync_error)}", exc_info=True)
-                        # Don't fail the request - samples update succeeded
-            finally:
-                merchandiser_db.close()
-        else:
-            logger.warning(f"SampleRequest not found for sample_request_id {sample_request_id} - sync skipped")
-    except Exception as sync_error:
-        logger.error(f"Failed to sync sample status update to merchandiser: {str(sync_error)}", exc_info=True)
-        # Don't fail the request if sync fails - samples update succeeded
-    
     # Send notification to merchandising department
     try:
-        from core.notification_service import send_notification_to_department
-        send_notification_to_department(
+        from core.notification_service import send_notification_to_department_background
+        send_notification_to_department_background(
             title="Sample Status Updated",
             message=f"Sample status for {request.sample_id if request else 'Unknown'} has been updated by Sample Department",
             target_department="merchandising",
@@ -10,6 +10,8 @@ from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
 from core.database import get_db_samples
 from core.services.buyer_service import buyer_service
+from core.services.id_allocator import id_allocator
+from core.cache import cache_response, invalidate_cache, CacheTTL
 import json
 import re
 
@@ -102,6 +104,7 @@ async def enhance_size_chart_schema(db: Session = Depends(get_db_samples)):
                 pass
         
         db.commit()
+        invalidate_cache("product_types:*")
         
         return {
             "message": "Size chart schema enhanced successfully",
@@ -163,6 +166,7 @@ async def update_product_types(db: Session = Depends(get_db_samples)):
             updated += 1
         
         db.commit()
+        invalidate_cache("product_types:*")
         
         return {
             "message": "Product types updated successfully",
@@ -216,30 +220,30 @@ async def generate_size_chart_id(
         # Clean: remove special chars, keep only alphanumeric and underscores
         product_type_3_words = re.sub(r'[^A-Z0-9_]', '', product_type_3_words)
         
-        # Get counter - must be unique across ALL size charts (not filtered by profile/product_type/gender)
-        # Find the highest counter for this buyer_name + product_type combination
-        counter_query = text("""
-            SELECT MAX(
-                CAST(
-                    SUBSTRING(
-                        auto_generated_id 
-                        FROM '_(\\d+)$'
-                    ) AS INTEGER
+        # Counter per buyer_name + product_type series, from the ID allocator
+        # (seeded once from the highest existing auto_generated_id of the series)
+        series = f"{buyer_name_clean}_{product_type_3_words}"
+
+        def last_counter() -> int:
+            counter_query = text("""
+                SELECT MAX(
+                    CAST(
+                        SUBSTRING(
+                            auto_generated_id 
+                            FROM '_(\\d+)$'
+                        ) AS INTEGER
+                    )
                 )
-            )
-            FROM size_chart_master 
-            WHERE auto_generated_id LIKE :pattern
-        """)
-        
-        # Pattern: S_{buyer_name}_{product_type}_%
-        pattern = f"S_{buyer_name_clean}_{product_type_3_words}_%"
-        max_counter = db.execute(counter_query, {"pattern": pattern}).scalar()
-        
-        # If no existing records, start at 1, otherwise increment
-        counter = (max_counter or 0) + 1
+                FROM size_chart_master 
+                WHERE auto_generated_id LIKE :pattern
+            """)
+            # Pattern: S_{buyer_name}_{product_type}_%
+            return db.execute(counter_query, {"pattern": f"S_{series}_%"}).scalar() or 0
+
+        counter = id_allocator.next_number("SIZE_CHART", series, seed=last_counter)
         
         # Format: S_{Buyer_name}_{producttype_3_words}_{counter}
-        auto_id = f"S_{buyer_name_clean}_{product_type_3_words}_{str(counter).zfill(4)}"
+        auto_id = f"S_{series}_{str(counter).zfill(4)}"
         
         return {"size_id": auto_id, "counter": counter}
     except HTTPException:
@@ -253,6 +257,7 @@ async def generate_size_chart_id(
 
 
 @router.get("/product-types", response_model=List[ProductTypeResponse])
+@cache_response(key_prefix="product_types", ttl=CacheTTL.LOOKUP_DATA, local_ttl=CacheTTL.LOCAL_MASTER_DATA)
 async def get_product_types(
     is_active: bool = Query(True),
     db: Session = Depends(get_db_samples)
@@ -473,6 +473,21 @@ class SampleRequestResponse(SampleRequestBase):
         from_attributes = True
 
 
+class SampleRequestListResponse(SampleRequestBase):
+    """Slim list projection - no nested plan/materials/operations/TNA/status children"""
+    id: int
+    sample_id: str
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    style_name: Optional[str] = None
+
+    # Workflow information (Requirements 10.2, 10.3)
+    workflow_status: Optional[dict] = None
+
+    class Config:
+        from_attributes = True
+
+
 # =============================================================================
 # STYLE VARIANT MATERIAL SCHEMAS
 # =============================================================================
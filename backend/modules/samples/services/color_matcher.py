@@ -0,0 +1,215 @@
+"""
+Nearest-Colour Matching over the Colour Master
+Active colours are converted once per worker to CIELAB (D65) and kept as a
+NumPy array; nearest-colour queries are a vectorized Delta-E scan with a
+top-k partial sort. The index rebuilds when the "colors" cache prefix is
+invalidated (colour writes, on any worker) and at least every
+CacheTTL.LOCAL_MASTER_DATA seconds.
+"""
+import re
+import threading
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from core.cache import CacheTTL, prefix_generation
+from core.logging import setup_logging
+
+logger = setup_logging()
+
+DELTA_E_METRICS = ("ciede2000", "cie76")
+QUERY_CHUNK = 64  # Query colours per Delta-E pass
+
+_HEX_PATTERN = re.compile(r"^#?([0-9a-fA-F]{6}|[0-9a-fA-F]{3})$")
+
+# sRGB (D65) -> XYZ and the D65 reference white
+_RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+_WHITE_D65 = np.array([0.95047, 1.0, 1.08883])
+
+
+def parse_hex(value: str) -> Tuple[int, int, int]:
+    """'#1A2B3C', '1A2B3C' or '#ABC' -> (r, g, b); raises ValueError"""
+    match = _HEX_PATTERN.match(value.strip())
+    if not match:
+        raise ValueError(f"Invalid hex colour '{value}'")
+    digits = match.group(1)
+    if len(digits) == 3:
+        digits = "".join(c * 2 for c in digits)
+    return int(digits[0:2], 16), int(digits[2:4], 16), int(digits[4:6], 16)
+
+
+def rgb_to_lab(rgb: np.ndarray) -> np.ndarray:
+    """(..., 3) sRGB 0-255 -> (..., 3) CIELAB"""
+    srgb = np.asarray(rgb, dtype=np.float64) / 255.0
+    linear = np.where(srgb <= 0.04045, srgb / 12.92, ((srgb + 0.055) / 1.055) ** 2.4)
+    xyz = linear @ _RGB_TO_XYZ.T / _WHITE_D65
+
+    epsilon, kappa = 216 / 24389, 24389 / 27
+    f = np.where(xyz > epsilon, np.cbrt(xyz), (kappa * xyz + 16) / 116)
+    return np.stack([
+        116 * f[..., 1] - 16,
+        500 * (f[..., 0] - f[..., 1]),
+        200 * (f[..., 1] - f[..., 2]),
+    ], axis=-1)
+
+
+def delta_e_cie76(lab1: np.ndarray, lab2: np.ndarray) -> np.ndarray:
+    """Euclidean distance in CIELAB (broadcasting)"""
+    return np.sqrt(np.sum((lab1 - lab2) ** 2, axis=-1))
+
+
+def delta_e_ciede2000(lab1: np.ndarray, lab2: np.ndarray) -> np.ndarray:
+    """CIEDE2000 colour difference (kL = kC = kH = 1, broadcasting)"""
+    L1, a1, b1 = lab1[..., 0], lab1[..., 1], lab1[..., 2]
+    L2, a2, b2 = lab2[..., 0], lab2[..., 1], lab2[..., 2]
+
+    C_bar = (np.hypot(a1, b1) + np.hypot(a2, b2)) / 2
+    G = 0.5 * (1 - np.sqrt(C_bar ** 7 / (C_bar ** 7 + 25.0 ** 7)))
+    a1p, a2p = (1 + G) * a1, (1 + G) * a2
+    C1p, C2p = np.hypot(a1p, b1), np.hypot(a2p, b2)
+    h1p = np.degrees(np.arctan2(b1, a1p)) % 360
+    h2p = np.degrees(np.arctan2(b2, a2p)) % 360
+
+    dLp = L2 - L1
+    dCp = C2p - C1p
+    dhp = h2p - h1p
+    dhp = np.where(dhp > 180, dhp - 360, np.where(dhp < -180, dhp + 360, dhp))
+    dhp = np.where(C1p * C2p == 0, 0, dhp)
+    dHp = 2 * np.sqrt(C1p * C2p) * np.sin(np.radians(dhp / 2))
+
+    Lp_bar = (L1 + L2) / 2
+    Cp_bar = (C1p + C2p) / 2
+    h_sum = h1p + h2p
+    hp_bar = np.where(
+        C1p * C2p == 0, h_sum,
+        np.where(np.abs(h1p - h2p) <= 180, h_sum / 2,
+                 np.where(h_sum < 360, (h_sum + 360) / 2, (h_sum - 360) / 2))
+    )
+
+    T = (1 - 0.17 * np.cos(np.radians(hp_bar - 30)) + 0.24 * np.cos(np.radians(2 * hp_bar))
+         + 0.32 * np.cos(np.radians(3 * hp_bar + 6)) - 0.20 * np.cos(np.radians(4 * hp_bar - 63)))
+    d_theta = 30 * np.exp(-(((hp_bar - 275) / 25) ** 2))
+    R_C = 2 * np.sqrt(Cp_bar ** 7 / (Cp_bar ** 7 + 25.0 ** 7))
+    S_L = 1 + 0.015 * (Lp_bar - 50) ** 2 / np.sqrt(20 + (Lp_bar - 50) ** 2)
+    S_C = 1 + 0.045 * Cp_bar
+    S_H = 1 + 0.015 * Cp_bar * T
+    R_T = -np.sin(np.radians(2 * d_theta)) * R_C
+
+    return np.sqrt(
+        (dLp / S_L) ** 2 + (dCp / S_C) ** 2 + (dHp / S_H) ** 2
+        + R_T * (dCp / S_C) * (dHp / S_H)
+    )
+
+
+class ColorIndex:
+    """Immutable snapshot of active colours with their CIELAB coordinates"""
+
+    def __init__(self, rows: Sequence):
+        self.colors: List[dict] = [
+            {
+                "id": row.id,
+                "color_name": row.color_name,
+                "tcx_code": row.tcx_code,
+                "hex_code": row.hex_code,
+                "rgb_r": row.rgb_r,
+                "rgb_g": row.rgb_g,
+                "rgb_b": row.rgb_b,
+                "buyer_id": row.buyer_id,
+                "is_general": row.is_general,
+            }
+            for row in rows
+        ]
+        rgb = np.array([[c["rgb_r"], c["rgb_g"], c["rgb_b"]] for c in self.colors], dtype=np.float64).reshape(-1, 3)
+        self.lab = rgb_to_lab(rgb)
+        self._buyer_ids = np.array([c["buyer_id"] if c["buyer_id"] is not None else -1 for c in self.colors], dtype=np.int64)
+        self._general = np.array([bool(c["is_general"]) for c in self.colors], dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.colors)
+
+    def nearest(
+        self,
+        rgb: Sequence[Sequence[int]],
+        k: int = 5,
+        buyer_id: Optional[int] = None,
+        metric: str = "ciede2000"
+    ) -> List[List[dict]]:
+        """
+        Top-k closest colours for each query RGB (one (M, N) Delta-E pass)
+
+        With buyer_id, candidates are that buyer's colours plus general ones
+        (same scope as GET /colors?buyer_id=...).
+        """
+        candidates = np.arange(len(self.colors))
+        if buyer_id is not None:
+            candidates = np.flatnonzero((self._buyer_ids == buyer_id) | self._general)
+        if len(candidates) == 0:
+            return [[] for _ in rgb]
+
+        query_lab = rgb_to_lab(np.asarray(rgb, dtype=np.float64).reshape(-1, 3))
+        candidate_lab = self.lab[candidates][None, :, :]
+        delta = delta_e_cie76 if metric == "cie76" else delta_e_ciede2000
+        k = min(k, len(candidates))
+
+        results = []
+        for start in range(0, len(query_lab), QUERY_CHUNK):
+            # Chunked so the (queries, colours) temporaries stay small
+            distances = delta(query_lab[start:start + QUERY_CHUNK, None, :], candidate_lab)
+            top = np.argpartition(distances, k - 1, axis=1)[:, :k]
+            for row, picks in zip(distances, top):
+                picks = picks[np.argsort(row[picks], kind="stable")]
+                results.append([
+                    {**self.colors[candidates[i]], "delta_e": round(float(row[i]), 3)}
+                    for i in picks
+                ])
+        return results
+
+
+class ColorMatcher:
+    """Per-worker holder of the current ColorIndex, rebuilt on invalidation"""
+
+    def __init__(self):
+        self._index: Optional[ColorIndex] = None
+        self._stamp: Optional[int] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _is_current(self, stamp: int) -> bool:
+        return (
+            self._index is not None
+            and self._stamp == stamp
+            and time.monotonic() - self._loaded_at < CacheTTL.LOCAL_MASTER_DATA
+        )
+
+    def index(self, db: Session) -> ColorIndex:
+        """Current index, rebuilding it with `db` if colours changed or it expired"""
+        stamp = prefix_generation("colors")
+        if self._is_current(stamp):
+            return self._index
+
+        with self._lock:
+            stamp = prefix_generation("colors")
+            if not self._is_current(stamp):
+                rows = db.execute(text("""
+                    SELECT id, color_name, tcx_code, hex_code, rgb_r, rgb_g, rgb_b,
+                           buyer_id, is_general
+                    FROM color_master
+                    WHERE is_active = TRUE
+                      AND rgb_r IS NOT NULL AND rgb_g IS NOT NULL AND rgb_b IS NOT NULL
+                    ORDER BY id
+                """)).fetchall()
+                self._index = ColorIndex(rows)
+                self._stamp = stamp
+                self._loaded_at = time.monotonic()
+                logger.info(f"Colour index loaded: {len(rows)} colours")
+            return self._index
+
+
+color_matcher = ColorMatcher()
@@ -7,7 +7,7 @@ from .master_data import (
     ColorFamily, Color, ColorValue, ColorMaster,
     Country, City, Port
 )
-from .operations import Warehouse, DocumentNumbering, FiscalYear, PerMinuteValue
+from .operations import Warehouse, DocumentNumbering, DocumentNumberCounter, FiscalYear, PerMinuteValue
 
 __all__ = [
     "CompanyProfile", "Branch",
@@ -17,5 +17,5 @@ __all__ = [
     "UoMCategory", "UoM",
     "ColorFamily", "Color", "ColorValue", "ColorMaster",
     "Country", "City", "Port",
-    "Warehouse", "DocumentNumbering", "FiscalYear", "PerMinuteValue"
+    "Warehouse", "DocumentNumbering", "DocumentNumberCounter", "FiscalYear", "PerMinuteValue"
 ]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Numeric, Date
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Numeric, Date, UniqueConstraint
 from sqlalchemy.sql import func
 from core.database import BaseSettings
 
@@ -45,6 +45,22 @@ class DocumentNumbering(BaseSettings):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
 
+class DocumentNumberCounter(BaseSettings):
+    """Document Number Counter - Scoped sequences (per day, per series, per branch) for the ID allocator"""
+    __tablename__ = "document_number_counters"
+
+    id = Column(Integer, primary_key=True, index=True)
+    document_type = Column(String(100), nullable=False)  # SAMPLE_REQUEST, SIZE_CHART, PO
+    scope_key = Column(String(255), nullable=False, default="")  # 20250114, ACME_T_SHIRT, branch:3
+    current_number = Column(Integer, nullable=False, default=0)  # Last number handed out
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint('document_type', 'scope_key', name='uq_document_number_counter_scope'),
+    )
+
+
 class FiscalYear(BaseSettings):
     """Fiscal Year - Financial year configuration"""
     __tablename__ = "fiscal_year"
@@ -1,12 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File
+from sqlalchemy import case, func, literal, or_
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 import os
 import uuid
+import numpy as np
 from core.database import get_db_settings
 from core.logging import setup_logging
+from core.cache import cache_response, invalidate_cache, CacheTTL
+from core.serialization import dumps, raw_json_response, row_to_dict, trusted_rows_response
+from core.services.id_allocator import id_allocator
 
+from ..services.uom_engine import uom_engine
 from ..models import (
     CompanyProfile, Branch, Department,
     Role, Permission, RolePermission,
@@ -29,6 +35,7 @@ from ..schemas import (
     UoMCategoryCreate, UoMCategoryUpdate, UoMCategoryResponse, UoMCategoryWithUnits,
     UoMCreate, UoMUpdate, UoMResponse, UoMWithCategory,
     UoMConversionRequest, UoMConversionResponse,
+    UoMBatchConversionRequest, UoMBatchConversionResponse,
     UoMValidationRequest, UoMValidationResponse, UoMForSelector,
     ColorFamilyCreate, ColorFamilyUpdate, ColorFamilyResponse,
     ColorCreate, ColorUpdate, ColorResponse,
@@ -512,6 +519,7 @@ def create_currency(data: CurrencyCreate, db: Session = Depends(get_db_settings)
         currency = Currency(**data.model_dump())
         db.add(currency)
         db.commit()
+        invalidate_cache("currencies:*")
         db.refresh(currency)
         return currency
     except HTTPException:
@@ -523,6 +531,7 @@ def create_currency(data: CurrencyCreate, db: Session = Depends(get_db_settings)
 
 
 @router.get("/currencies", response_model=List[CurrencyResponse])
+@cache_response(key_prefix="currencies", ttl=CacheTTL.LOOKUP_DATA, local_ttl=CacheTTL.LOCAL_MASTER_DATA)
 def get_currencies(skip: int = 0, limit: Optional[int] = None, is_active: Optional[bool] = None, db: Session = Depends(get_db_settings)):
     """Get all currencies"""
     query = db.query(Currency)
@@ -553,6 +562,7 @@ def update_currency(currency_id: int, data: CurrencyUpdate, db: Session = Depend
             setattr(currency, key, value)
 
         db.commit()
+        invalidate_cache("currencies:*")
         db.refresh(currency)
         return currency
     except HTTPException:
@@ -573,6 +583,7 @@ def delete_currency(currency_id: int, db: Session = Depends(get_db_settings)):
 
         db.delete(currency)
         db.commit()
+        invalidate_cache("currencies:*")
         return None
     except HTTPException:
         raise
@@ -595,6 +606,7 @@ def create_tax(data: TaxCreate, db: Session = Depends(get_db_settings)):
         tax = Tax(**data.model_dump())
         db.add(tax)
         db.commit()
+        invalidate_cache("taxes:*")
         db.refresh(tax)
         return tax
     except HTTPException:
@@ -606,6 +618,7 @@ def create_tax(data: TaxCreate, db: Session = Depends(get_db_settings)):
 
 
 @router.get("/taxes", response_model=List[TaxResponse])
+@cache_response(key_prefix="taxes", ttl=CacheTTL.LOOKUP_DATA, local_ttl=CacheTTL.LOCAL_MASTER_DATA)
 def get_taxes(skip: int = 0, limit: Optional[int] = None, is_active: Optional[bool] = None, db: Session = Depends(get_db_settings)):
     """Get all taxes"""
     query = db.query(Tax)
@@ -636,6 +649,7 @@ def update_tax(tax_id: int, data: TaxUpdate, db: Session = Depends(get_db_settin
             setattr(tax, key, value)
 
         db.commit()
+        invalidate_cache("taxes:*")
         db.refresh(tax)
         return tax
     except HTTPException:
@@ -656,6 +670,7 @@ def delete_tax(tax_id: int, db: Session = Depends(get_db_settings)):
 
         db.delete(tax)
         db.commit()
+        invalidate_cache("taxes:*")
         return None
     except HTTPException:
         raise
@@ -678,6 +693,7 @@ def create_uom_category(data: UoMCategoryCreate, db: Session = Depends(get_db_se
         category = UoMCategory(**data.model_dump())
         db.add(category)
         db.commit()
+        invalidate_cache("uom_categories:*")
         db.refresh(category)
         return category
     except HTTPException:
@@ -689,6 +705,7 @@ def create_uom_category(data: UoMCategoryCreate, db: Session = Depends(get_db_se
 
 
 @router.get("/uom-categories", response_model=List[UoMCategoryResponse])
+@cache_response(key_prefix="uom_categories", ttl=CacheTTL.LOOKUP_DATA, local_ttl=CacheTTL.LOCAL_MASTER_DATA)
 def get_uom_categories(skip: int = 0, limit: Optional[int] = None, is_active: Optional[bool] = None, db: Session = Depends(get_db_settings)):
     """Get all UoM categories"""
     query = db.query(UoMCategory)
@@ -697,6 +714,30 @@ def get_uom_categories(skip: int = 0, limit: Optional[int] = None, is_active: Op
     return query.order_by(UoMCategory.uom_category).offset(skip).limit(limit).all()
 
 
+@router.get("/uom-categories/with-counts", response_model=List[UoMCategoryWithUnits])
+def get_uom_categories_with_counts(is_active: Optional[bool] = None, db: Session = Depends(get_db_settings)):
+    """Get all UoM categories with unit counts for dashboard display (one grouped query)"""
+    unit_count = func.count(UoM.id).filter(UoM.is_active == True)
+    base_unit = func.min(UoM.symbol).filter(UoM.is_base == True)
+
+    query = db.query(UoMCategory, unit_count, base_unit).outerjoin(
+        UoM, UoM.category_id == UoMCategory.id
+    ).group_by(UoMCategory.id)
+    if is_active is not None:
+        query = query.filter(UoMCategory.is_active == is_active)
+
+    rows = query.order_by(UoMCategory.sort_order, UoMCategory.uom_category).all()
+
+    result = []
+    for cat, count, base_symbol in rows:
+        item = row_to_dict(cat, UoMCategoryWithUnits)
+        item["unit_count"] = count
+        item["base_unit"] = base_symbol
+        result.append(item)
+
+    return raw_json_response(dumps(result))
+
+
 @router.get("/uom-categories/{category_id}", response_model=UoMCategoryResponse)
 def get_uom_category(category_id: int, db: Session = Depends(get_db_settings)):
     """Get a specific UoM category"""
@@ -719,6 +760,7 @@ def update_uom_category(category_id: int, data: UoMCategoryUpdate, db: Session =
             setattr(category, key, value)
 
         db.commit()
+        invalidate_cache("uom_categories:*")
         db.refresh(category)
         return category
     except HTTPException:
@@ -739,6 +781,7 @@ def delete_uom_category(category_id: int, db: Session = Depends(get_db_settings)
 
         db.delete(category)
         db.commit()
+        invalidate_cache("uom_categories:*")
         return None
     except HTTPException:
         raise
@@ -757,6 +800,7 @@ def create_uom(data: UoMCreate, db: Session = Depends(get_db_settings)):
         uom = UoM(**data.model_dump())
         db.add(uom)
         db.commit()
+        invalidate_cache("uom:*")
         db.refresh(uom)
         return uom
     except Exception as e:
@@ -766,6 +810,7 @@ def create_uom(data: UoMCreate, db: Session = Depends(get_db_settings)):
 
 
 @router.get("/uom", response_model=List[UoMResponse])
+@cache_response(key_prefix="uom", ttl=CacheTTL.LOOKUP_DATA, local_ttl=CacheTTL.LOCAL_MASTER_DATA)
 def get_uoms(skip: int = 0, limit: Optional[int] = None, category_id: Optional[int] = None, is_active: Optional[bool] = None, db: Session = Depends(get_db_settings)):
     """Get all UoMs"""
     query = db.query(UoM)
@@ -783,48 +828,49 @@ def get_uoms_for_selector(
     search: Optional[str] = None,
     db: Session = Depends(get_db_settings)
 ):
-    """Optimized endpoint for UOM selector component - returns simplified UoM data"""
-    query = db.query(UoM).filter(UoM.is_active == True)
+    """Optimized endpoint for UOM selector component - returns simplified UoM data (from the in-memory UoM index)"""
+    index = uom_engine.index(db)
 
     # Filter by category ID or name
+    category_ids = None
     if category_id:
-        query = query.filter(UoM.category_id == category_id)
+        category_ids = {category_id}
     elif category_name:
-        # Find categories matching the name (case-insensitive)
-        categories = db.query(UoMCategory).filter(
-            UoMCategory.uom_category.ilike(f"%{category_name}%"),
-            UoMCategory.is_active == True
-        ).all()
-        if categories:
-            category_ids = [c.id for c in categories]
-            query = query.filter(UoM.category_id.in_(category_ids))
-
-    # Apply search filter
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            (UoM.name.ilike(search_term)) |
-            (UoM.symbol.ilike(search_term)) |
-            (UoM.display_name.ilike(search_term))
-        )
-
-    uoms = query.order_by(UoM.sort_order, UoM.name).all()
+        # Categories matching the name (case-insensitive); no match means no category filter
+        category_ids = index.category_ids_matching(category_name) or None
+
+    rows = index.filter(category_ids=category_ids, search=search, is_active=True)
+    return raw_json_response(dumps([
+        {
+            "id": row["id"],
+            "name": row["name"],
+            "symbol": row["symbol"],
+            "display_name": row["display_name"],
+            "category_id": row["category_id"],
+            "category_name": row["category_name"],
+            "is_base": bool(row["is_base"]),
+        }
+        for row in rows
+    ]))
 
-    # Build result with category names
-    result = []
-    for uom in uoms:
-        category = db.query(UoMCategory).filter(UoMCategory.id == uom.category_id).first()
-        result.append(UoMForSelector(
-            id=uom.id,
-            name=uom.name,
-            symbol=uom.symbol,
-            display_name=uom.display_name,
-            category_id=uom.category_id,
-            category_name=category.uom_category if category else None,
-            is_base=uom.is_base
-        ))
 
-    return result
+@router.get("/uom/search", response_model=List[UoMWithCategory])
+def search_uoms(
+    q: str,
+    category_id: Optional[int] = None,
+    is_active: Optional[bool] = True,
+    limit: int = 50,
+    db: Session = Depends(get_db_settings)
+):
+    """Search UoMs by name, symbol, or display name (from the in-memory UoM index)"""
+    index = uom_engine.index(db)
+    rows = index.filter(
+        category_ids={category_id} if category_id else None,
+        search=q,
+        is_active=is_active,
+        limit=limit
+    )
+    return raw_json_response(dumps(rows))
 
 
 @router.get("/uom/{uom_id}", response_model=UoMResponse)
@@ -849,6 +895,7 @@ def update_uom(uom_id: int, data: UoMUpdate, db: Session = Depends(get_db_settin
             setattr(uom, key, value)
 
         db.commit()
+        invalidate_cache("uom:*")
         db.refresh(uom)
         return uom
     except HTTPException:
@@ -869,6 +916,7 @@ def delete_uom(uom_id: int, db: Session = Depends(get_db_settings)):
 
         db.delete(uom)
         db.commit()
+        invalidate_cache("uom:*")
         return None
     except HTTPException:
         raise
@@ -880,95 +928,73 @@ def delete_uom(uom_id: int, db: Session = Depends(get_db_settings)):
 
 # ==================== UOM ENHANCED ENDPOINTS ====================
 
-@router.get("/uom-categories/with-counts", response_model=List[UoMCategoryWithUnits])
-def get_uom_categories_with_counts(is_active: Optional[bool] = None, db: Session = Depends(get_db_settings)):
-    """Get all UoM categories with unit counts for dashboard display"""
-    query = db.query(UoMCategory)
-    if is_active is not None:
-        query = query.filter(UoMCategory.is_active == is_active)
-
-    categories = query.order_by(UoMCategory.sort_order, UoMCategory.uom_category).all()
-
-    result = []
-    for cat in categories:
-        # Count units in this category
-        unit_count = db.query(UoM).filter(UoM.category_id == cat.id, UoM.is_active == True).count()
-        # Find base unit
-        base_unit_obj = db.query(UoM).filter(UoM.category_id == cat.id, UoM.is_base == True).first()
-        base_unit = base_unit_obj.symbol if base_unit_obj else None
-
-        result.append(UoMCategoryWithUnits(
-            id=cat.id,
-            uom_category=cat.uom_category,
-            uom_id=cat.uom_id,
-            uom_name=cat.uom_name,
-            uom_description=cat.uom_description,
-            icon=cat.icon,
-            industry_use=cat.industry_use,
-            sort_order=cat.sort_order,
-            is_active=cat.is_active,
-            created_at=cat.created_at,
-            updated_at=cat.updated_at,
-            unit_count=unit_count,
-            base_unit=base_unit
-        ))
-
-    return result
-
-
 @router.post("/uom/convert", response_model=UoMConversionResponse)
 def convert_uom(request: UoMConversionRequest, db: Session = Depends(get_db_settings)):
     """Convert a value between two compatible UoMs (must be in same category)"""
-    from_uom = db.query(UoM).filter(UoM.id == request.from_uom_id).first()
+    index = uom_engine.index(db)
+
+    from_uom = index.get(request.from_uom_id)
     if not from_uom:
         raise HTTPException(status_code=404, detail="Source UoM not found")
 
-    to_uom = db.query(UoM).filter(UoM.id == request.to_uom_id).first()
+    to_uom = index.get(request.to_uom_id)
     if not to_uom:
         raise HTTPException(status_code=404, detail="Target UoM not found")
 
     # Check if both UoMs are in the same category
-    if from_uom.category_id != to_uom.category_id:
+    if from_uom["category_id"] != to_uom["category_id"]:
         raise HTTPException(status_code=400, detail="Cannot convert between different UoM categories")
 
     # Convert: first to base unit, then to target unit
-    # value_in_base = value * from_conversion_to_base
-    # result = value_in_base / to_conversion_to_base
-    from decimal import Decimal
-    
-    # Use new conversion_to_base field if available, fallback to factor
-    from_factor = Decimal(str(from_uom.conversion_to_base)) if hasattr(from_uom, 'conversion_to_base') and from_uom.conversion_to_base else (Decimal(str(from_uom.factor)) if from_uom.factor else Decimal("1"))
-    to_factor = Decimal(str(to_uom.conversion_to_base)) if hasattr(to_uom, 'conversion_to_base') and to_uom.conversion_to_base else (Decimal(str(to_uom.factor)) if to_uom.factor else Decimal("1"))
-
-    value_in_base = request.value * from_factor
-    result = value_in_base / to_factor
-    conversion_factor = from_factor / to_factor
+    # result = value * from_factor / to_factor
+    result, conversion_factor = index.convert(request.value, request.from_uom_id, request.to_uom_id)
 
     return UoMConversionResponse(
-        from_uom=from_uom.symbol,
-        to_uom=to_uom.symbol,
+        from_uom=from_uom["symbol"],
+        to_uom=to_uom["symbol"],
         from_value=request.value,
-        to_value=round(result, to_uom.decimal_places or 2),
+        to_value=round(result, to_uom["decimal_places"] or 2),
         conversion_factor=conversion_factor,
-        formula=f"1 {from_uom.symbol} = {conversion_factor} {to_uom.symbol}"
+        formula=f"1 {from_uom['symbol']} = {conversion_factor} {to_uom['symbol']}"
     )
 
 
+@router.post("/uom/convert/batch", response_model=UoMBatchConversionResponse)
+def convert_uom_batch(request: UoMBatchConversionRequest, db: Session = Depends(get_db_settings)):
+    """
+    Convert many (value, from_uom_id, to_uom_id) tuples in one vectorized pass
+
+    Results are floats rounded to each target unit's decimal places, in
+    request order; failed rows are null and listed in `errors`.
+    """
+    index = uom_engine.index(db)
+
+    if request.conversions:
+        values, from_ids, to_ids = (np.asarray(column) for column in zip(*request.conversions))
+        results, errors = index.convert_batch(values.astype(np.float64), from_ids.astype(np.int64), to_ids.astype(np.int64))
+        results = results.tolist()  # NaN (failed rows) serializes as null
+    else:
+        results, errors = [], {}
+
+    return raw_json_response(dumps({
+        "results": results,
+        "errors": [{"index": i, "detail": detail} for i, detail in errors.items()],
+    }))
+
+
 @router.get("/uom/compatible/{uom_id}", response_model=List[UoMResponse])
 def get_compatible_uoms(uom_id: int, db: Session = Depends(get_db_settings)):
     """Get all UoMs compatible for conversion with given UoM (same category)"""
-    uom = db.query(UoM).filter(UoM.id == uom_id).first()
+    index = uom_engine.index(db)
+    uom = index.get(uom_id)
     if not uom:
         raise HTTPException(status_code=404, detail="UoM not found")
 
     # Return all active UoMs in the same category (excluding the source UoM)
-    compatible = db.query(UoM).filter(
-        UoM.category_id == uom.category_id,
-        UoM.is_active == True,
-        UoM.id != uom_id
-    ).order_by(UoM.sort_order, UoM.name).all()
-
-    return compatible
+    return [
+        row for row in index.filter(category_ids={uom["category_id"]}, is_active=True)
+        if row["id"] != uom_id
+    ]
 
 
 @router.post("/uom/validate-symbol", response_model=UoMValidationResponse)
@@ -994,55 +1020,6 @@ def validate_uom_symbol(request: UoMValidationRequest, db: Session = Depends(get
     return UoMValidationResponse(is_valid=True, message="Symbol is available")
 
 
-@router.get("/uom/search", response_model=List[UoMWithCategory])
-def search_uoms(
-    q: str,
-    category_id: Optional[int] = None,
-    is_active: Optional[bool] = True,
-    limit: int = 50,
-    db: Session = Depends(get_db_settings)
-):
-    """Search UoMs by name, symbol, or display name"""
-    search_term = f"%{q}%"
-    query = db.query(UoM).filter(
-        (UoM.name.ilike(search_term)) |
-        (UoM.symbol.ilike(search_term)) |
-        (UoM.display_name.ilike(search_term))
-    )
-
-    if category_id:
-        query = query.filter(UoM.category_id == category_id)
-    if is_active is not None:
-        query = query.filter(UoM.is_active == is_active)
-
-    uoms = query.order_by(UoM.sort_order, UoM.name).limit(limit).all()
-
-    # Add category name to each result
-    result = []
-    for uom in uoms:
-        category = db.query(UoMCategory).filter(UoMCategory.id == uom.category_id).first()
-        result.append(UoMWithCategory(
-            id=uom.id,
-            category_id=uom.category_id,
-            name=uom.name,
-            symbol=uom.symbol,
-            factor=uom.factor,
-            is_base=uom.is_base,
-            is_active=uom.is_active,
-            remarks=uom.remarks,
-            display_name=uom.display_name,
-            is_si_unit=uom.is_si_unit,
-            common_usage=uom.common_usage,
-            decimal_places=uom.decimal_places,
-            sort_order=uom.sort_order,
-            created_at=uom.created_at,
-            updated_at=uom.updated_at,
-            category_name=category.uom_category if category else None
-        ))
-
-    return result
-
-
 # ==================== COLOR FAMILIES ====================
 
 @router.post("/color-families", response_model=ColorFamilyResponse, status_code=status.HTTP_201_CREATED)
@@ -1056,6 +1033,7 @@ def create_color_family(data: ColorFamilyCreate, db: Session = Depends(get_db_se
         color_family = ColorFamily(**data.model_dump())
         db.add(color_family)
         db.commit()
+        invalidate_cache("color_families:*")
         db.refresh(color_family)
         return color_family
     except HTTPException:
@@ -1067,6 +1045,7 @@ def create_color_family(data: ColorFamilyCreate, db: Session = Depends(get_db_se
 
 
 @router.get("/color-families", response_model=List[ColorFamilyResponse])
+@cache_response(key_prefix="color_families", ttl=CacheTTL.LOOKUP_DATA, local_ttl=CacheTTL.LOCAL_MASTER_DATA)
 def get_color_families(skip: int = 0, limit: Optional[int] = 100, is_active: Optional[bool] = None, db: Session = Depends(get_db_settings)):
     """Get all color families"""
     query = db.query(ColorFamily)
@@ -1100,6 +1079,7 @@ def update_color_family(family_id: int, data: ColorFamilyUpdate, db: Session = D
             setattr(family, key, value)
 
         db.commit()
+        invalidate_cache("color_families:*")
         db.refresh(family)
         return family
     except HTTPException:
@@ -1120,6 +1100,7 @@ def delete_color_family(family_id: int, db: Session = Depends(get_db_settings)):
 
         db.delete(family)
         db.commit()
+        invalidate_cache("color_families:*")
         return None
     except HTTPException:
         raise
@@ -1306,6 +1287,7 @@ def create_color_master(data: ColorMasterCreate, db: Session = Depends(get_db_se
         color_master = ColorMaster(**data.model_dump())
         db.add(color_master)
         db.commit()
+        invalidate_cache("color_master:*")
         db.refresh(color_master)
         return color_master
     except Exception as e:
@@ -1328,7 +1310,53 @@ def get_color_masters(skip: int = 0, limit: Optional[int] = None, color_family_i
     # If limit is None, return all records. Otherwise apply limit.
     if limit is not None:
         query = query.limit(limit)
-    return query.all()
+    # Thousands of TCX rows: serialize directly instead of validating each row
+    return trusted_rows_response(query.all(), ColorMasterResponse)
+
+
+@cache_response(key_prefix="color_master", ttl=CacheTTL.LOOKUP_DATA, local_ttl=CacheTTL.LOCAL_MASTER_DATA)
+def _search_color_master_rows(
+    db: Session,
+    q: str,
+    color_code_type: Optional[str],
+    fuzzy: bool,
+    limit: int
+) -> List[dict]:
+    """Matching color master rows as plain dicts (cached, so the response is built outside the decorator)"""
+    term = q.strip()
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    prefix, contains = f"{escaped}%", f"%{escaped}%"
+
+    matches = [ColorMaster.color_name.ilike(contains), ColorMaster.color_code.ilike(contains)]
+    if fuzzy and len(term) >= 3:
+        matches.append(literal(term).op("<%")(ColorMaster.color_name))
+
+    query = db.query(ColorMaster).filter(ColorMaster.is_active == True, or_(*matches))
+    if color_code_type:
+        query = query.filter(ColorMaster.color_code_type == color_code_type)
+    rank = case(
+        (or_(ColorMaster.color_name.ilike(prefix), ColorMaster.color_code.ilike(prefix)), 0),
+        (or_(*matches[:2]), 1),
+        else_=2
+    )
+    query = query.order_by(rank, func.word_similarity(term, ColorMaster.color_name).desc(), ColorMaster.color_name)
+    return [row_to_dict(row, ColorMasterResponse) for row in query.limit(limit).all()]
+
+
+@router.get("/color-master/search", response_model=List[ColorMasterResponse])
+def search_color_masters(
+    q: str = Query(..., min_length=1, max_length=100),
+    color_code_type: Optional[str] = None,
+    fuzzy: bool = True,
+    limit: int = Query(20, ge=1, le=50),
+    db: Session = Depends(get_db_settings)
+):
+    """
+    Typeahead search over active color master entries by name and code
+    Prefix matches first, then substring, then fuzzy matches (pg_trgm indexes)
+    """
+    rows = _search_color_master_rows(db, q=q, color_code_type=color_code_type, fuzzy=fuzzy, limit=limit)
+    return raw_json_response(dumps(rows))
 
 
 @router.get("/color-master/{master_id}", response_model=ColorMasterResponse)
@@ -1353,6 +1381,7 @@ def update_color_master(master_id: int, data: ColorMasterUpdate, db: Session = D
             setattr(master, key, value)
 
         db.commit()
+        invalidate_cache("color_master:*")
         db.refresh(master)
         return master
     except HTTPException:
@@ -1373,6 +1402,7 @@ def delete_color_master(master_id: int, db: Session = Depends(get_db_settings)):
 
         db.delete(master)
         db.commit()
+        invalidate_cache("color_master:*")
         return None
     except HTTPException:
         raise
@@ -1528,6 +1558,7 @@ def seed_tcx_colors(db: Session = Depends(get_db_settings)):
         # Final commit
         try:
             db.commit()
+            invalidate_cache("color_master:*")
         except IntegrityError as e:
             db.rollback()
             logger.error(f"Final commit failed: {e}")
@@ -1566,6 +1597,7 @@ def create_country(data: CountryCreate, db: Session = Depends(get_db_settings)):
         country = Country(**data.model_dump())
         db.add(country)
         db.commit()
+        invalidate_cache("countries:*")
         db.refresh(country)
         return country
     except HTTPException:
@@ -1577,6 +1609,7 @@ def create_country(data: CountryCreate, db: Session = Depends(get_db_settings)):
 
 
 @router.get("/countries", response_model=List[CountryResponse])
+@cache_response(key_prefix="countries", ttl=CacheTTL.LOOKUP_DATA, local_ttl=CacheTTL.LOCAL_MASTER_DATA)
 def get_countries(skip: int = 0, limit: Optional[int] = None, is_active: Optional[bool] = None, db: Session = Depends(get_db_settings)):
     """Get all countries"""
     query = db.query(Country)
@@ -1607,6 +1640,7 @@ def update_country(country_pk: int, data: CountryUpdate, db: Session = Depends(g
             setattr(country, key, value)
 
         db.commit()
+        invalidate_cache("countries:*")
         db.refresh(country)
         return country
     except HTTPException:
@@ -1627,6 +1661,7 @@ def delete_country(country_pk: int, db: Session = Depends(get_db_settings)):
 
         db.delete(country)
         db.commit()
+        invalidate_cache("countries:*")
         return None
     except HTTPException:
         raise
@@ -1734,6 +1769,7 @@ def create_port(data: PortCreate, db: Session = Depends(get_db_settings)):
         port = Port(**data.model_dump())
         db.add(port)
         db.commit()
+        invalidate_cache("ports:*")
         db.refresh(port)
         return port
     except HTTPException:
@@ -1745,6 +1781,7 @@ def create_port(data: PortCreate, db: Session = Depends(get_db_settings)):
 
 
 @router.get("/ports", response_model=List[PortResponse])
+@cache_response(key_prefix="ports", ttl=CacheTTL.LOOKUP_DATA, local_ttl=CacheTTL.LOCAL_MASTER_DATA)
 def get_ports(skip: int = 0, limit: Optional[int] = None, country_id: Optional[int] = None, is_active: Optional[bool] = None, db: Session = Depends(get_db_settings)):
     """Get all ports"""
     query = db.query(Port)
@@ -1777,6 +1814,7 @@ def update_port(port_id: int, data: PortUpdate, db: Session = Depends(get_db_set
             setattr(port, key, value)
 
         db.commit()
+        invalidate_cache("ports:*")
         db.refresh(port)
         return port
     except HTTPException:
@@ -1797,6 +1835,7 @@ def delete_port(port_id: int, db: Session = Depends(get_db_settings)):
 
         db.delete(port)
         db.commit()
+        invalidate_cache("ports:*")
         return None
     except HTTPException:
         raise
@@ -1921,6 +1960,30 @@ def get_document_numberings(skip: int = 0, limit: Optional[int] = None, is_activ
     return query.order_by(DocumentNumbering.document_type).offset(skip).limit(limit).all()
 
 
+@router.get("/document-numbering/next")
+def get_next_document_number(document_type: str, branch_id: Optional[int] = None):
+    """Preview the next document number for a given document type (nothing is reserved)"""
+    try:
+        return id_allocator.peek_document_number(document_type, branch_id)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error getting next document number: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get next document number")
+
+
+@router.post("/document-numbering/next")
+def allocate_next_document_number(document_type: str, branch_id: Optional[int] = None):
+    """Reserve the next document number for a given document type (atomic, never handed out twice)"""
+    try:
+        return id_allocator.next_document_number(document_type, branch_id)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error allocating document number: {e}")
+        raise HTTPException(status_code=500, detail="Failed to allocate document number")
+
+
 @router.get("/document-numbering/{doc_id}", response_model=DocumentNumberingResponse)
 def get_document_numbering(doc_id: int, db: Session = Depends(get_db_settings)):
     """Get a specific document numbering config"""
@@ -1972,51 +2035,6 @@ def delete_document_numbering(doc_id: int, db: Session = Depends(get_db_settings
         raise HTTPException(status_code=500, detail="Failed to delete document numbering")
 
 
-@router.get("/document-numbering/next")
-def get_next_document_number(
-    document_type: str,
-    branch_id: Optional[int] = None,
-    db: Session = Depends(get_db_settings)
-):
-    """Get the next document number for a given document type"""
-    try:
-        query = db.query(DocumentNumbering).filter(
-            DocumentNumbering.document_type == document_type,
-            DocumentNumbering.is_active == True
-        )
-
-        if branch_id:
-            query = query.filter(DocumentNumbering.branch_wise == True)
-
-        doc = query.first()
-        if not doc:
-            raise HTTPException(status_code=404, detail=f"Document numbering not found for type: {document_type}")
-
-        # Generate the next number
-        next_num = doc.current_number + 1
-        padded_num = str(next_num).zfill(doc.number_length or 5)
-
-        # Build the formatted number
-        formatted = ""
-        if doc.prefix:
-            formatted += doc.prefix
-        formatted += padded_num
-        if doc.suffix:
-            formatted += doc.suffix
-
-        return {
-            "document_type": document_type,
-            "next_number": next_num,
-            "formatted_number": formatted,
-            "sample_format": doc.sample_format
-        }
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting next document number: {e}")
-        raise HTTPException(status_code=500, detail="Failed to get next document number")
-
-
 # ==================== FISCAL YEARS ====================
 
 @router.post("/fiscal-years", response_model=FiscalYearResponse, status_code=status.HTTP_201_CREATED)
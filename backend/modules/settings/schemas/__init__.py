@@ -20,6 +20,7 @@ from .master_data import (
     UoMCategoryWithUnits,
     UoMBase, UoMCreate, UoMUpdate, UoMResponse,
     UoMWithCategory, UoMConversionRequest, UoMConversionResponse,
+    UoMBatchConversionRequest, UoMBatchConversionResponse, UoMBatchConversionError,
     UoMValidationRequest, UoMValidationResponse, UoMForSelector,
     ColorFamilyBase, ColorFamilyCreate, ColorFamilyUpdate, ColorFamilyResponse,
     ColorBase, ColorCreate, ColorUpdate, ColorResponse,
@@ -55,6 +56,7 @@ __all__ = [
     "UoMCategoryWithUnits",
     "UoMBase", "UoMCreate", "UoMUpdate", "UoMResponse",
     "UoMWithCategory", "UoMConversionRequest", "UoMConversionResponse",
+    "UoMBatchConversionRequest", "UoMBatchConversionResponse", "UoMBatchConversionError",
     "UoMValidationRequest", "UoMValidationResponse", "UoMForSelector",
     "ColorFamilyBase", "ColorFamilyCreate", "ColorFamilyUpdate", "ColorFamilyResponse",
     "ColorBase", "ColorCreate", "ColorUpdate", "ColorResponse",
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional, Tuple
 from datetime import datetime
 from decimal import Decimal
 
@@ -116,6 +116,23 @@ class UoMConversionResponse(BaseModel):
     formula: Optional[str] = None
 
 
+class UoMBatchConversionRequest(BaseModel):
+    """Many conversions in one call: (value, from_uom_id, to_uom_id) tuples"""
+    conversions: List[Tuple[float, int, int]] = Field(..., max_length=50000)
+
+
+class UoMBatchConversionError(BaseModel):
+    """A conversion that could not be done (index into the request list)"""
+    index: int
+    detail: str
+
+
+class UoMBatchConversionResponse(BaseModel):
+    """Converted values in request order (null where the row failed)"""
+    results: List[Optional[float]]
+    errors: List[UoMBatchConversionError] = []
+
+
 class UoMValidationRequest(BaseModel):
     """Request for validating UoM symbol uniqueness"""
     symbol: str
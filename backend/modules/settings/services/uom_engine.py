@@ -0,0 +1,179 @@
+"""
+In-Memory UoM Conversion Engine
+The whole UoM/category graph is loaded once per worker into an immutable
+index: lookups, selector lists, search and conversions are served from it
+without per-request queries. The index is rebuilt when the "uom" or
+"uom_categories" cache prefixes are invalidated (UoM writes, on any worker),
+and at least every CacheTTL.LOCAL_MASTER_DATA seconds.
+"""
+import threading
+import time
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from core.cache import CacheTTL, prefix_generation
+from core.logging import setup_logging
+from core.serialization import row_to_dict
+from ..models import UoM, UoMCategory
+from ..schemas import UoMResponse
+
+logger = setup_logging()
+
+# Batch conversion error codes (per input row)
+UNKNOWN_FROM_UOM = "Source UoM not found"
+UNKNOWN_TO_UOM = "Target UoM not found"
+CATEGORY_MISMATCH = "Cannot convert between different UoM categories"
+
+
+def _factor(uom: UoM) -> Decimal:
+    """Conversion factor to the category's base unit (1 when unset)"""
+    return Decimal(str(uom.factor)) if uom.factor else Decimal("1")
+
+
+def _sort_key(uom: UoM):
+    # ORDER BY sort_order, name (NULL sort_order last, as in PostgreSQL)
+    return (uom.sort_order is None, uom.sort_order or 0, uom.name)
+
+
+class UoMIndex:
+    """Immutable snapshot of all UoMs and categories"""
+
+    def __init__(self, uoms: Sequence[UoM], categories: Sequence[UoMCategory]):
+        self.categories: Dict[int, UoMCategory] = {c.id: c for c in categories}
+        ordered = sorted(uoms, key=_sort_key)
+
+        # Full rows (UoMResponse fields + category_name) in display order
+        self.rows: List[dict] = []
+        self.row_by_id: Dict[int, dict] = {}
+        self.factors: Dict[int, Decimal] = {}
+        self._search_text: List[str] = []
+        for uom in ordered:
+            category = self.categories.get(uom.category_id)
+            row = row_to_dict(uom, UoMResponse)
+            row["category_name"] = category.uom_category if category else None
+            self.rows.append(row)
+            self.row_by_id[uom.id] = row
+            self.factors[uom.id] = _factor(uom)
+            self._search_text.append("\0".join(
+                (value or "").lower() for value in (uom.name, uom.symbol, uom.display_name)
+            ))
+
+        # Columnar factor table for vectorized conversion, sorted by id
+        by_id = sorted(ordered, key=lambda u: u.id)
+        self._ids = np.array([u.id for u in by_id], dtype=np.int64)
+        self._factor_table = np.array([float(self.factors[u.id]) for u in by_id], dtype=np.float64)
+        self._category_table = np.array([u.category_id for u in by_id], dtype=np.int64)
+        self._scale_table = np.array([10.0 ** (u.decimal_places if u.decimal_places is not None else 2) for u in by_id])
+
+    def get(self, uom_id: int) -> Optional[dict]:
+        return self.row_by_id.get(uom_id)
+
+    def filter(
+        self,
+        category_ids: Optional[set] = None,
+        search: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        limit: Optional[int] = None
+    ) -> List[dict]:
+        """Rows in display order matching the filters (search: case-insensitive substring)"""
+        needle = search.lower() if search else None
+        result = []
+        for row, text in zip(self.rows, self._search_text):
+            if category_ids is not None and row["category_id"] not in category_ids:
+                continue
+            if is_active is not None and bool(row["is_active"]) != is_active:
+                continue
+            if needle and needle not in text:
+                continue
+            result.append(row)
+            if limit is not None and len(result) >= limit:
+                break
+        return result
+
+    def category_ids_matching(self, name: str) -> set:
+        """Active categories whose name contains `name` (case-insensitive)"""
+        needle = name.lower()
+        return {
+            c.id for c in self.categories.values()
+            if c.is_active and needle in (c.uom_category or "").lower()
+        }
+
+    def convert(self, value: Decimal, from_id: int, to_id: int) -> Tuple[Decimal, Decimal]:
+        """Exact Decimal conversion -> (result, factor); raises KeyError/ValueError"""
+        from_row, to_row = self.row_by_id[from_id], self.row_by_id[to_id]
+        if from_row["category_id"] != to_row["category_id"]:
+            raise ValueError(CATEGORY_MISMATCH)
+        from_factor, to_factor = self.factors[from_id], self.factors[to_id]
+        return value * from_factor / to_factor, from_factor / to_factor
+
+    def _positions(self, ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Row positions of ids in the factor table -> (positions, found mask)"""
+        pos = np.minimum(np.searchsorted(self._ids, ids), len(self._ids) - 1)
+        found = self._ids[pos] == ids
+        return np.where(found, pos, 0), found
+
+    def convert_batch(
+        self,
+        values: np.ndarray,
+        from_ids: np.ndarray,
+        to_ids: np.ndarray
+    ) -> Tuple[np.ndarray, Dict[int, str]]:
+        """
+        Convert many values in one vectorized pass (float64)
+
+        Returns (results rounded to each target unit's decimal_places, with NaN
+        for failed rows; {row index: error}).
+        """
+        if len(self._ids) == 0:
+            return np.full(len(values), np.nan), {i: UNKNOWN_FROM_UOM for i in range(len(values))}
+
+        from_pos, from_ok = self._positions(from_ids)
+        to_pos, to_ok = self._positions(to_ids)
+        same_category = self._category_table[from_pos] == self._category_table[to_pos]
+        ok = from_ok & to_ok & same_category
+
+        scale = self._scale_table[to_pos]
+        results = np.round(values * (self._factor_table[from_pos] / self._factor_table[to_pos]) * scale) / scale
+        results = np.where(ok, results, np.nan)
+
+        errors = {}
+        for i in np.flatnonzero(~ok):
+            errors[int(i)] = UNKNOWN_FROM_UOM if not from_ok[i] else UNKNOWN_TO_UOM if not to_ok[i] else CATEGORY_MISMATCH
+        return results, errors
+
+
+class UoMEngine:
+    """Per-worker holder of the current UoMIndex, rebuilt on invalidation"""
+
+    def __init__(self):
+        self._index: Optional[UoMIndex] = None
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _current_stamp() -> Tuple[int, int]:
+        return prefix_generation("uom"), prefix_generation("uom_categories")
+
+    def index(self, db: Session) -> UoMIndex:
+        """Current index, rebuilding it with `db` if UoM data changed or it expired"""
+        stamp = self._current_stamp()
+        if self._index is not None and self._stamp == stamp and time.monotonic() - self._loaded_at < CacheTTL.LOCAL_MASTER_DATA:
+            return self._index
+
+        with self._lock:
+            stamp = self._current_stamp()
+            if self._index is None or self._stamp != stamp or time.monotonic() - self._loaded_at >= CacheTTL.LOCAL_MASTER_DATA:
+                uoms = db.query(UoM).all()
+                categories = db.query(UoMCategory).all()
+                self._index = UoMIndex(uoms, categories)
+                self._stamp = stamp
+                self._loaded_at = time.monotonic()
+                logger.info(f"UoM index loaded: {len(uoms)} units in {len(categories)} categories")
+            return self._index
+
+
+uom_engine = UoMEngine()
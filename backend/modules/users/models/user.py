@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime
 from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import JSONB
 from core.database import BaseUsers as Base
 
 
@@ -15,8 +16,8 @@ class User(Base):
     is_superuser = Column(Boolean, default=False)
     department = Column(String, nullable=True)  # Sample, IE, Planning, Merchandising, etc.
     designation = Column(String, nullable=True)
-    # Department access permissions - JSON array of allowed departments
+    # Department access permissions - JSONB array of allowed departments (GIN indexed for @> lookups)
     # e.g., ["client_info", "sample_department"] or ["client_info"] or ["sample_department"]
-    department_access = Column(JSON, nullable=True, default=list)  # List of accessible departments
+    department_access = Column(JSONB, nullable=True, default=list)  # List of accessible departments
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
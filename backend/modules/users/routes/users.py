@@ -95,6 +95,9 @@ def update_user(user_id: int, user_data: UserUpdate, db: Session = Depends(get_d
 
         db.commit()
         db.refresh(user)
+
+        from core.principal import invalidate_principals
+        invalidate_principals()
         return user
     except HTTPException:
         raise
@@ -124,6 +127,9 @@ def delete_user(user_id: int, db: Session = Depends(get_db_users)):
 
         db.delete(user)
         db.commit()
+
+        from core.principal import invalidate_principals
+        invalidate_principals()
         return None
     except HTTPException:
         raise
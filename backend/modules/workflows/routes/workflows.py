@@ -2,7 +2,7 @@
 Workflow API routes
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import os
@@ -12,12 +12,14 @@ from datetime import datetime
 from core.database import get_db_samples
 from core.dependencies import get_current_username
 from ..services.workflow_service import WorkflowService, WorkflowTemplateService
+from ..services.workflow_board import DEFAULT_BOARD_LIMIT, MAX_BOARD_LIMIT
 from ..schemas.workflow import (
     CreateWorkflowRequest, UpdateWorkflowRequest, WorkflowResponse,
     WorkflowFilters, UpdateCardStatusRequest, UpdateCardAssigneeRequest,
     CardCommentCreate, CardCommentResponse, CardAttachmentResponse,
     WorkflowTemplateResponse, WorkflowTemplateCreate, WorkflowTemplateUpdate,
-    WorkflowCardResponse
+    WorkflowCardResponse, WorkflowBoardResponse,
+    BulkCreateWorkflowRequest, BulkCreateWorkflowResponse
 )
 
 router = APIRouter()
@@ -40,6 +42,38 @@ async def get_workflow_statistics(
         )
 
 
+# Kanban board endpoint (must be before /workflows/{workflow_id})
+@router.get("/workflows/board", response_model=WorkflowBoardResponse)
+def get_workflow_board(
+    assigned_to: Optional[str] = None,
+    department: Optional[str] = None,
+    workflow_status: Optional[str] = "active",
+    stage_name: Optional[str] = None,
+    card_status: Optional[str] = None,
+    after_id: Optional[int] = Query(None, ge=1, description="next_cursor of the column to continue"),
+    limit: int = Query(DEFAULT_BOARD_LIMIT, ge=1, le=MAX_BOARD_LIMIT, description="Cards per stage/status column"),
+    db: Session = Depends(get_db_samples),
+    current_username: str = Depends(get_current_username)
+):
+    """
+    Cards grouped by stage and status for a user or department
+
+    Defaults to the current user's cards. Each column returns up to `limit`
+    cards with its total count; load more of a column with its stage_name,
+    card_status and after_id=next_cursor.
+    """
+    service = WorkflowService(db)
+    return service.get_board(
+        assigned_to=assigned_to or (None if department else current_username),
+        department=department,
+        workflow_status=workflow_status,
+        stage_name=stage_name,
+        card_status=card_status,
+        after_id=after_id,
+        limit=limit
+    )
+
+
 # Workflow endpoints
 @router.post("/workflows", response_model=WorkflowResponse, status_code=status.HTTP_201_CREATED)
 async def create_workflow(
@@ -64,6 +98,30 @@ async def create_workflow(
         )
 
 
+@router.post("/workflows/bulk", response_model=BulkCreateWorkflowResponse, status_code=status.HTTP_201_CREATED)
+def create_workflows_bulk(
+    bulk_data: BulkCreateWorkflowRequest,
+    db: Session = Depends(get_db_samples),
+    created_by: str = Depends(get_current_username)
+):
+    """Create workflows for many sample requests in one transaction"""
+    try:
+        service = WorkflowService(db)
+        workflows = service.create_workflows_bulk(bulk_data, created_by)
+        return {"created": len(workflows), "workflows": workflows}
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create workflows: {str(e)}"
+        )
+
+
 @router.get("/workflows/{workflow_id}", response_model=WorkflowResponse)
 async def get_workflow(
     workflow_id: int,
@@ -74,6 +74,29 @@ class CreateWorkflowRequest(BaseModel):
     priority: Priority = Priority.MEDIUM
 
 
+class BulkCreateWorkflowRequest(BaseModel):
+    sample_request_ids: List[int] = Field(..., min_length=1, max_length=500)
+    workflow_name: str = Field("Sample Development", min_length=5, max_length=200)  # Each workflow: "{workflow_name} - {sample_id}"
+    assigned_designer: Optional[str] = Field(None, max_length=50)
+    assigned_programmer: Optional[str] = Field(None, max_length=50)
+    assigned_supervisor_knitting: Optional[str] = Field(None, max_length=50)
+    assigned_supervisor_finishing: Optional[str] = Field(None, max_length=50)
+    delivery_plan_date: Optional[datetime] = None
+    priority: Priority = Priority.MEDIUM
+
+
+class BulkCreatedWorkflow(BaseModel):
+    id: int
+    sample_request_id: int
+    workflow_name: str
+    card_count: int
+
+
+class BulkCreateWorkflowResponse(BaseModel):
+    created: int
+    workflows: List[BulkCreatedWorkflow] = []
+
+
 class UpdateWorkflowRequest(BaseModel):
     workflow_name: Optional[str] = Field(None, min_length=5, max_length=255)
     workflow_status: Optional[WorkflowStatus] = None
@@ -171,6 +194,42 @@ class WorkflowResponse(BaseModel):
         from_attributes = True
 
 
+class BoardCard(BaseModel):
+    id: int
+    workflow_id: int
+    workflow_name: str
+    sample_request_id: int
+    priority: Optional[Priority]
+    stage_name: str
+    stage_order: int
+    card_title: str
+    assigned_to: Optional[str]
+    card_status: CardStatus
+    due_date: Optional[datetime]
+    updated_at: Optional[datetime]
+    blocked_reason: Optional[str]
+
+
+class BoardStatusGroup(BaseModel):
+    card_status: CardStatus
+    count: int
+    cards: List[BoardCard] = []
+    has_more: bool = False
+    next_cursor: Optional[int] = None
+
+
+class BoardColumn(BaseModel):
+    stage_name: str
+    stage_order: int
+    card_count: int
+    statuses: List[BoardStatusGroup] = []
+
+
+class WorkflowBoardResponse(BaseModel):
+    columns: List[BoardColumn] = []
+    total_cards: int
+
+
 class UpdateCardStatusRequest(BaseModel):
     status: CardStatus
     reason: Optional[str] = Field(None, max_length=500)
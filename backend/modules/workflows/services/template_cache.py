@@ -0,0 +1,67 @@
+"""
+In-Memory Workflow Template Cache
+Active template stages are read once per worker and per template name, so
+creating workflows does not query workflow_templates. The cache is dropped
+when the "workflow_templates" cache prefix is invalidated (template writes,
+on any worker) and at least every CacheTTL.LOCAL_MASTER_DATA seconds.
+"""
+import threading
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from core.cache import CacheTTL, invalidate_cache, prefix_generation
+from ..models.workflow import WorkflowTemplate
+
+TEMPLATE_CACHE_PREFIX = "workflow_templates"
+
+
+class WorkflowTemplateCache:
+    """Per-worker stages of each active template, ordered by stage_order"""
+
+    def __init__(self):
+        self._templates: Dict[str, List[dict]] = {}
+        self._stamp: Optional[int] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _is_current(self, stamp: int) -> bool:
+        return self._stamp == stamp and time.monotonic() - self._loaded_at < CacheTTL.LOCAL_MASTER_DATA
+
+    def get(self, db: Session, template_name: str) -> List[dict]:
+        """Stages of a template (empty if it has none), loading them with `db` on a miss"""
+        stamp = prefix_generation(TEMPLATE_CACHE_PREFIX)
+        if self._is_current(stamp) and template_name in self._templates:
+            return self._templates[template_name]
+
+        with self._lock:
+            stamp = prefix_generation(TEMPLATE_CACHE_PREFIX)
+            if not self._is_current(stamp):
+                self._templates = {}
+                self._stamp = stamp
+                self._loaded_at = time.monotonic()
+            if template_name not in self._templates:
+                rows = db.query(WorkflowTemplate).filter(
+                    WorkflowTemplate.template_name == template_name,
+                    WorkflowTemplate.is_active == True
+                ).order_by(WorkflowTemplate.stage_order).all()
+                self._templates[template_name] = [
+                    {
+                        "stage_name": row.stage_name,
+                        "stage_order": row.stage_order,
+                        "stage_description": row.stage_description,
+                        "default_assignee_role": row.default_assignee_role,
+                        "estimated_duration_hours": row.estimated_duration_hours,
+                    }
+                    for row in rows
+                ]
+            return self._templates[template_name]
+
+    @staticmethod
+    def invalidate():
+        """Drop cached templates on every worker (after a template write)"""
+        invalidate_cache(f"{TEMPLATE_CACHE_PREFIX}:*")
+
+
+template_cache = WorkflowTemplateCache()
@@ -0,0 +1,141 @@
+"""
+Kanban Board for Workflow Cards
+The board for a user or department is one projection query over
+workflow_cards joined to sample_workflows: cards come back already grouped
+by stage and status, each (stage, status) column carries its total card
+count from a window function, and columns are paged with a keyset cursor
+(card id) instead of OFFSET.
+"""
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from core.cache import CacheTTL, cached_value
+from core.database import SessionLocalUsers
+from modules.users.models.user import User
+from ..models.workflow import SampleWorkflow, WorkflowCard
+
+DEFAULT_BOARD_LIMIT = 20  # Cards per (stage, status) column
+MAX_BOARD_LIMIT = 200
+
+
+def department_members(department: str) -> List[str]:
+    """Usernames of active users with access to a department (cached briefly)"""
+    def load():
+        db = SessionLocalUsers()
+        try:
+            return [
+                username for (username,) in db.query(User.username).filter(
+                    User.is_active == True,
+                    User.department_access.contains([department])
+                ).all()
+            ]
+        finally:
+            db.close()
+
+    return cached_value("department_members", department, load,
+                        ttl=CacheTTL.PRINCIPAL, local_ttl=CacheTTL.LOCAL_PRINCIPAL)
+
+
+def get_board(
+    db: Session,
+    assignees: List[str],
+    workflow_status: Optional[str] = "active",
+    stage_name: Optional[str] = None,
+    card_status: Optional[str] = None,
+    after_id: Optional[int] = None,
+    limit: int = DEFAULT_BOARD_LIMIT
+) -> dict:
+    """
+    Cards assigned to any of `assignees`, grouped by stage and status
+
+    Each column holds up to `limit` cards ordered by id. To load more of one
+    column, pass its stage_name, card_status and next_cursor as after_id;
+    column counts always cover every matching card, not just the page.
+    """
+    C, W = WorkflowCard, SampleWorkflow
+    if not assignees:
+        return {"columns": [], "total_cards": 0}
+
+    group = (C.stage_name, C.card_status)
+    matched = select(
+        C.id, C.workflow_id, C.stage_name, C.stage_order, C.card_title, C.assigned_to,
+        C.card_status, C.due_date, C.updated_at, C.blocked_reason,
+        W.workflow_name, W.priority, W.sample_request_id,
+        func.count(C.id).over(partition_by=group).label("status_count"),
+        func.min(C.stage_order).over(partition_by=C.stage_name).label("column_order"),
+    ).join(W, W.id == C.workflow_id).where(C.assigned_to.in_(assignees))
+    if workflow_status:
+        matched = matched.where(W.workflow_status == workflow_status)
+    if stage_name:
+        matched = matched.where(C.stage_name == stage_name)
+    if card_status:
+        matched = matched.where(C.card_status == card_status)
+    matched = matched.subquery()
+
+    # Rank after the cursor so each column pages independently
+    remaining = select(
+        matched,
+        func.row_number().over(
+            partition_by=(matched.c.stage_name, matched.c.card_status),
+            order_by=matched.c.id
+        ).label("position"),
+    )
+    if after_id:
+        remaining = remaining.where(matched.c.id > after_id)
+    remaining = remaining.subquery()
+
+    rows = db.execute(
+        select(remaining).where(remaining.c.position <= limit + 1).order_by(
+            remaining.c.column_order, remaining.c.stage_name, remaining.c.card_status, remaining.c.id
+        )
+    ).mappings().all()
+
+    columns: Dict[str, dict] = {}
+    for row in rows:
+        column = columns.setdefault(row["stage_name"], {
+            "stage_name": row["stage_name"],
+            "stage_order": row["column_order"],
+            "card_count": 0,
+            "statuses": {},
+        })
+        status_group = column["statuses"].get(row["card_status"])
+        if status_group is None:
+            status_group = column["statuses"][row["card_status"]] = {
+                "card_status": row["card_status"],
+                "count": row["status_count"],
+                "cards": [],
+                "has_more": False,
+                "next_cursor": None,
+            }
+            column["card_count"] += row["status_count"]
+
+        if row["position"] > limit:
+            status_group["has_more"] = True
+            status_group["next_cursor"] = status_group["cards"][-1]["id"]
+            continue
+        status_group["cards"].append({
+            "id": row["id"],
+            "workflow_id": row["workflow_id"],
+            "workflow_name": row["workflow_name"],
+            "sample_request_id": row["sample_request_id"],
+            "priority": row["priority"],
+            "stage_name": row["stage_name"],
+            "stage_order": row["stage_order"],
+            "card_title": row["card_title"],
+            "assigned_to": row["assigned_to"],
+            "card_status": row["card_status"],
+            "due_date": row["due_date"],
+            "updated_at": row["updated_at"],
+            "blocked_reason": row["blocked_reason"],
+        })
+
+    board_columns = [
+        {**column, "statuses": list(column["statuses"].values())}
+        for column in columns.values()
+    ]
+    return {
+        "columns": board_columns,
+        "total_cards": sum(column["card_count"] for column in board_columns),
+    }
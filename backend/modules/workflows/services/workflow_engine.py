@@ -0,0 +1,160 @@
+"""
+In-Memory Workflow Transition Engine
+A card status change is computed over the workflow and all of its cards,
+loaded once: stage sequence validation, auto-activation of the next stage,
+blocking prevention, workflow completion and the sample request status all
+come out of one pass. The caller flushes the changed rows and the collected
+history in one batch and sends notifications after commit.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy.orm import Session, selectinload
+
+from ..models.workflow import SampleWorkflow, WorkflowCard, CardStatusHistory
+
+# Statuses that may only be entered once every earlier stage is completed (Requirements 5.3)
+SEQUENCED_STATUSES = ("in_progress", "completed")
+# Statuses reset to 'ready' behind a blocked stage (Requirements 5.4)
+ACTIVE_STATUSES = ("pending", "in_progress")
+SYSTEM_USER = "system"
+
+
+def load_workflow_for_card(db: Session, card_id: int, lock: bool = False) -> Optional[SampleWorkflow]:
+    """
+    The workflow containing a card, with all its cards (two queries)
+
+    With lock=True the workflow row is locked (SELECT ... FOR UPDATE) until the
+    transaction ends, so concurrent transitions on one workflow are serialized.
+    """
+    query = db.query(SampleWorkflow).join(
+        WorkflowCard, WorkflowCard.workflow_id == SampleWorkflow.id
+    ).filter(
+        WorkflowCard.id == card_id
+    ).options(selectinload(SampleWorkflow.cards)).populate_existing()
+    if lock:
+        query = query.with_for_update(of=SampleWorkflow)
+    return query.first()
+
+
+@dataclass
+class TransitionResult:
+    """Everything a card status change touched"""
+    card: Optional[WorkflowCard] = None
+    previous_status: Optional[str] = None
+    history: List[CardStatusHistory] = field(default_factory=list)
+    changed_cards: List[WorkflowCard] = field(default_factory=list)
+    workflow_completed: bool = False
+    sample_status: Optional[str] = None
+
+
+class WorkflowTransitionEngine:
+    """Card status rules over one workflow's cards held in memory"""
+
+    def __init__(self, workflow: SampleWorkflow):
+        self.workflow = workflow
+        self.cards: List[WorkflowCard] = sorted(workflow.cards, key=lambda c: c.stage_order)
+
+    def card(self, card_id: int) -> Optional[WorkflowCard]:
+        return next((c for c in self.cards if c.id == card_id), None)
+
+    def prerequisites_completed(self, card: WorkflowCard) -> bool:
+        """All earlier stages are completed"""
+        return all(c.card_status == "completed" for c in self.cards if c.stage_order < card.stage_order)
+
+    def can_enter(self, card: WorkflowCard, target_status: str) -> bool:
+        """Stage sequence check (Requirements 5.3)"""
+        return target_status not in SEQUENCED_STATUSES or self.prerequisites_completed(card)
+
+    def transition(
+        self,
+        card: WorkflowCard,
+        target_status: str,
+        updated_by: str,
+        reason: Optional[str],
+        now: datetime
+    ) -> TransitionResult:
+        """Apply a status change and its cascade; raises ValueError if the stage sequence forbids it"""
+        if not self.can_enter(card, target_status):
+            raise ValueError("Cannot update card status: prerequisite stages not completed")
+
+        result = TransitionResult(card=card, previous_status=card.card_status)
+        self._set_status(result, card, target_status, updated_by, reason, now)
+        if target_status == "completed":
+            card.completed_at = now
+            self._activate_next_stage(result, card, now)
+        elif target_status == "blocked":
+            card.blocked_reason = reason
+            self.apply_blocking_prevention(result, now)
+        else:
+            card.blocked_reason = None
+
+        self._check_completion(result, now)
+        result.sample_status = self.sample_status()
+        return result
+
+    def apply_blocking_prevention(self, result: TransitionResult, now: datetime) -> List[WorkflowCard]:
+        """Return active stages behind the earliest blocked stage to 'ready' (Requirements 5.4); returns the blocked cards"""
+        blocked = [c for c in self.cards if c.card_status == "blocked"]
+        if blocked:
+            earliest_blocked_order = min(c.stage_order for c in blocked)
+            for card in self.cards:
+                if card.stage_order > earliest_blocked_order and card.card_status in ACTIVE_STATUSES:
+                    self._set_status(
+                        result, card, "ready", SYSTEM_USER,
+                        f"Stage blocked due to earlier stage {earliest_blocked_order} being blocked", now
+                    )
+        return blocked
+
+    def sample_status(self) -> str:
+        """Sample request status implied by the workflow (Requirements 10.2)"""
+        if self.workflow.workflow_status == "completed":
+            return "Completed"
+        if self.workflow.workflow_status == "cancelled":
+            return "Cancelled"
+        statuses = {c.card_status for c in self.cards}
+        if "blocked" in statuses:
+            return "Blocked"
+        if "in_progress" in statuses:
+            return "In Progress"
+        return "Pending"
+
+    def _set_status(
+        self,
+        result: TransitionResult,
+        card: WorkflowCard,
+        status: str,
+        updated_by: str,
+        reason: Optional[str],
+        now: datetime
+    ):
+        result.history.append(CardStatusHistory(
+            card_id=card.id,
+            previous_status=card.card_status,
+            new_status=status,
+            updated_by=updated_by,
+            update_reason=reason
+        ))
+        card.card_status = status
+        card.updated_at = now
+        if card not in result.changed_cards:
+            result.changed_cards.append(card)
+
+    def _activate_next_stage(self, result: TransitionResult, card: WorkflowCard, now: datetime):
+        """Move the next stage from 'ready' to 'pending' once every earlier stage is completed (Requirements 2.3, 5.2)"""
+        next_card = next((c for c in self.cards if c.stage_order == card.stage_order + 1), None)
+        if next_card and next_card.card_status == "ready" and self.prerequisites_completed(next_card):
+            self._set_status(
+                result, next_card, "pending", SYSTEM_USER,
+                "Auto-activated after previous stage completion", now
+            )
+
+    def _check_completion(self, result: TransitionResult, now: datetime):
+        """Complete the workflow when every card is completed (Requirements 5.5)"""
+        workflow = self.workflow
+        if workflow.workflow_status != "completed" and all(c.card_status == "completed" for c in self.cards):
+            workflow.workflow_status = "completed"
+            workflow.completed_at = now
+            workflow.updated_at = now
+            result.workflow_completed = True
@@ -2,10 +2,10 @@
 Workflow service layer for business logic
 """
 
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import select
 from typing import List, Optional, Dict, Any
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 
 # Helper function to get current UTC time (replaces deprecated utc_now())
 def utc_now() -> datetime:
@@ -13,16 +13,18 @@ def utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 from ..models.workflow import (
-    SampleWorkflow, WorkflowCard, CardStatusHistory,
+    SampleWorkflow, WorkflowCard,
     WorkflowTemplate, CardComment, CardAttachment
 )
 from ..schemas.workflow import (
-    CreateWorkflowRequest, UpdateWorkflowRequest, WorkflowFilters,
+    CreateWorkflowRequest, BulkCreateWorkflowRequest, UpdateWorkflowRequest, WorkflowFilters,
     UpdateCardStatusRequest, UpdateCardAssigneeRequest, CardCommentCreate
 )
-from migrations.seed_workflow_templates import get_workflow_templates
-from core.notification_service import send_notification_to_user, send_notification_to_department
+from core.notification_service import send_notification_to_user, send_notification_to_department_background
 from core.logging import setup_logging
+from . import workflow_board, workflow_stats
+from .template_cache import template_cache
+from .workflow_engine import WorkflowTransitionEngine, TransitionResult, load_workflow_for_card
 
 logger = setup_logging()
 
@@ -34,57 +36,120 @@ class WorkflowService:
     
     def create_workflow(self, workflow_data: CreateWorkflowRequest, created_by: str) -> SampleWorkflow:
         """Create a new workflow with cards based on templates"""
-        
-        # Get workflow templates
-        templates = get_workflow_templates('sample_development')
+        templates = self._get_templates()
+        workflow = self._build_workflow(
+            workflow_data.sample_request_id, workflow_data.workflow_name,
+            workflow_data, templates, created_by, utc_now()
+        )
+        self.db.add(workflow)
+        self.db.commit()
+        self.db.refresh(workflow)
+        workflow_stats.record_change(None, workflow_stats.contribution(workflow))
+
+        # Send notifications to assigned users (Requirements 8.1)
+        self._send_workflow_created_notifications(workflow)
+
+        return workflow
+
+    def create_workflows_bulk(self, bulk_data: BulkCreateWorkflowRequest, created_by: str) -> List[Dict[str, Any]]:
+        """
+        Create one workflow per sample request in a single transaction
+
+        Workflows and cards are inserted in one batch each. Assignment
+        notifications are queued as one per stage and assignee rather than
+        one per card. Returns {id, sample_request_id, workflow_name, card_count}
+        per workflow.
+        """
+        # Import here to avoid circular imports
+        from modules.samples.models.sample import SampleRequest
+
+        sample_request_ids = list(dict.fromkeys(bulk_data.sample_request_ids))
+        sample_ids = dict(self.db.query(SampleRequest.id, SampleRequest.sample_id).filter(
+            SampleRequest.id.in_(sample_request_ids)
+        ).all())
+        missing = [request_id for request_id in sample_request_ids if request_id not in sample_ids]
+        if missing:
+            raise ValueError(f"Sample requests not found: {', '.join(map(str, missing))}")
+
+        templates = self._get_templates()
+        now = utc_now()
+        workflows = [
+            self._build_workflow(
+                request_id, f"{bulk_data.workflow_name} - {sample_ids[request_id]}",
+                bulk_data, templates, created_by, now
+            )
+            for request_id in sample_request_ids
+        ]
+        self.db.add_all(workflows)
+        self.db.flush()
+
+        # Taken before commit, while ids, cards and created_at are still loaded
+        contributions = [(None, workflow_stats.contribution(workflow)) for workflow in workflows]
+        created = [
+            {
+                "id": workflow.id,
+                "sample_request_id": workflow.sample_request_id,
+                "workflow_name": workflow.workflow_name,
+                "card_count": len(workflow.cards),
+            }
+            for workflow in workflows
+        ]
+        assignments: Dict[tuple, int] = {}
+        for workflow in workflows:
+            for card in workflow.cards:
+                if card.assigned_to:
+                    key = (card.stage_name, card.assigned_to)
+                    assignments[key] = assignments.get(key, 0) + 1
+
+        self.db.commit()
+        workflow_stats.record_changes(contributions)
+        self._send_bulk_assignment_notifications(assignments)
+        logger.info(f"Created {len(created)} workflows in bulk")
+
+        return created
+
+    def _get_templates(self) -> List[dict]:
+        templates = template_cache.get(self.db, 'sample_development')
         if not templates:
             raise ValueError("No workflow templates found for sample_development")
-        
-        # Create workflow
+        return templates
+
+    def _build_workflow(
+        self,
+        sample_request_id: int,
+        workflow_name: str,
+        workflow_data,
+        templates: List[dict],
+        created_by: str,
+        now: datetime
+    ) -> SampleWorkflow:
+        """A new workflow with one card per template stage (not yet added to the session)"""
         workflow = SampleWorkflow(
-            sample_request_id=workflow_data.sample_request_id,
-            workflow_name=workflow_data.workflow_name,
+            sample_request_id=sample_request_id,
+            workflow_name=workflow_name,
             workflow_status='active',
             created_by=created_by,
             priority=workflow_data.priority.value,
-            due_date=workflow_data.delivery_plan_date
+            due_date=workflow_data.delivery_plan_date,
+            created_at=now,
+            updated_at=now
         )
-        
-        self.db.add(workflow)
-        self.db.flush()  # Get the workflow ID
-        
-        # Create cards based on templates
-        for template in templates:
-            assigned_to = self._get_assignee_for_stage(
-                template['stage_name'], 
-                workflow_data
-            )
-            
-            # Requirements 1.4, 5.1: First stage is pending, others are waiting
-            if template['stage_order'] == 1:
-                card_status = 'pending'
-            else:
-                card_status = 'ready'  # Using 'ready' as waiting status since it's not in enum
-            
-            card = WorkflowCard(
-                workflow_id=workflow.id,
+        workflow.cards = [
+            WorkflowCard(
                 stage_name=template['stage_name'],
                 stage_order=template['stage_order'],
                 card_title=template['stage_name'],
                 card_description=template['stage_description'],
-                assigned_to=assigned_to,
-                card_status=card_status,
-                due_date=workflow_data.delivery_plan_date
+                assigned_to=self._get_assignee_for_stage(template['stage_name'], workflow_data),
+                # Requirements 1.4, 5.1: First stage is pending, others are waiting
+                # ('ready' is used as the waiting status since it's not in the enum)
+                card_status='pending' if template['stage_order'] == 1 else 'ready',
+                due_date=workflow_data.delivery_plan_date,
+                created_at=now,
+                updated_at=now
             )
-            
-            self.db.add(card)
-        
-        self.db.commit()
-        self.db.refresh(workflow)
-
-        # Send notifications to assigned users (Requirements 8.1)
-        self._send_workflow_created_notifications(workflow)
-
+            for template in templates
+        ]
         return workflow
 
     def _send_workflow_created_notifications(self, workflow: SampleWorkflow):
@@ -92,7 +157,7 @@ class WorkflowService:
         try:
             for card in workflow.cards:
                 if card.assigned_to:
-                    send_notification_to_department(
+                    send_notification_to_department_background(
                         title=f"New Task Assignment: {card.stage_name}",
                         message=f"You have been assigned to '{card.card_title}' in workflow '{workflow.workflow_name}'",
                         target_department="sample_department",
@@ -104,6 +169,22 @@ class WorkflowService:
         except Exception as e:
             logger.error(f"Error sending workflow notifications: {e}")
 
+    def _send_bulk_assignment_notifications(self, assignments: Dict[tuple, int]):
+        """Queue one notification per (stage, assignee) for workflows created in bulk"""
+        try:
+            for (stage_name, assigned_to), count in assignments.items():
+                send_notification_to_department_background(
+                    title=f"New Task Assignments: {stage_name}",
+                    message=f"{assigned_to} has been assigned to '{stage_name}' in {count} new workflow{'s' if count != 1 else ''}",
+                    target_department="sample_department",
+                    notification_type="info",
+                    related_entity_type="workflow_stage",
+                    related_entity_id=stage_name
+                )
+            logger.info(f"Queued {len(assignments)} bulk assignment notifications")
+        except Exception as e:
+            logger.error(f"Error sending bulk workflow notifications: {e}")
+
     def get_workflow(self, workflow_id: int) -> Optional[SampleWorkflow]:
         """Get a workflow by ID with all related data"""
         return self.db.query(SampleWorkflow).filter(
@@ -112,7 +193,11 @@ class WorkflowService:
     
     def get_workflows(self, filters: WorkflowFilters) -> List[SampleWorkflow]:
         """Get workflows with optional filtering"""
-        query = self.db.query(SampleWorkflow)
+        # Cards with their comments and attachments in three IN queries instead of per workflow
+        query = self.db.query(SampleWorkflow).options(
+            selectinload(SampleWorkflow.cards).selectinload(WorkflowCard.comments),
+            selectinload(SampleWorkflow.cards).selectinload(WorkflowCard.attachments)
+        )
         
         # Apply filters
         if filters.workflow_status:
@@ -134,10 +219,12 @@ class WorkflowService:
             query = query.filter(SampleWorkflow.due_date <= filters.due_date_to)
         
         if filters.assigned_to:
-            # Filter by workflows that have cards assigned to the user
-            query = query.join(WorkflowCard).filter(
-                WorkflowCard.assigned_to == filters.assigned_to
-            )
+            # Filter by workflows that have cards assigned to the user (each workflow once)
+            query = query.filter(SampleWorkflow.id.in_(
+                select(WorkflowCard.workflow_id).where(
+                    WorkflowCard.assigned_to == filters.assigned_to
+                ).distinct()
+            ))
         
         # Order by creation date (newest first)
         query = query.order_by(SampleWorkflow.created_at.desc())
@@ -148,6 +235,24 @@ class WorkflowService:
         
         return query.all()
     
+    def get_board(
+        self,
+        assigned_to: Optional[str] = None,
+        department: Optional[str] = None,
+        workflow_status: Optional[str] = "active",
+        stage_name: Optional[str] = None,
+        card_status: Optional[str] = None,
+        after_id: Optional[int] = None,
+        limit: int = workflow_board.DEFAULT_BOARD_LIMIT
+    ) -> Dict[str, Any]:
+        """Kanban board of the cards assigned to a user or to a department's members"""
+        assignees = [assigned_to] if assigned_to else []
+        if department:
+            assignees.extend(workflow_board.department_members(department))
+        return workflow_board.get_board(
+            self.db, assignees, workflow_status, stage_name, card_status, after_id, limit
+        )
+    
     def update_workflow(self, workflow_id: int, update_data: UpdateWorkflowRequest) -> Optional[SampleWorkflow]:
         """Update a workflow"""
         workflow = self.db.query(SampleWorkflow).filter(
@@ -157,6 +262,8 @@ class WorkflowService:
         if not workflow:
             return None
         
+        stats_before = workflow_stats.contribution(workflow)
+        
         # Update fields
         if update_data.workflow_name:
             workflow.workflow_name = update_data.workflow_name
@@ -176,6 +283,7 @@ class WorkflowService:
         
         self.db.commit()
         self.db.refresh(workflow)
+        workflow_stats.record_change(stats_before, workflow_stats.contribution(workflow))
         return workflow
     
     def delete_workflow(self, workflow_id: int) -> bool:
@@ -187,8 +295,10 @@ class WorkflowService:
         if not workflow:
             return False
         
+        stats_before = workflow_stats.contribution(workflow)
         self.db.delete(workflow)
         self.db.commit()
+        workflow_stats.record_change(stats_before, None)
         return True
     
     def get_workflow_cards(self, workflow_id: int) -> List[WorkflowCard]:
@@ -197,59 +307,50 @@ class WorkflowService:
             WorkflowCard.workflow_id == workflow_id
         ).order_by(WorkflowCard.stage_order).all()
     
-    def update_card_status(self, card_id: int, status_data: UpdateCardStatusRequest, updated_by: str) -> Optional[WorkflowCard]:
-        """Update card status and create history record"""
-        card = self.db.query(WorkflowCard).filter(
-            WorkflowCard.id == card_id
-        ).first()
-        
-        if not card:
+    def update_card_status(
+        self,
+        card_id: int,
+        status_data: UpdateCardStatusRequest,
+        updated_by: str,
+        lock: bool = True
+    ) -> Optional[WorkflowCard]:
+        """
+        Update card status with its cascade and history records
+
+        The workflow and its cards are loaded once (workflow row locked unless
+        lock=False) and the transition engine computes next-stage activation,
+        blocking prevention, workflow completion and the sample status in one
+        pass. Changed rows are flushed together on commit; notifications are
+        sent after commit.
+        """
+        workflow = load_workflow_for_card(self.db, card_id, lock=lock)
+        if not workflow:
             return None
-        
-        # Validate stage sequence (Requirements 5.3)
-        if not self.validate_stage_sequence(card_id, status_data.status.value):
-            raise ValueError("Cannot update card status: prerequisite stages not completed")
-        
-        # Store previous status
-        previous_status = card.card_status
-        
-        # Update card
-        card.card_status = status_data.status.value
-        if status_data.status.value == 'completed':
-            card.completed_at = utc_now()
-            # Auto-activate next stage when current stage is completed (Requirements 2.3, 5.2)
-            self._activate_next_stage(card.workflow_id, card.stage_order)
-        elif status_data.status.value == 'blocked':
-            card.blocked_reason = status_data.reason
-            # Prevent subsequent stages when blocked (Requirements 5.4)
-            self.check_blocking_prevention(card.workflow_id)
-        else:
-            card.blocked_reason = None
-        
-        card.updated_at = utc_now()
-        
-        # Create status history record
-        history = CardStatusHistory(
-            card_id=card.id,
-            previous_status=previous_status,
-            new_status=status_data.status.value,
-            updated_by=updated_by,
-            update_reason=status_data.reason
+
+        engine = WorkflowTransitionEngine(workflow)
+        card = engine.card(card_id)
+        stats_before = workflow_stats.contribution(workflow)
+
+        # Validates the stage sequence (Requirements 5.3), raises ValueError
+        result = engine.transition(
+            card, status_data.status.value, updated_by, status_data.reason, utc_now()
         )
-        
-        self.db.add(history)
-        
-        # Check if workflow should be completed
-        self._check_workflow_completion(card.workflow_id)
-        
+        self.db.add_all(result.history)
+
         # Sync workflow status with sample request (Requirements 10.2)
-        self._sync_sample_status(card.workflow_id)
-        
+        self._sync_sample_status(workflow.sample_request_id, result.sample_status)
+
+        stats_after = workflow_stats.contribution(workflow)
+        completed_workflow = (workflow.id, workflow.workflow_name) if result.workflow_completed else None
+
         self.db.commit()
         self.db.refresh(card)
+        workflow_stats.record_change(stats_before, stats_after)
 
-        # Send status change notifications (Requirements 8.2)
-        self._send_status_change_notification(card, previous_status, status_data.status.value)
+        # Send status change notifications (Requirements 8.2, 8.5)
+        self._send_status_change_notification(card, result.previous_status, status_data.status.value)
+        if completed_workflow:
+            self._send_workflow_completed_notification(*completed_workflow)
 
         return card
 
@@ -269,7 +370,7 @@ class WorkflowService:
                 title = f"Task Completed: {card.stage_name}"
                 message = f"'{card.card_title}' has been completed"
 
-            send_notification_to_department(
+            send_notification_to_department_background(
                 title=title,
                 message=message,
                 target_department="sample_department",
@@ -291,11 +392,13 @@ class WorkflowService:
             return None
 
         previous_assignee = card.assigned_to
+        stats_before = workflow_stats.contribution(card.workflow)
         card.assigned_to = assignee_data.assignee
         card.updated_at = utc_now()
 
         self.db.commit()
         self.db.refresh(card)
+        workflow_stats.record_change(stats_before, workflow_stats.contribution(card.workflow))
 
         # Send assignee change notification (Requirements 8.1)
         if assignee_data.assignee and assignee_data.assignee != previous_assignee:
@@ -306,7 +409,7 @@ class WorkflowService:
     def _send_assignee_notification(self, card: WorkflowCard):
         """Send notification when card assignee changes"""
         try:
-            send_notification_to_department(
+            send_notification_to_department_background(
                 title=f"Task Assignment: {card.stage_name}",
                 message=f"You have been assigned to '{card.card_title}'",
                 target_department="sample_department",
@@ -372,306 +475,62 @@ class WorkflowService:
         }
         return stage_assignee_map.get(stage_name)
     
-    def _activate_next_stage(self, workflow_id: int, completed_stage_order: int):
-        """Activate the next stage when current stage is completed (Requirements 2.3, 5.2)"""
-        # Find the next stage card
-        next_card = self.db.query(WorkflowCard).filter(
-            and_(
-                WorkflowCard.workflow_id == workflow_id,
-                WorkflowCard.stage_order == completed_stage_order + 1
+    def _send_workflow_completed_notification(self, workflow_id: int, workflow_name: str):
+        """Send the workflow completion notification (Requirements 8.5)"""
+        try:
+            send_notification_to_department_background(
+                title=f"Workflow Completed: {workflow_name}",
+                message=f"All stages of workflow '{workflow_name}' (ID: {workflow_id}) have been completed successfully.",
+                target_department="sample_department",
+                notification_type="success",
+                related_entity_type="workflow",
+                related_entity_id=str(workflow_id)
             )
-        ).first()
-        
-        if next_card and next_card.card_status == 'ready':
-            # Check if all previous stages are completed (Requirements 5.3)
-            previous_cards = self.db.query(WorkflowCard).filter(
-                and_(
-                    WorkflowCard.workflow_id == workflow_id,
-                    WorkflowCard.stage_order < next_card.stage_order
-                )
-            ).all()
-            
-            # Only activate if all previous stages are completed
-            if all(card.card_status == 'completed' for card in previous_cards):
-                next_card.card_status = 'pending'
-                next_card.updated_at = utc_now()
-                
-                # Create status history for auto-activation
-                history = CardStatusHistory(
-                    card_id=next_card.id,
-                    previous_status='ready',
-                    new_status='pending',
-                    updated_by='system',
-                    update_reason='Auto-activated after previous stage completion'
-                )
-                self.db.add(history)
-    
-    def _check_workflow_completion(self, workflow_id: int):
-        """Check if all cards are completed and update workflow status (Requirements 5.5, 8.5)"""
-        cards = self.db.query(WorkflowCard).filter(
-            WorkflowCard.workflow_id == workflow_id
-        ).all()
-        
-        if all(card.card_status == 'completed' for card in cards):
-            workflow = self.db.query(SampleWorkflow).filter(
-                SampleWorkflow.id == workflow_id
-            ).first()
-            
-            if workflow and workflow.workflow_status != 'completed':
-                workflow.workflow_status = 'completed'
-                workflow.completed_at = utc_now()
-                workflow.updated_at = utc_now()
-                
-                # Send completion notification (Requirements 8.5)
-                try:
-                    send_notification_to_department(
-                        title=f"Workflow Completed: {workflow.workflow_name}",
-                        message=f"All stages of workflow '{workflow.workflow_name}' (ID: {workflow.id}) have been completed successfully.",
-                        target_department="sample_department",
-                        notification_type="success",
-                        related_entity_type="workflow",
-                        related_entity_id=str(workflow.id)
-                    )
-                    logger.info(f"Sent workflow completion notification for workflow {workflow.id}")
-                except Exception as e:
-                    logger.error(f"Error sending workflow completion notification: {e}")
-    
+            logger.info(f"Sent workflow completion notification for workflow {workflow_id}")
+        except Exception as e:
+            logger.error(f"Error sending workflow completion notification: {e}")
+
     def validate_stage_sequence(self, card_id: int, target_status: str) -> bool:
         """Validate that stage sequence is maintained (Requirements 5.3)"""
-        card = self.db.query(WorkflowCard).filter(
-            WorkflowCard.id == card_id
-        ).first()
-        
-        if not card:
+        workflow = load_workflow_for_card(self.db, card_id)
+        if not workflow:
             return False
-        
-        # If trying to start or complete a stage, check prerequisites
-        if target_status in ['in_progress', 'completed']:
-            # Get all previous stages
-            previous_cards = self.db.query(WorkflowCard).filter(
-                and_(
-                    WorkflowCard.workflow_id == card.workflow_id,
-                    WorkflowCard.stage_order < card.stage_order
-                )
-            ).all()
-            
-            # All previous stages must be completed
-            return all(prev_card.card_status == 'completed' for prev_card in previous_cards)
-        
-        return True
-    
+
+        engine = WorkflowTransitionEngine(workflow)
+        return engine.can_enter(engine.card(card_id), target_status)
+
     def check_blocking_prevention(self, workflow_id: int) -> List[WorkflowCard]:
         """Check if any cards are blocked and prevent subsequent stages (Requirements 5.4)"""
-        blocked_cards = self.db.query(WorkflowCard).filter(
-            and_(
-                WorkflowCard.workflow_id == workflow_id,
-                WorkflowCard.card_status == 'blocked'
-            )
-        ).all()
-        
-        if blocked_cards:
-            # Find the earliest blocked stage
-            earliest_blocked_order = min(card.stage_order for card in blocked_cards)
-            
-            # Set all subsequent stages to 'ready' (waiting) status
-            subsequent_cards = self.db.query(WorkflowCard).filter(
-                and_(
-                    WorkflowCard.workflow_id == workflow_id,
-                    WorkflowCard.stage_order > earliest_blocked_order,
-                    WorkflowCard.card_status.in_(['pending', 'in_progress'])
-                )
-            ).all()
-            
-            for card in subsequent_cards:
-                card.card_status = 'ready'
-                card.updated_at = utc_now()
-                
-                # Create status history for blocking prevention
-                history = CardStatusHistory(
-                    card_id=card.id,
-                    previous_status=card.card_status,
-                    new_status='ready',
-                    updated_by='system',
-                    update_reason=f'Stage blocked due to earlier stage {earliest_blocked_order} being blocked'
-                )
-                self.db.add(history)
-        
+        workflow = self.db.query(SampleWorkflow).options(
+            selectinload(SampleWorkflow.cards)
+        ).filter(SampleWorkflow.id == workflow_id).first()
+        if not workflow:
+            return []
+
+        result = TransitionResult()
+        blocked_cards = WorkflowTransitionEngine(workflow).apply_blocking_prevention(result, utc_now())
+        self.db.add_all(result.history)
         return blocked_cards
-    
-    def _sync_sample_status(self, workflow_id: int):
-        """Sync workflow status with sample request status (Requirements 10.2)"""
+
+    def _sync_sample_status(self, sample_request_id: int, sample_status: str):
+        """Write the workflow's status to its sample request in one UPDATE (Requirements 10.2)"""
         try:
             # Import here to avoid circular imports
             from modules.samples.models.sample import SampleRequest
 
-            workflow = self.db.query(SampleWorkflow).filter(
-                SampleWorkflow.id == workflow_id
-            ).first()
-
-            if not workflow:
-                return
-
-            # Get the sample request
-            sample_request = self.db.query(SampleRequest).filter(
-                SampleRequest.id == workflow.sample_request_id
-            ).first()
-
-            if not sample_request:
-                return
-
-            # Update sample status based on workflow status
-            if workflow.workflow_status == 'completed':
-                sample_request.current_status = 'Completed'
-            elif workflow.workflow_status == 'cancelled':
-                sample_request.current_status = 'Cancelled'
-            else:
-                # Check if any cards are blocked
-                blocked_cards = self.db.query(WorkflowCard).filter(
-                    and_(
-                        WorkflowCard.workflow_id == workflow_id,
-                        WorkflowCard.card_status == 'blocked'
-                    )
-                ).count()
-
-                if blocked_cards > 0:
-                    sample_request.current_status = 'Blocked'
-                else:
-                    # Check if any cards are in progress
-                    in_progress_cards = self.db.query(WorkflowCard).filter(
-                        and_(
-                            WorkflowCard.workflow_id == workflow_id,
-                            WorkflowCard.card_status == 'in_progress'
-                        )
-                    ).count()
-
-                    if in_progress_cards > 0:
-                        sample_request.current_status = 'In Progress'
-                    else:
-                        sample_request.current_status = 'Pending'
-
-            sample_request.updated_at = utc_now()
-
+            self.db.query(SampleRequest).filter(
+                SampleRequest.id == sample_request_id
+            ).update(
+                {SampleRequest.current_status: sample_status, SampleRequest.updated_at: utc_now()},
+                synchronize_session=False
+            )
         except Exception as e:
             # Log error but don't fail the workflow update
-            print(f"Error syncing sample status: {e}")
-            pass
+            logger.error(f"Error syncing sample status: {e}")
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get workflow statistics for dashboard (Requirements 6.2, 6.4, 9.1)"""
-        # Total workflows by status
-        total_workflows = self.db.query(SampleWorkflow).count()
-
-        active_workflows = self.db.query(SampleWorkflow).filter(
-            SampleWorkflow.workflow_status == 'active'
-        ).count()
-
-        completed_workflows = self.db.query(SampleWorkflow).filter(
-            SampleWorkflow.workflow_status == 'completed'
-        ).count()
-
-        cancelled_workflows = self.db.query(SampleWorkflow).filter(
-            SampleWorkflow.workflow_status == 'cancelled'
-        ).count()
-
-        # Cards statistics
-        total_cards = self.db.query(WorkflowCard).count()
-
-        cards_by_status = self.db.query(
-            WorkflowCard.card_status,
-            func.count(WorkflowCard.id)
-        ).group_by(WorkflowCard.card_status).all()
-
-        card_status_counts = {status: count for status, count in cards_by_status}
-
-        # Blocked cards count
-        blocked_cards = card_status_counts.get('blocked', 0)
-
-        # Overdue workflows (due_date has passed but not completed)
-        overdue_workflows = self.db.query(SampleWorkflow).filter(
-            and_(
-                SampleWorkflow.workflow_status == 'active',
-                SampleWorkflow.due_date < utc_now()
-            )
-        ).count()
-
-        # Priority distribution
-        priority_counts = self.db.query(
-            SampleWorkflow.priority,
-            func.count(SampleWorkflow.id)
-        ).group_by(SampleWorkflow.priority).all()
-
-        priority_distribution = {priority or 'medium': count for priority, count in priority_counts}
-
-        # Average completion time (for completed workflows) - PostgreSQL compatible
-        try:
-            from sqlalchemy import extract, cast, Float
-            completed_with_time = self.db.query(
-                func.avg(
-                    extract('epoch', SampleWorkflow.completed_at - SampleWorkflow.created_at) / 86400.0
-                )
-            ).filter(
-                and_(
-                    SampleWorkflow.workflow_status == 'completed',
-                    SampleWorkflow.completed_at.isnot(None)
-                )
-            ).scalar()
-        except Exception as e:
-            logger.warning(f"Could not calculate avg completion time: {e}")
-            completed_with_time = None
-
-        avg_completion_days = round(completed_with_time or 0, 1)
-
-        # Recent activity (workflows created in last 7 days)
-        seven_days_ago = utc_now() - timedelta(days=7)
-        recent_workflows = self.db.query(SampleWorkflow).filter(
-            SampleWorkflow.created_at >= seven_days_ago
-        ).count()
-
-        # Stage bottleneck analysis (cards that have been in same status longest)
-        stage_stats = self.db.query(
-            WorkflowCard.stage_name,
-            WorkflowCard.card_status,
-            func.count(WorkflowCard.id)
-        ).group_by(
-            WorkflowCard.stage_name,
-            WorkflowCard.card_status
-        ).all()
-
-        stage_breakdown = {}
-        for stage_name, status, count in stage_stats:
-            if stage_name not in stage_breakdown:
-                stage_breakdown[stage_name] = {}
-            stage_breakdown[stage_name][status] = count
-
-        # Assignee workload
-        assignee_workload = self.db.query(
-            WorkflowCard.assigned_to,
-            func.count(WorkflowCard.id)
-        ).filter(
-            and_(
-                WorkflowCard.assigned_to.isnot(None),
-                WorkflowCard.card_status.in_(['pending', 'in_progress'])
-            )
-        ).group_by(WorkflowCard.assigned_to).all()
-
-        workload_distribution = {assignee: count for assignee, count in assignee_workload if assignee}
-
-        return {
-            "total_workflows": total_workflows,
-            "active_workflows": active_workflows,
-            "completed_workflows": completed_workflows,
-            "cancelled_workflows": cancelled_workflows,
-            "total_cards": total_cards,
-            "card_status_counts": card_status_counts,
-            "blocked_cards": blocked_cards,
-            "overdue_workflows": overdue_workflows,
-            "priority_distribution": priority_distribution,
-            "avg_completion_days": avg_completion_days,
-            "recent_workflows": recent_workflows,
-            "stage_breakdown": stage_breakdown,
-            "workload_distribution": workload_distribution,
-            "completion_rate": round((completed_workflows / total_workflows * 100) if total_workflows > 0 else 0, 1)
-        }
+        return workflow_stats.get_statistics(self.db)
 
 
 class WorkflowTemplateService:
@@ -699,6 +558,7 @@ class WorkflowTemplateService:
         self.db.add(template)
         self.db.commit()
         self.db.refresh(template)
+        template_cache.invalidate()
         return template
     
     def update_template(self, template_id: int, template_data: dict) -> Optional[WorkflowTemplate]:
@@ -716,6 +576,7 @@ class WorkflowTemplateService:
         
         self.db.commit()
         self.db.refresh(template)
+        template_cache.invalidate()
         return template
     
     def delete_template(self, template_id: int) -> bool:
@@ -729,4 +590,5 @@ class WorkflowTemplateService:
         
         template.is_active = False
         self.db.commit()
+        template_cache.invalidate()
         return True
\ No newline at end of file
@@ -0,0 +1,287 @@
+"""
+Workflow Dashboard Statistics
+Statistics are computed in two grouped queries (FILTER aggregates over
+GROUPING SETS) and kept as an incrementally maintained rollup in Redis, so
+/workflows/statistics reads one hash and two sorted-set counts.
+
+Every workflow write records the workflow's contribution to the rollup
+before and after the change (counts by status, priority, stage and
+assignee, plus its due date and creation time) and applies the difference.
+The rollup expires after ROLLUP_TTL and is rebuilt from the database on the
+next read, which bounds any drift. Without Redis, statistics are computed
+from the database on each call.
+
+Only one worker seeds at a time (a short SEED_LOCK_KEY lock; other readers
+answer from the database meanwhile). Every change also bumps CHANGES_KEY in
+the same MULTI, and the seed writes under WATCH on it, so a change recorded
+while the seed is being computed discards the seed instead of being wiped
+by it; the next read seeds again. A change committed before the seed's
+queries but recorded after its write is still counted twice until the
+rollup expires.
+"""
+import logging
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from redis.exceptions import WatchError
+from sqlalchemy import and_, extract, func, tuple_
+from sqlalchemy.orm import Session
+
+from core.cache import get_redis_client
+from ..models.workflow import SampleWorkflow, WorkflowCard
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_KEY = "workflow_stats:rollup"
+DUE_KEY = "workflow_stats:due"  # Active workflows with a due date, scored by due timestamp
+CREATED_KEY = "workflow_stats:created"  # Workflows created in the recent window, scored by creation timestamp
+ROLLUP_TTL = 3600  # Rebuilt from the database at least hourly
+SEEDED_FIELD = "_seeded"
+CHANGES_KEY = "workflow_stats:changes"  # Bumped with every recorded change
+SEED_LOCK_KEY = "workflow_stats:seed_lock"
+SEED_LOCK_TTL = 30  # Seconds; outlives one seed, expires if its worker dies
+RECENT_DAYS = 7
+WORKLOAD_STATUSES = ("pending", "in_progress")
+DEFAULT_PRIORITY = "medium"
+
+
+@dataclass
+class Contribution:
+    """One workflow's share of the rollup"""
+    counts: Counter = field(default_factory=Counter)
+    due_at: Optional[float] = None  # Set while the workflow is active
+    created_at: Optional[float] = None
+    workflow_id: Optional[int] = None
+
+
+def _days(start: datetime, end: datetime) -> float:
+    return (end - start).total_seconds() / 86400.0
+
+
+def contribution(workflow: SampleWorkflow) -> Contribution:
+    """Snapshot of what a workflow adds to the rollup (take it before changing the workflow)"""
+    counts = Counter()
+    counts["workflows"] += 1
+    counts[f"workflow_status:{workflow.workflow_status}"] += 1
+    counts[f"priority:{workflow.priority or DEFAULT_PRIORITY}"] += 1
+    if workflow.workflow_status == "completed" and workflow.completed_at and workflow.created_at:
+        counts["completed_count"] += 1
+        counts["completed_days_sum"] += _days(workflow.created_at, workflow.completed_at)
+
+    for card in workflow.cards:
+        counts["cards"] += 1
+        counts[f"card_status:{card.card_status}"] += 1
+        counts[f"stage_status:{card.card_status}:{card.stage_name}"] += 1
+        if card.assigned_to and card.card_status in WORKLOAD_STATUSES:
+            counts[f"workload:{card.assigned_to}"] += 1
+
+    due_at = None
+    if workflow.workflow_status == "active" and workflow.due_date:
+        due_at = workflow.due_date.timestamp()
+    return Contribution(
+        counts=counts,
+        due_at=due_at,
+        created_at=workflow.created_at.timestamp() if workflow.created_at else None,
+        workflow_id=workflow.id
+    )
+
+
+def _queue_change(pipe, before: Optional[Contribution], after: Optional[Contribution]):
+    old, new = before or Contribution(), after or Contribution()
+    workflow_id = new.workflow_id or old.workflow_id
+    for name in set(old.counts) | set(new.counts):
+        delta = new.counts[name] - old.counts[name]
+        if name == "completed_days_sum":
+            if delta:
+                pipe.hincrbyfloat(ROLLUP_KEY, name, delta)
+        elif delta:
+            pipe.hincrby(ROLLUP_KEY, name, int(delta))
+
+    if new.due_at is None:
+        pipe.zrem(DUE_KEY, workflow_id)
+    else:
+        pipe.zadd(DUE_KEY, {workflow_id: new.due_at})
+    if new.created_at is None:
+        pipe.zrem(CREATED_KEY, workflow_id)
+    elif before is None:
+        pipe.zadd(CREATED_KEY, {workflow_id: new.created_at})
+
+
+def record_change(before: Optional[Contribution], after: Optional[Contribution]):
+    """Apply a workflow's change to the rollup (before=None: created, after=None: deleted); call after commit"""
+    record_changes([(before, after)])
+
+
+def record_changes(changes: Iterable[Tuple[Optional[Contribution], Optional[Contribution]]]):
+    """Apply several workflows' (before, after) changes in one round trip; call after commit"""
+    client = get_redis_client()
+    if client is None:
+        return
+
+    try:
+        pipe = client.pipeline()
+        for before, after in changes:
+            _queue_change(pipe, before, after)
+        pipe.incr(CHANGES_KEY)
+        pipe.execute()
+    except Exception as e:
+        # The rollup is rebuilt from the database when it expires
+        logger.error(f"❌ Workflow statistics rollup update error: {e}")
+
+
+def _aggregate(db: Session, now: datetime) -> dict:
+    """Rollup fields plus overdue/recent counts, in one grouped query per table"""
+    W, C = SampleWorkflow, WorkflowCard
+    completed = and_(W.workflow_status == "completed", W.completed_at.isnot(None))
+    workflow_rows = db.query(
+        func.grouping(W.priority, W.workflow_status),
+        W.priority,
+        W.workflow_status,
+        func.count(W.id),
+        func.count(W.id).filter(completed),
+        func.sum(extract("epoch", W.completed_at - W.created_at) / 86400.0).filter(completed),
+        func.count(W.id).filter(and_(W.workflow_status == "active", W.due_date < now)),
+        func.count(W.id).filter(W.created_at >= now - timedelta(days=RECENT_DAYS)),
+    ).group_by(func.grouping_sets(tuple_(), tuple_(W.priority), tuple_(W.workflow_status))).all()
+
+    fields = Counter()
+    overdue = recent = 0
+    for grouping, priority, workflow_status, count, completed_count, days_sum, overdue_count, recent_count in workflow_rows:
+        if grouping == 3:  # ()
+            fields["workflows"] = count
+            fields["completed_count"] = completed_count
+            fields["completed_days_sum"] = float(days_sum or 0)
+            overdue, recent = overdue_count, recent_count
+        elif grouping == 1:  # (priority)
+            fields[f"priority:{priority or DEFAULT_PRIORITY}"] += count
+        else:  # (workflow_status)
+            fields[f"workflow_status:{workflow_status}"] = count
+
+    card_rows = db.query(
+        func.grouping(C.stage_name, C.card_status, C.assigned_to),
+        C.stage_name,
+        C.card_status,
+        C.assigned_to,
+        func.count(C.id),
+        func.count(C.id).filter(C.card_status.in_(WORKLOAD_STATUSES)),
+    ).group_by(func.grouping_sets(tuple_(C.stage_name, C.card_status), tuple_(C.assigned_to))).all()
+
+    for grouping, stage_name, card_status, assigned_to, count, workload in card_rows:
+        if grouping == 1:  # (stage_name, card_status)
+            fields["cards"] += count
+            fields[f"card_status:{card_status}"] += count
+            fields[f"stage_status:{card_status}:{stage_name}"] = count
+        elif assigned_to and workload:  # (assigned_to)
+            fields[f"workload:{assigned_to}"] = workload
+
+    return {"fields": fields, "overdue": overdue, "recent": recent}
+
+
+def _seed(client, db: Session, now: datetime) -> dict:
+    """Rebuild the rollup and both sorted sets from the database (skipped if another worker is seeding)"""
+    token = uuid.uuid4().hex
+    if not client.set(SEED_LOCK_KEY, token, nx=True, ex=SEED_LOCK_TTL):
+        return _aggregate(db, now)
+
+    try:
+        with client.pipeline() as pipe:
+            pipe.watch(CHANGES_KEY)
+            aggregate = _aggregate(db, now)
+            due = db.query(SampleWorkflow.id, SampleWorkflow.due_date).filter(
+                SampleWorkflow.workflow_status == "active",
+                SampleWorkflow.due_date.isnot(None)
+            ).all()
+            created = db.query(SampleWorkflow.id, SampleWorkflow.created_at).filter(
+                SampleWorkflow.created_at >= now - timedelta(days=RECENT_DAYS)
+            ).all()
+
+            pipe.multi()
+            pipe.delete(ROLLUP_KEY, DUE_KEY, CREATED_KEY)
+            pipe.hset(ROLLUP_KEY, mapping={SEEDED_FIELD: 1, **aggregate["fields"]})
+            if due:
+                pipe.zadd(DUE_KEY, {workflow_id: due_date.timestamp() for workflow_id, due_date in due})
+            if created:
+                pipe.zadd(CREATED_KEY, {workflow_id: created_at.timestamp() for workflow_id, created_at in created})
+            for key in (ROLLUP_KEY, DUE_KEY, CREATED_KEY):
+                pipe.expire(key, ROLLUP_TTL)
+            try:
+                pipe.execute()
+            except WatchError:
+                logger.debug("Workflow statistics seed raced a change, leaving the rollup for the next read")
+            return aggregate
+    finally:
+        if client.get(SEED_LOCK_KEY) == token:
+            client.delete(SEED_LOCK_KEY)
+
+
+def _read_rollup(client, now: datetime) -> Optional[dict]:
+    recent_from = (now - timedelta(days=RECENT_DAYS)).timestamp()
+    pipe = client.pipeline()
+    pipe.hgetall(ROLLUP_KEY)
+    pipe.zcount(DUE_KEY, "-inf", f"({now.timestamp()}")
+    pipe.zremrangebyscore(CREATED_KEY, "-inf", f"({recent_from}")
+    pipe.zcard(CREATED_KEY)
+    raw, overdue, _, recent = pipe.execute()
+    if SEEDED_FIELD not in raw:
+        return None
+    fields = {name: float(value) for name, value in raw.items() if name != SEEDED_FIELD}
+    return {"fields": fields, "overdue": overdue, "recent": recent}
+
+
+def _format(fields: Dict[str, float], overdue: int, recent: int) -> dict:
+    """Dashboard response from rollup fields"""
+    def group(prefix: str) -> Dict[str, int]:
+        return {
+            name[len(prefix):]: int(value)
+            for name, value in fields.items()
+            if name.startswith(prefix) and value > 0
+        }
+
+    workflow_status_counts = group("workflow_status:")
+    card_status_counts = group("card_status:")
+    stage_breakdown: Dict[str, Dict[str, int]] = {}
+    for key, count in group("stage_status:").items():
+        card_status, stage_name = key.split(":", 1)
+        stage_breakdown.setdefault(stage_name, {})[card_status] = count
+
+    total_workflows = int(fields.get("workflows", 0))
+    completed_workflows = workflow_status_counts.get("completed", 0)
+    completed_count = fields.get("completed_count", 0)
+    avg_completion_days = fields.get("completed_days_sum", 0) / completed_count if completed_count > 0 else 0
+
+    return {
+        "total_workflows": total_workflows,
+        "active_workflows": workflow_status_counts.get("active", 0),
+        "completed_workflows": completed_workflows,
+        "cancelled_workflows": workflow_status_counts.get("cancelled", 0),
+        "total_cards": int(fields.get("cards", 0)),
+        "card_status_counts": card_status_counts,
+        "blocked_cards": card_status_counts.get("blocked", 0),
+        "overdue_workflows": int(overdue),
+        "priority_distribution": group("priority:"),
+        "avg_completion_days": round(avg_completion_days, 1),
+        "recent_workflows": int(recent),
+        "stage_breakdown": stage_breakdown,
+        "workload_distribution": group("workload:"),
+        "completion_rate": round((completed_workflows / total_workflows * 100) if total_workflows > 0 else 0, 1)
+    }
+
+
+def get_statistics(db: Session) -> dict:
+    """Dashboard statistics from the rollup (seeded from the database on a miss)"""
+    now = datetime.now(timezone.utc)
+    client = get_redis_client()
+    if client is not None:
+        try:
+            rollup = _read_rollup(client, now)
+            if rollup is None:
+                rollup = _seed(client, db, now)
+            return _format(rollup["fields"], rollup["overdue"], rollup["recent"])
+        except Exception as e:
+            logger.error(f"❌ Workflow statistics rollup error: {e}")
+
+    aggregate = _aggregate(db, now)
+    return _format(aggregate["fields"], aggregate["overdue"], aggregate["recent"])